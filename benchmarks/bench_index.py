@@ -0,0 +1,114 @@
+"""
+Workspace index benchmark on a generated monorepo.
+
+For every size N (members, split between packages/ and apps/) it times:
+    cold:    load_workspace_index without an index file
+    warm:    load_workspace_index with an up-to-date index file
+    changed: a warm load after one pubspec changed
+
+Usage:
+    python benchmarks/bench_index.py
+    python benchmarks/bench_index.py --sizes 100,500 --repeat 5
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from src.workspace_index import index_path, load_workspace_index  # noqa: E402
+
+PUBSPEC = """name: {name}
+description: A benchmark package.
+version: 0.0.1
+publish_to: none
+resolution: workspace
+
+environment:
+  sdk: ">=3.6.0 <4.0.0"
+
+dependencies:
+  flutter:
+    sdk: flutter
+  {dependency}: any
+  intl: any
+
+dev_dependencies:
+  flutter_test:
+    sdk: flutter
+  flutter_lints: ^5.0.0
+"""
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Workspace index benchmark")
+    parser.add_argument(
+        "--sizes",
+        default="50,500",
+        help="Comma separated numbers of members (default: 50,500)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Runs per measurement; the fastest is reported (default: 3)",
+    )
+    return parser.parse_args()
+
+
+def generate_monorepo(root_path: Path, size: int) -> None:
+    for i in range(size):
+        folder = "apps" if i % 5 == 0 else "packages"
+        member_path = root_path / folder / f"member_{i}"
+        member_path.mkdir(parents=True)
+        (member_path / "pubspec.yaml").write_text(
+            PUBSPEC.format(name=f"member_{i}", dependency=f"member_{max(i - 1, 0)}")
+        )
+        if folder == "apps":
+            (member_path / "l10n.yaml").write_text("arb-dir: lib/l10n\n")
+
+
+def best_time(run, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    args = parse_args()
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    print(f"{'size':>6} {'cold ms':>10} {'warm ms':>10} {'changed ms':>11}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as work_dir:
+            root_path = Path(work_dir)
+            generate_monorepo(root_path, size)
+
+            def cold():
+                index_path(root_path).unlink(missing_ok=True)
+                load_workspace_index(root_path)
+
+            def changed():
+                pubspec = root_path / "packages" / "member_1" / "pubspec.yaml"
+                os.utime(pubspec, ns=(time.time_ns(), time.time_ns()))
+                load_workspace_index(root_path)
+
+            cold_time = best_time(cold, args.repeat)
+            warm_time = best_time(lambda: load_workspace_index(root_path), args.repeat)
+            changed_time = best_time(changed, args.repeat)
+        print(
+            f"{size:>6} {cold_time * 1000:>10.1f} {warm_time * 1000:>10.1f} "
+            f"{changed_time * 1000:>11.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
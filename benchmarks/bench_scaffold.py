@@ -0,0 +1,153 @@
+"""
+End-to-end scaffolding benchmark on the fake toolchain.
+
+For every size N it times:
+    create: `main.py --manifest` for a new monorepo with N apps and N packages
+    add:    `main.py --add` of N more apps and N more packages into it
+
+Usage:
+    python benchmarks/bench_scaffold.py
+    python benchmarks/bench_scaffold.py --sizes 1,10 --latency 0.05 --json out.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+FAKE_TOOLCHAIN = Path(__file__).resolve().parent / "fake_toolchain"
+PROJECT_NAME = "bench"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Scaffolding benchmark")
+    parser.add_argument(
+        "--sizes",
+        default="1,10,50,200",
+        help="Comma separated numbers of apps and packages (default: 1,10,50,200)",
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="Seconds every fake toolchain command sleeps (default: 0)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=1,
+        help="Runs per size; the fastest is reported (default: 1)",
+    )
+    parser.add_argument(
+        "--args",
+        default="",
+        help="Extra main.py arguments, e.g. '--profile'",
+    )
+    parser.add_argument("--json", help="Write the results to a JSON file")
+    return parser.parse_args()
+
+
+def benchmark_env(work_dir: Path, latency: float) -> Dict[str, str]:
+    env = dict(os.environ)
+    env["PATH"] = f"{FAKE_TOOLCHAIN}{os.pathsep}{env.get('PATH', '')}"
+    env["MONO_PY_CACHE_DIR"] = str(work_dir / "cache")
+    env["FAKE_TOOLCHAIN_LATENCY"] = str(latency)
+    return env
+
+
+def write_manifest(path: Path, apps: List[str], packages: List[str]) -> Path:
+    path.write_text(
+        json.dumps({"project_name": PROJECT_NAME, "apps": apps, "packages": packages})
+    )
+    return path
+
+
+def run_main(
+    args: List[str], cwd: Path, env: Dict[str, str], extra_args: List[str]
+) -> float:
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, str(REPO_ROOT / "main.py"), *args, *extra_args],
+        cwd=cwd,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        sys.stderr.write(result.stdout[-4000:] + result.stderr[-4000:])
+        raise SystemExit(f"main.py {' '.join(args)} failed")
+    return elapsed
+
+
+def bench_size(
+    size: int, work_dir: Path, env: Dict[str, str], extra_args: List[str]
+) -> Dict[str, float]:
+    run_dir = work_dir / f"run_{size}"
+    run_dir.mkdir()
+    apps = [f"app_{i}" for i in range(size)]
+    packages = [f"pkg_{i}" for i in range(size)]
+    create_manifest = write_manifest(run_dir / "create.json", apps, packages)
+    create_time = run_main(
+        ["--manifest", str(create_manifest)], run_dir, env, extra_args
+    )
+
+    more_apps = [f"extra_app_{i}" for i in range(size)]
+    more_packages = [f"extra_pkg_{i}" for i in range(size)]
+    add_manifest = write_manifest(run_dir / "add.json", more_apps, more_packages)
+    add_time = run_main(
+        ["--add", str(run_dir / PROJECT_NAME), "--manifest", str(add_manifest)],
+        run_dir,
+        env,
+        extra_args,
+    )
+    return {"create": create_time, "add": add_time}
+
+
+def main():
+    args = parse_args()
+    sizes = [int(size) for size in args.sizes.split(",")]
+    extra_args = args.args.split()
+    results = []
+
+    with tempfile.TemporaryDirectory(prefix="mono_py_bench_") as temp_dir:
+        work_dir = Path(temp_dir)
+        env = benchmark_env(work_dir, args.latency)
+
+        # warm the template cache so every size measures the same thing
+        warm_dir = work_dir / "warmup"
+        warm_dir.mkdir()
+        run_main(
+            ["--manifest", str(write_manifest(warm_dir / "m.json", ["a"], []))],
+            warm_dir,
+            env,
+            [],
+        )
+
+        print(f"{'size':>6} {'create s':>10} {'add s':>10}")
+        for size in sizes:
+            runs = []
+            for attempt in range(args.repeat):
+                attempt_dir = work_dir / f"attempt_{attempt}"
+                attempt_dir.mkdir(exist_ok=True)
+                runs.append(bench_size(size, attempt_dir, env, extra_args))
+            best = {
+                key: min(run[key] for run in runs) for key in ("create", "add")
+            }
+            results.append({"size": size, **best})
+            print(f"{size:>6} {best['create']:>10.3f} {best['add']:>10.3f}")
+
+    if args.json:
+        Path(args.json).write_text(
+            json.dumps({"latency": args.latency, "results": results}, indent=2)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Startup benchmark for the main.py entry point.
+
+Runs main.py under `python -X importtime` for runs that should never load
+the heavy parts of the tool (--help, an argument error, a manifest that fails
+validation) and compares the modules imported and the import time, minus a
+bare interpreter, with the budget in startup_budget.json.
+
+Exits with 1 if a forbidden module is imported or a budget is exceeded.
+
+Usage:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --runs 10 --update-budget
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+BUDGET_PATH = Path(__file__).resolve().parent / "startup_budget.json"
+
+# Modules that only the scaffolding steps need
+HEAVY_MODULES = ["ruamel", "concurrent.futures", "src.pipeline", "src.workspace"]
+
+
+def scenarios(temp_dir: Path) -> Dict[str, Tuple[List[str], List[str]]]:
+    """
+    Returns the main.py arguments and forbidden modules of every scenario.
+    """
+    invalid_manifest = temp_dir / "invalid.json"
+    invalid_manifest.write_text(json.dumps({"project_name": "Invalid"}))
+    return {
+        "help": (["--help"], HEAVY_MODULES + ["colorama", "src.output_util"]),
+        "argument_error": (["--jobs", "many"], HEAVY_MODULES + ["colorama"]),
+        "validation_error": (["--manifest", str(invalid_manifest)], HEAVY_MODULES),
+    }
+
+
+def import_profile(args: List[str]) -> Tuple[Dict[str, int], float]:
+    """
+    Runs python -X importtime and returns the imported modules with their
+    self time in microseconds, and the total import time in milliseconds.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = int(self_us)
+    return modules, sum(modules.values()) / 1000
+
+
+def measure(args: List[str], runs: int) -> Tuple[Dict[str, int], float]:
+    profiles = [import_profile(args) for _ in range(runs)]
+    return profiles[0][0], statistics.median(total for _, total in profiles)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="main.py startup benchmark")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per scenario")
+    parser.add_argument(
+        "--update-budget",
+        action="store_true",
+        help="Write the current numbers, plus headroom, as the new budget",
+    )
+    args = parser.parse_args()
+
+    budget = json.loads(BUDGET_PATH.read_text()) if BUDGET_PATH.exists() else {}
+    baseline_modules, baseline_ms = measure(["-c", "pass"], args.runs)
+    failures = []
+    new_budget = {}
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        print(
+            f"{'scenario':<18} {'modules':>8} {'budget':>7} {'ms':>8} {'budget':>8}"
+        )
+        for name, (main_args, forbidden) in scenarios(Path(temp_dir)).items():
+            modules, total_ms = measure(["main.py", *main_args], args.runs)
+            module_count = len(set(modules) - set(baseline_modules))
+            import_ms = max(0.0, total_ms - baseline_ms)
+            limits = budget.get(name, {})
+            max_modules = limits.get("max_modules")
+            max_ms = limits.get("max_import_ms")
+            print(
+                f"{name:<18} {module_count:>8} {max_modules or '-':>7} "
+                f"{import_ms:>8.1f} {max_ms or '-':>8}"
+            )
+
+            loaded = [
+                module
+                for module in forbidden
+                if any(m == module or m.startswith(module + ".") for m in modules)
+            ]
+            if loaded:
+                failures.append(f"{name}: imports {', '.join(loaded)}")
+            if max_modules is not None and module_count > max_modules:
+                failures.append(f"{name}: {module_count} modules > {max_modules}")
+            if max_ms is not None and import_ms > max_ms:
+                failures.append(f"{name}: {import_ms:.1f} ms > {max_ms} ms")
+
+            new_budget[name] = {
+                "max_modules": module_count + 5,
+                "max_import_ms": round(max(import_ms * 2, import_ms + 10), 1),
+            }
+
+    if args.update_budget:
+        BUDGET_PATH.write_text(json.dumps(new_budget, indent=2) + "\n")
+        print(f"Updated {BUDGET_PATH}")
+        return
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,409 @@
+"""
+Stand-ins for the flutter, dart and melos executables.
+
+They reproduce the file-system effects the scaffolder relies on
+(`flutter create`, `flutter pub add/get`, `flutter gen-l10n`,
+`melos bootstrap`, `melos run loc`, `dart pub cache add`) without the
+Flutter SDK, so the Python layer can be timed on any Linux box.
+
+Environment:
+    FAKE_TOOLCHAIN_LATENCY: Seconds every command sleeps (default 0).
+    FAKE_TOOLCHAIN_LATENCY_<KIND>: Per kind override, KIND being one of
+        CREATE, PUB, GEN_L10N, MELOS, CACHE, VERSION.
+    FAKE_TOOLCHAIN_FAIL: Comma separated command prefixes that exit with 1,
+        e.g. "melos bs,flutter pub add".
+    FAKE_TOOLCHAIN_FAIL_CODE: Exit code of the injected failures (default 1),
+        e.g. 69 for the transient pub failures that are retried.
+    FAKE_TOOLCHAIN_FAIL_TIMES: Only fail the first N matching runs, counted
+        in FAKE_TOOLCHAIN_LOG.
+    FAKE_TOOLCHAIN_LOG: File every invocation is appended to.
+"""
+
+import json
+import os
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+FLUTTER_VERSION = "3.99.0-fake"
+DART_VERSION = "3.9.0"
+MELOS_VERSION = "6.3.2"
+
+# A 1x1 PNG, so binary files exist in the generated platform folders
+PNG = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c6360000002000154a24f5d0000000049454e44ae426082"
+)
+
+
+def sleep_for(kind: str) -> None:
+    latency = os.environ.get(
+        f"FAKE_TOOLCHAIN_LATENCY_{kind}", os.environ.get("FAKE_TOOLCHAIN_LATENCY", "0")
+    )
+    if float(latency) > 0:
+        time.sleep(float(latency))
+
+
+def snake_to_camel(name: str) -> str:
+    words = [w for w in name.split("_") if w]
+    return words[0] + "".join(w.title() for w in words[1:]) if words else ""
+
+
+def snake_to_title(name: str) -> str:
+    return " ".join(w.title() for w in name.split("_") if w)
+
+
+def write(path: Path, content) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if isinstance(content, bytes):
+        path.write_bytes(content)
+    else:
+        path.write_text(content, encoding="utf-8")
+
+
+def flutter_create(args: List[str]) -> int:
+    sleep_for("CREATE")
+    template = "app"
+    platforms = ["android", "ios", "linux", "macos", "web", "windows"]
+    no_pub = False
+    positional = []
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg in ("-t", "--template"):
+            template = args[i + 1]
+            i += 1
+        elif arg.startswith("--template="):
+            template = arg.split("=", 1)[1]
+        elif arg.startswith("--platforms="):
+            platforms = arg.split("=", 1)[1].split(",")
+        elif arg == "--no-pub":
+            no_pub = True
+        elif not arg.startswith("-"):
+            positional.append(arg)
+        i += 1
+
+    project = Path(positional[-1])
+    name = project.name
+    camel = snake_to_camel(name)
+    title = snake_to_title(name)
+
+    write(
+        project / "pubspec.yaml",
+        f"name: {name}\n"
+        'description: "A new Flutter project."\n'
+        "publish_to: 'none'\n"
+        "version: 1.0.0+1\n\n"
+        "environment:\n  sdk: ^3.6.0\n\n"
+        "dependencies:\n  flutter:\n    sdk: flutter\n\n"
+        "dev_dependencies:\n  flutter_test:\n    sdk: flutter\n"
+        "  flutter_lints: ^5.0.0\n\n"
+        "flutter:\n  uses-material-design: true\n",
+    )
+    write(
+        project / "analysis_options.yaml",
+        "include: package:flutter_lints/flutter.yaml\n",
+    )
+    write(project / "README.md", f"# {name}\n\nA new Flutter project.\n")
+    write(
+        project / ".metadata",
+        f"version:\n  revision: fake\n  channel: stable\n\nproject_type: {template}\n",
+    )
+
+    if template == "package":
+        write(project / "lib" / f"{name}.dart", "library;\n\nclass Calculator {}\n")
+        write(
+            project / "test" / f"{name}_test.dart",
+            f"import 'package:{name}/{name}.dart';\n\nvoid main() {{}}\n",
+        )
+    else:
+        write(
+            project / "lib" / "main.dart",
+            "import 'package:flutter/material.dart';\n\n"
+            "void main() => runApp(const MyApp());\n",
+        )
+        write(
+            project / "test" / "widget_test.dart",
+            f"import 'package:{name}/main.dart';\n\nvoid main() {{}}\n",
+        )
+        if "android" in platforms:
+            android = project / "android"
+            write(
+                android / "app" / "build.gradle",
+                f'android {{\n    namespace = "com.example.{name}"\n'
+                f'    defaultConfig {{\n        applicationId = "com.example.{name}"\n'
+                "    }\n}\n",
+            )
+            write(
+                android / "app/src/main/kotlin/com/example" / name / "MainActivity.kt",
+                f"package com.example.{name}\n\n"
+                "import io.flutter.embedding.android.FlutterActivity\n\n"
+                "class MainActivity : FlutterActivity()\n",
+            )
+            write(
+                android / "app/src/main/AndroidManifest.xml",
+                f'<manifest>\n    <application android:label="{name}" />\n</manifest>\n',
+            )
+            write(android / "gradle.properties", "org.gradle.jvmargs=-Xmx4G\n")
+            write(android / "gradle/wrapper/gradle-wrapper.jar", b"PK\x03\x04fake-jar")
+            for density in ("mdpi", "hdpi", "xhdpi", "xxhdpi", "xxxhdpi"):
+                write(
+                    android / f"app/src/main/res/mipmap-{density}/ic_launcher.png", PNG
+                )
+        if "ios" in platforms:
+            ios = project / "ios"
+            write(
+                ios / "Runner" / "Info.plist",
+                "<plist><dict>\n"
+                f"<key>CFBundleDisplayName</key><string>{title}</string>\n"
+                f"<key>CFBundleName</key><string>{name}</string>\n"
+                "</dict></plist>\n",
+            )
+            write(
+                ios / "Runner.xcodeproj" / "project.pbxproj",
+                f"PRODUCT_BUNDLE_IDENTIFIER = com.example.{camel};\n",
+            )
+            write(ios / "Runner/Assets.xcassets/AppIcon.appiconset/Icon-1024.png", PNG)
+            write(ios / "Runner/AppDelegate.swift", "import Flutter\nimport UIKit\n")
+        if "web" in platforms:
+            write(project / "web/index.html", f"<title>{name}</title>\n")
+            write(
+                project / "web/manifest.json",
+                json.dumps({"name": name, "short_name": name}, indent=4) + "\n",
+            )
+            write(project / "web/favicon.png", PNG)
+        if "linux" in platforms:
+            write(
+                project / "linux/CMakeLists.txt",
+                f'set(BINARY_NAME "{name}")\n'
+                f'set(APPLICATION_ID "com.example.{name}")\n',
+            )
+            write(project / "linux/runner/main.cc", "int main() { return 0; }\n")
+        if "macos" in platforms:
+            write(
+                project / "macos/Runner/Configs/AppInfo.xcconfig",
+                f"PRODUCT_NAME = {name}\n"
+                f"PRODUCT_BUNDLE_IDENTIFIER = com.example.{camel}\n",
+            )
+            write(
+                project / "macos/Runner/Assets.xcassets/AppIcon.appiconset/icon_16.png",
+                PNG,
+            )
+        if "windows" in platforms:
+            write(
+                project / "windows/CMakeLists.txt",
+                f'project({name} LANGUAGES CXX)\nset(BINARY_NAME "{name}")\n',
+            )
+            write(project / "windows/runner/resources/app_icon.ico", PNG)
+
+    if not no_pub:
+        pub_get(project)
+    print(f"Creating project {name}...\nAll done!")
+    return 0
+
+
+def find_pub_root(path: Path) -> Path:
+    """
+    Returns the workspace root for members with `resolution: workspace`.
+    """
+    pubspec = path / "pubspec.yaml"
+    if pubspec.exists() and "resolution: workspace" in pubspec.read_text():
+        for parent in path.parents:
+            root_pubspec = parent / "pubspec.yaml"
+            if root_pubspec.exists() and "workspace:" in root_pubspec.read_text():
+                return parent
+    return path
+
+
+def pub_get(path: Path) -> int:
+    root = find_pub_root(path)
+    if not (root / "pubspec.yaml").exists():
+        print("Could not find a file named pubspec.yaml", file=sys.stderr)
+        return 66
+    write(root / "pubspec.lock", "# Generated by the fake toolchain\npackages: {}\n")
+    write(
+        root / ".dart_tool" / "package_config.json",
+        json.dumps({"configVersion": 2, "packages": []}, indent=2) + "\n",
+    )
+    print("Got dependencies!")
+    return 0
+
+
+def parse_dependency(spec: str) -> tuple:
+    section = "dependencies"
+    if spec.startswith("dev:"):
+        section, spec = "dev_dependencies", spec[4:]
+    elif spec.startswith("override:"):
+        section, spec = "dependency_overrides", spec[9:]
+    name, _, descriptor = spec.partition(":")
+    if descriptor.startswith("{"):
+        source = json.loads(descriptor)
+        body = "".join(f"\n    {key}: {value}" for key, value in source.items())
+        return section, name, body
+    return section, name, f" {descriptor or '^1.0.0'}"
+
+
+def pub_add(path: Path, specs: List[str]) -> int:
+    pubspec = path / "pubspec.yaml"
+    if not pubspec.exists():
+        print("Could not find a file named pubspec.yaml", file=sys.stderr)
+        return 66
+
+    lines = pubspec.read_text().splitlines()
+    for spec in specs:
+        section, name, body = parse_dependency(spec)
+        if any(line.startswith(f"  {name}:") for line in lines):
+            continue
+        entry = f"  {name}:{body}".splitlines()
+        if f"{section}:" in lines:
+            index = lines.index(f"{section}:") + 1
+            lines[index:index] = entry
+        else:
+            lines += ["", f"{section}:", *entry]
+    pubspec.write_text("\n".join(lines) + "\n")
+    return pub_get(path)
+
+
+def read_simple_yaml(path: Path) -> Dict[str, str]:
+    values = {}
+    for line in path.read_text().splitlines():
+        match = re.match(r"^([\w-]+):\s*(.*)$", line)
+        if match:
+            values[match.group(1)] = match.group(2).strip("'\"")
+    return values
+
+
+def gen_l10n(path: Path) -> int:
+    sleep_for("GEN_L10N")
+    config = read_simple_yaml(path / "l10n.yaml")
+    arb_dir = path / config.get("arb-dir", "lib/l10n")
+    if not arb_dir.is_dir():
+        print(f"Cannot find the arb-dir {arb_dir}", file=sys.stderr)
+        return 1
+    template = arb_dir / config.get("template-arb-file", "app_en.arb")
+    messages = json.loads(template.read_text())
+    keys = [key for key in messages if not key.startswith("@")]
+    output_dir = path / config.get("output-dir", config.get("arb-dir", "lib/l10n"))
+    output_class = config.get("output-class", "AppLocalizations")
+    getters = "".join(f"  String get {key};\n" for key in keys)
+    write(
+        output_dir / config.get("output-localization-file", "app_localizations.dart"),
+        f"abstract class {output_class} {{\n{getters}}}\n",
+    )
+    return 0
+
+
+def melos_packages(root: Path) -> List[Path]:
+    scope = os.environ.get("MELOS_PACKAGES")
+    allowed = set(scope.split(",")) if scope else None
+    packages = []
+    for folder in ("packages", "apps"):
+        for pubspec in sorted((root / folder).glob("*/pubspec.yaml")):
+            if allowed is None or pubspec.parent.name in allowed:
+                packages.append(pubspec.parent)
+    return packages
+
+
+def flutter(args: List[str]) -> int:
+    if args[:1] == ["--version"]:
+        sleep_for("VERSION")
+        if "--machine" in args:
+            print(
+                json.dumps(
+                    {
+                        "frameworkVersion": FLUTTER_VERSION,
+                        "channel": "stable",
+                        "dartSdkVersion": DART_VERSION,
+                    }
+                )
+            )
+        else:
+            print(f"Flutter {FLUTTER_VERSION} • channel stable")
+        return 0
+    if args[:1] == ["create"]:
+        return flutter_create(args[1:])
+    if args[:2] == ["pub", "get"]:
+        sleep_for("PUB")
+        return pub_get(Path.cwd())
+    if args[:2] == ["pub", "add"]:
+        sleep_for("PUB")
+        specs = [arg for arg in args[2:] if not arg.startswith("-")]
+        return pub_add(Path.cwd(), specs)
+    if args[:1] == ["gen-l10n"]:
+        return gen_l10n(Path.cwd())
+    print(f"fake flutter: unsupported command {args}", file=sys.stderr)
+    return 64
+
+
+def dart(args: List[str]) -> int:
+    if args[:1] == ["--version"]:
+        sleep_for("VERSION")
+        print(f"Dart SDK version: {DART_VERSION} (stable) on \"linux_x64\"")
+        return 0
+    if args[:3] == ["pub", "cache", "add"]:
+        sleep_for("CACHE")
+        print(f"Downloading {args[3]}...")
+        return 0
+    if args[:3] == ["pub", "global", "activate"]:
+        sleep_for("CACHE")
+        return 0
+    if args[:1] == ["pub"]:
+        return flutter(args)
+    print(f"fake dart: unsupported command {args}", file=sys.stderr)
+    return 64
+
+
+def melos(args: List[str]) -> int:
+    if args[:1] == ["--version"]:
+        sleep_for("VERSION")
+        print(MELOS_VERSION)
+        return 0
+    sleep_for("MELOS")
+    root = Path.cwd()
+    command = [arg for arg in args if not arg.startswith("-")]
+    if command[:1] in (["bs"], ["bootstrap"]):
+        return pub_get(root)
+    if command[:1] == ["loc"] or command[:2] == ["run", "loc"]:
+        for package in melos_packages(root):
+            if (package / "l10n.yaml").exists() and gen_l10n(package) != 0:
+                return 1
+        return 0
+    if command[:1] == ["exec"]:
+        return 0
+    print(f"fake melos: unsupported command {args}", file=sys.stderr)
+    return 64
+
+
+def injected_failure_due(log_path: Optional[str], failing: List[str]) -> bool:
+    times = os.environ.get("FAKE_TOOLCHAIN_FAIL_TIMES")
+    if not times or not log_path:
+        return True
+    with open(log_path) as f:
+        command_lines = [line.split("\t", 1)[-1] for line in f]
+    runs = sum(
+        any(prefix and line.startswith(prefix) for prefix in failing)
+        for line in command_lines
+    )
+    # the log already holds this run
+    return runs <= int(times)
+
+
+def main(tool: str) -> None:
+    args = sys.argv[1:]
+    command_line = " ".join([tool, *args])
+
+    log_path = os.environ.get("FAKE_TOOLCHAIN_LOG")
+    if log_path:
+        with open(log_path, "a") as f:
+            f.write(f"{os.getcwd()}\t{command_line}\n")
+
+    failing = [p.strip() for p in os.environ.get("FAKE_TOOLCHAIN_FAIL", "").split(",")]
+    if any(prefix and command_line.startswith(prefix) for prefix in failing):
+        if injected_failure_due(log_path, failing):
+            print(f"fake {tool}: injected failure", file=sys.stderr)
+            sys.exit(int(os.environ.get("FAKE_TOOLCHAIN_FAIL_CODE", "1")))
+
+    handler = {"flutter": flutter, "dart": dart, "melos": melos}[tool]
+    sys.exit(handler(args))
@@ -1,18 +1,12 @@
 import argparse
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING, Optional
 
-from src.constants import LIB
-from src.dart_util import create_dart_file
-from src.input_util import take_user_input
-from src.localization_setup import setup_localization
-from src.melos_util import is_melos_installed, melos_command
-from src.output_util import OutputType, output
-from src.package_util import add_package, create_flutter_templates, pub_get
-from src.templates import res_export_template
-from src.theme_setup import setup_themes
-from src.yaml import (add_to_workspace, create_root_melos_yaml,
-                      create_root_pubspec_yaml)
+# Only the argument parser is loaded up front, so --help and argument errors
+# stay fast. Everything else is imported by the code path that needs it.
+if TYPE_CHECKING:
+    from src.models import UserInput
 
 
 def is_flutter_monorepo(path: Path) -> bool:
@@ -29,12 +23,12 @@ def is_flutter_monorepo(path: Path) -> bool:
     return all((path / file).exists() for file in required_files)
 
 
-def parse_args():
+def build_parser() -> argparse.ArgumentParser:
     """
-    Parse command line arguments.
+    Builds the command line parser.
 
     Returns:
-        argparse.Namespace: Parsed arguments
+        argparse.ArgumentParser: The parser of main.py
     """
     parser = argparse.ArgumentParser(
         description="Flutter Monorepo Setup Tool",
@@ -46,6 +40,31 @@ Examples:
 
   # Add to existing monorepo
   python main.py --add /path/to/monorepo
+
+  # Create a new monorepo without prompts
+  python main.py --manifest spec.yaml
+
+  # Download the packages the scaffolder adds, then scaffold offline
+  python main.py prime-cache
+  python main.py --offline --manifest spec.yaml
+
+  # Analyze only the packages affected by the changes since main
+  melos exec $(python main.py graph --since main --format scope) -- dart analyze .
+
+  # Save a scaffolded monorepo once, then create new ones from it
+  python main.py export-golden --output golden.tar.gz
+  python main.py --manifest spec.yaml --golden golden.tar.gz
+
+  # Create every monorepo of a catalog, four at a time
+  python main.py batch catalog.yaml --workers 4 --output-dir build
+
+  # Show how long flutter, dart and melos commands take across runs
+  python main.py command-stats
+
+  # Replace the ARB files with the translations from a table
+  # and regenerate the localizations
+  python main.py import-translations translations.csv --path /path/to/monorepo
+  python main.py gen-l10n --path /path/to/monorepo
         """,
     )
 
@@ -56,7 +75,326 @@ Examples:
         metavar="PATH",
     )
 
-    return parser.parse_args()
+    parser.add_argument(
+        "--manifest",
+        type=str,
+        help="Read the project name, apps, packages, locales and options "
+        "from a YAML or JSON file instead of prompting",
+        metavar="FILE",
+    )
+
+    parser.add_argument(
+        "--refresh-template-cache",
+        action="store_true",
+        help="Rebuild the cached `flutter create` output before using it",
+    )
+
+    parser.add_argument(
+        "--templates",
+        type=str,
+        help="Directory of template sets that replace or extend the built-in "
+        "templates (layout: <set>/<output path>.tmpl)",
+        metavar="DIR",
+    )
+
+    parser.add_argument(
+        "--share-platform-files",
+        action="store_true",
+        help="Store the platform files that are the same in every app once in "
+        ".mono_py/objects and reflink or hardlink them into the apps",
+    )
+
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Resolve packages from the local pub cache only (see prime-cache)",
+    )
+
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        help="Number of apps and packages created at the same time "
+        "(default: based on CPU count and available memory)",
+        metavar="N",
+    )
+
+    parser.add_argument(
+        "--golden",
+        type=str,
+        help="Create the monorepo by extracting an archive written by "
+        "export-golden instead of running every setup step",
+        metavar="ARCHIVE",
+    )
+
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted scaffold, skipping the steps that finished",
+    )
+
+    parser.add_argument(
+        "--no-progress",
+        action="store_true",
+        help="Do not show the live view of running commands on a terminal",
+    )
+
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print wall time, CPU time and memory of every step and subprocess",
+    )
+
+    parser.add_argument(
+        "--profile-trace",
+        type=str,
+        help="Also write the profile as a Chrome trace-event JSON file "
+        "(implies --profile)",
+        metavar="FILE",
+    )
+
+    subparsers = parser.add_subparsers(dest="command", metavar="COMMAND")
+
+    prime_cache_parser = subparsers.add_parser(
+        "prime-cache",
+        help="Download the packages the scaffolder adds into the pub cache "
+        "(honours PUB_HOSTED_URL)",
+    )
+    prime_cache_parser.add_argument(
+        "packages",
+        nargs="*",
+        help="Extra packages to cache",
+        metavar="PACKAGE",
+    )
+
+    import_parser = subparsers.add_parser(
+        "import-translations",
+        help="Write one ARB file per locale column of a translation table "
+        "into the resources package",
+    )
+    import_parser.add_argument(
+        "table",
+        help="CSV, TSV, JSON or JSON Lines table with a 'key' column, an optional "
+        "'description' column and one column per locale",
+        metavar="TABLE",
+    )
+    import_parser.add_argument(
+        "--path",
+        default=".",
+        help="Root of the monorepo (default: current directory)",
+        metavar="PATH",
+    )
+
+    gen_l10n_parser = subparsers.add_parser(
+        "gen-l10n",
+        help="Generate the localizations of every app and package with an "
+        "l10n.yaml, without starting the Flutter tool",
+    )
+    gen_l10n_parser.add_argument(
+        "--path",
+        default=".",
+        help="Root of the monorepo (default: current directory)",
+        metavar="PATH",
+    )
+
+    graph_parser = subparsers.add_parser(
+        "graph",
+        help="Print the apps and packages in dependency order, or only the ones "
+        "affected by changed files",
+    )
+    graph_parser.add_argument(
+        "--path",
+        default=".",
+        help="Root of the monorepo (default: current directory)",
+        metavar="PATH",
+    )
+    changes = graph_parser.add_mutually_exclusive_group()
+    changes.add_argument(
+        "--changed",
+        nargs="+",
+        help="Changed files, relative to the root",
+        metavar="FILE",
+    )
+    changes.add_argument(
+        "--changed-from",
+        help="File with one changed path per line, '-' for stdin "
+        "(e.g. the output of git diff --name-only)",
+        metavar="FILE",
+    )
+    changes.add_argument(
+        "--since",
+        help="Use the files changed since a git revision",
+        metavar="REF",
+    )
+    graph_parser.add_argument(
+        "--format",
+        choices=["lines", "scope", "json"],
+        default="lines",
+        help="One name per line, melos --scope arguments or JSON (default: lines)",
+    )
+
+    export_golden_parser = subparsers.add_parser(
+        "export-golden",
+        help="Scaffold a monorepo with placeholder names and save it as an "
+        "archive for --golden",
+    )
+    export_golden_parser.add_argument(
+        "--output",
+        default="mono_py_golden.tar.gz",
+        help="Archive to write (default: mono_py_golden.tar.gz)",
+        metavar="FILE",
+    )
+    export_golden_parser.add_argument(
+        "--locales",
+        nargs="+",
+        help="Locales of the golden monorepo (default: en ne)",
+        metavar="LOCALE",
+    )
+
+    subparsers.add_parser(
+        "command-stats",
+        help="Print the p50, p95 and p99 duration and the timeout of every "
+        "external command type over recent runs",
+    )
+
+    batch_parser = subparsers.add_parser(
+        "batch",
+        help="Create many monorepos from manifests or catalogs on a process pool",
+    )
+    batch_parser.add_argument(
+        "manifests",
+        nargs="+",
+        help="Manifests, or catalogs with a list of manifests under 'workspaces'",
+        metavar="FILE",
+    )
+    batch_parser.add_argument(
+        "--output-dir",
+        default=".",
+        help="Directory the monorepos are created in (default: current directory)",
+        metavar="DIR",
+    )
+    batch_parser.add_argument(
+        "--logs",
+        default="mono_py_logs",
+        help="Directory of the per-monorepo logs (default: mono_py_logs)",
+        metavar="DIR",
+    )
+    batch_parser.add_argument(
+        "--workers",
+        type=int,
+        help="Number of monorepos created at the same time "
+        "(default: based on CPU count and available memory)",
+        metavar="N",
+    )
+    batch_parser.add_argument(
+        "--report",
+        help="Also write the throughput report as JSON",
+        metavar="FILE",
+    )
+
+    return parser
+
+
+def parse_args():
+    """
+    Parse command line arguments.
+
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    return build_parser().parse_args()
+
+
+# Options a manifest may set: the argument each one sets and its type
+MANIFEST_OPTIONS = {
+    "refresh-template-cache": ("refresh_template_cache", bool),
+    "templates": ("templates", str),
+    "share-platform-files": ("share_platform_files", bool),
+    "offline": ("offline", bool),
+    "jobs": ("jobs", int),
+    "golden": ("golden", str),
+    "resume": ("resume", bool),
+    "no-progress": ("no_progress", bool),
+    "profile": ("profile", bool),
+    "profile-trace": ("profile_trace", str),
+}
+
+
+def manifest_option_values(options: dict) -> Optional[dict]:
+    """
+    Checks the manifest 'options' against MANIFEST_OPTIONS. Options are
+    named like the flags, with dashes or underscores: flags take true or
+    false, and the other options a value of their type.
+
+    Returns:
+        dict: The values by argument name, or None if an option is unknown
+        or has a value of the wrong type
+    """
+    from src.output_util import OutputType, output
+
+    values = {}
+    for key, value in options.items():
+        option = MANIFEST_OPTIONS.get(str(key).replace("_", "-"))
+        if option is None:
+            output(f"Unknown manifest option '{key}'.", OutputType.ERROR)
+            return None
+        dest, option_type = option
+        if option_type is bool:
+            valid = isinstance(value, bool)
+            expected = "true or false"
+        else:
+            # bool is an int subclass, so `jobs: true` is rejected explicitly
+            valid = isinstance(value, option_type) and not isinstance(value, bool)
+            expected = "a number" if option_type is int else "a string"
+        if not valid:
+            output(
+                f"Manifest option '{key}' must be {expected}, got {value!r}.",
+                OutputType.ERROR,
+            )
+            return None
+        values[dest] = value
+    return values
+
+
+def apply_manifest_options(args: argparse.Namespace, options: dict) -> bool:
+    """
+    Applies the manifest 'options' to the parsed arguments.
+    Flags given on the command line take precedence.
+
+    Returns:
+        bool: False if an option is unknown or has a value of the wrong type
+    """
+    values = manifest_option_values(options)
+    if values is None:
+        return False
+    for dest, value in values.items():
+        if getattr(args, dest) in (None, False):
+            setattr(args, dest, value)
+    return True
+
+
+def start_live_progress(args: argparse.Namespace):
+    """
+    Shows the running commands on a terminal, unless --no-progress is set.
+    """
+    if not args.no_progress:
+        from src.progress_util import enable_live_progress
+
+        enable_live_progress()
+
+
+def prepare_commands():
+    """
+    Kills the running external commands on Ctrl+C and saves their durations
+    for command-stats when the tool exits.
+    """
+    import atexit
+
+    from src.command_stats import save_command_stats
+    from src.process_util import install_interrupt_handler
+
+    install_interrupt_handler()
+    atexit.register(save_command_stats)
 
 
 def main():
@@ -65,6 +403,184 @@ def main():
     """
     args = parse_args()
 
+    # the output of graph is read by other programs; new monorepos start the
+    # live view once a manifest may have set no-progress
+    if args.command not in (None, "graph"):
+        start_live_progress(args)
+
+    if args.command == "command-stats":
+        from src.command_stats import print_command_stats
+        from src.process_util import command_timeout
+
+        print_command_stats(command_timeout)
+        sys.exit(0)
+
+    if args.command:
+        prepare_commands()
+
+    if args.command == "prime-cache":
+        from src.pub_util import SCAFFOLD_PACKAGES, prime_pub_cache
+        from src.toolchain import check_toolchain
+
+        if not check_toolchain(["dart"]):
+            sys.exit(1)
+
+        packages = SCAFFOLD_PACKAGES + [
+            package for package in args.packages if package not in SCAFFOLD_PACKAGES
+        ]
+        sys.exit(0 if prime_pub_cache(packages) else 1)
+
+    if args.command in ("import-translations", "gen-l10n"):
+        from src.l10n_codegen import generate_localizations
+        from src.output_util import OutputType, output
+        from src.translation_import import import_translations
+
+        root_path = Path(args.path)
+        if not is_flutter_monorepo(root_path):
+            output(f"'{args.path}' is not a Flutter Melos monorepo.", OutputType.ERROR)
+            sys.exit(1)
+        if args.command == "import-translations" and not import_translations(
+            root_path, Path(args.table)
+        ):
+            sys.exit(1)
+        sys.exit(0 if generate_localizations(root_path) else 1)
+
+    if args.command == "graph":
+        from src.dependency_graph import git_changed_paths, print_graph
+        from src.output_util import OutputType, output, set_message_stream
+
+        set_message_stream(sys.stderr)
+        root_path = Path(args.path)
+        if not is_flutter_monorepo(root_path):
+            output(f"'{args.path}' is not a Flutter Melos monorepo.", OutputType.ERROR)
+            sys.exit(1)
+        changed_paths = args.changed
+        if args.changed_from == "-":
+            changed_paths = sys.stdin.read().splitlines()
+        elif args.changed_from:
+            try:
+                changed_paths = Path(args.changed_from).read_text().splitlines()
+            except OSError as e:
+                output(f"Failed to read '{args.changed_from}': {e}", OutputType.ERROR)
+                sys.exit(1)
+        elif args.since:
+            changed_paths = git_changed_paths(root_path, args.since)
+            if changed_paths is None:
+                sys.exit(1)
+        sys.exit(0 if print_graph(root_path, changed_paths, args.format) else 1)
+
+    if args.command == "batch":
+        from src.batch import build_batch
+        from src.manifest_util import load_catalog
+        from src.output_util import OutputType, output
+        from src.template_cache import set_refresh_template_cache
+
+        if args.add or args.manifest or args.resume:
+            output(
+                "--add, --manifest and --resume do not apply to batch.",
+                OutputType.ERROR,
+            )
+            sys.exit(1)
+        manifests = []
+        for manifest_file in args.manifests:
+            catalog = load_catalog(Path(manifest_file))
+            if catalog is None:
+                sys.exit(1)
+            for manifest in catalog:
+                options = manifest_option_values(manifest.options)
+                if options is None:
+                    sys.exit(1)
+                manifest.options = options
+            manifests += catalog
+
+        set_refresh_template_cache(args.refresh_template_cache)
+        defaults = {
+            "offline": args.offline,
+            "jobs": args.jobs,
+            "templates": args.templates,
+            "share_platform_files": args.share_platform_files,
+            "golden": args.golden,
+        }
+        built = build_batch(
+            manifests,
+            defaults,
+            Path(args.output_dir),
+            Path(args.logs),
+            args.workers,
+            Path(args.report) if args.report else None,
+        )
+        sys.exit(0 if built else 1)
+
+    input = None
+    if args.manifest:
+        from src.manifest_util import load_manifest
+
+        manifest = load_manifest(Path(args.manifest))
+        if manifest is None or not apply_manifest_options(args, manifest.options):
+            sys.exit(1)
+        input = manifest.user_input
+
+    if args.command is None:
+        start_live_progress(args)
+    prepare_commands()
+    from src.output_util import OutputType, output
+    from src.package_util import set_jobs
+    from src.profiler import (enable_profiling, is_profiling,
+                              print_profile_summary, write_chrome_trace)
+    from src.pub_util import set_offline
+    from src.template_cache import (set_refresh_template_cache,
+                                    set_share_platform_files)
+    from src.template_registry import set_user_template_dir
+
+    if args.templates:
+        templates_dir = Path(args.templates)
+        if not templates_dir.is_dir():
+            output(f"Template directory '{templates_dir}' not found.", OutputType.ERROR)
+            sys.exit(1)
+        set_user_template_dir(templates_dir.resolve())
+
+    set_refresh_template_cache(args.refresh_template_cache)
+    set_share_platform_files(args.share_platform_files)
+    set_offline(args.offline)
+    set_jobs(args.jobs)
+    if args.profile or args.profile_trace:
+        enable_profiling()
+
+    try:
+        run(args, input)
+    finally:
+        if is_profiling():
+            print_profile_summary()
+            if args.profile_trace:
+                write_chrome_trace(Path(args.profile_trace))
+
+
+def run(args: argparse.Namespace, input: Optional["UserInput"]):
+    """
+    Runs the create, --add or export-golden flow
+    """
+    from src.input_util import take_user_input
+    from src.output_util import OutputType, output
+    from src.pipeline import add_to_monorepo, create_monorepo
+    from src.toolchain import check_toolchain
+
+    if args.command == "export-golden":
+        from src.constants import DEFAULT_LOCALES
+        from src.manifest_util import validate_locales
+        from src.pipeline import export_golden
+
+        locales = args.locales or DEFAULT_LOCALES
+        if not validate_locales(locales) or not check_toolchain(["flutter", "melos"]):
+            sys.exit(1)
+        sys.exit(0 if export_golden(Path(args.output), locales) else 1)
+
+    if args.golden and args.add:
+        output("--golden only applies to new monorepos.", OutputType.ERROR)
+        sys.exit(1)
+    if args.golden and not Path(args.golden).is_file():
+        output(f"Golden archive '{args.golden}' not found.", OutputType.ERROR)
+        sys.exit(1)
+
     if args.add:
         monorepo_path = Path(args.add)
         if not monorepo_path.exists():
@@ -83,54 +599,22 @@ def main():
             )
             sys.exit(1)
 
-        if not is_melos_installed():
-            output(
-                "Melos is not installed. Please install Melos first:\n"
-                "dart pub global activate melos",
-                OutputType.ERROR,
-            )
+        if not check_toolchain(["flutter", "melos"]):
             sys.exit(1)
 
-        output(f"Adding to existing monorepo at: {monorepo_path}", OutputType.INFO)
-        input = take_user_input()
-        create_flutter_templates(monorepo_path, input.apps, is_app=True)
-        create_flutter_templates(monorepo_path, input.packages, is_app=False)
-        add_to_workspace(monorepo_path, input.apps, input.packages)
+        add_to_monorepo(monorepo_path, input)
         return
 
     # Create new monorepo
-    output("Flutter monorepo setup:", OutputType.INFO)
-    input = take_user_input()
-    project_name = input.project_name
-    if project_name is None:
-        return
-    monorepo_path = Path.cwd() / project_name
-    try:
-        monorepo_path.mkdir(parents=True, exist_ok=False)
-    except FileExistsError:
-        output(f"Folder '{project_name}' already exists.", OutputType.ERROR)
+    if not check_toolchain(["flutter", "melos"]):
         sys.exit(1)
 
-    output(f"Created folder: {monorepo_path}", OutputType.SUCCESS)
-    create_root_pubspec_yaml(monorepo_path, project_name)
-    add_package(monorepo_path, "melos", True)
-    create_root_melos_yaml(monorepo_path, project_name, input.packages)
-    create_flutter_templates(monorepo_path, input.apps, is_app=True)
-    create_flutter_templates(monorepo_path, input.packages, is_app=False)
-    add_to_workspace(monorepo_path, input.apps, input.packages)
-    res_package = project_name + "_resources"
-    setup_localization(project_name, res_package, monorepo_path, input.apps)
-    setup_themes(
-        project_name,
-        res_package,
-        monorepo_path,
-    )
-    melos_command(monorepo_path, ["bs"])
-    melos_command(monorepo_path, ["loc"])
-    project_path = monorepo_path / "packages" / res_package / LIB
-    file_name = f"{res_package}.dart"
-    create_dart_file(project_path, file_name, res_export_template(project_name))
-    pub_get(monorepo_path)
+    output("Flutter monorepo setup:", OutputType.INFO)
+    create_monorepo(
+        input or take_user_input(),
+        resume=args.resume,
+        golden=Path(args.golden) if args.golden else None,
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,300 @@
+import json
+import multiprocessing
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stderr, redirect_stdout
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.models import Manifest, UserInput
+from src.output_util import OutputType, output, output_lines
+
+# Manifest options a workspace of a batch may set for itself
+BATCH_OPTIONS = {"offline", "jobs", "templates", "share_platform_files", "golden"}
+
+
+@dataclass
+class WorkspaceResult:
+    project_name: str
+    ok: bool
+    seconds: float
+    log_path: str
+    # wall time of every scaffold step, by step name
+    stages: Dict[str, float] = field(default_factory=dict)
+
+
+def batch_settings(
+    defaults: Dict[str, Any], manifests: List[Manifest]
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Merges the options of every manifest over the batch-wide settings.
+
+    Returns:
+        The settings of each workspace, or None if a manifest has an option
+        that cannot be set per workspace.
+    """
+    settings = []
+    for manifest in manifests:
+        options = {key.replace("-", "_"): v for key, v in manifest.options.items()}
+        unknown = set(options) - BATCH_OPTIONS
+        if unknown:
+            output(
+                f"{manifest.user_input.project_name}: options "
+                f"{', '.join(sorted(unknown))} cannot be set per workspace.",
+                OutputType.ERROR,
+            )
+            return None
+        workspace_settings = {**defaults, **options}
+        # workers change directory, so paths are made absolute here
+        for key in ("templates", "golden"):
+            if workspace_settings.get(key):
+                workspace_settings[key] = str(Path(workspace_settings[key]).resolve())
+        settings.append(workspace_settings)
+    return settings
+
+
+def warm_caches(settings: List[Dict[str, Any]]) -> bool:
+    """
+    Probes the toolchain and builds the template snapshots once, before the
+    workers start, so every worker reads them from the shared cache directory.
+    """
+    from src.template_cache import get_template_snapshot
+    from src.toolchain import check_toolchain
+
+    if not check_toolchain(["flutter", "melos"]):
+        return False
+    if all(workspace_settings.get("golden") for workspace_settings in settings):
+        return True
+    output("Warming the template cache...", OutputType.INFO)
+    return all(get_template_snapshot(template) for template in ("app", "package"))
+
+
+def build_batch(
+    manifests: List[Manifest],
+    defaults: Dict[str, Any],
+    output_dir: Path,
+    log_dir: Path,
+    workers: Optional[int] = None,
+    report_path: Optional[Path] = None,
+) -> bool:
+    """
+    Checks the workspaces of a batch, warms the shared caches, creates every
+    workspace and prints the throughput report.
+
+    Args:
+        manifests: The workspaces to create.
+        defaults: The batch-wide options (--offline, --jobs, --templates,
+            --share-platform-files, --golden).
+        output_dir: The directory the workspaces are created in.
+        log_dir: The directory of the workspace logs.
+        workers: The number of worker processes (default: based on CPU count
+            and available memory).
+        report_path: An optional JSON file for the report.
+    Returns:
+        True if every workspace was created.
+    """
+    from src.resource_util import worker_count
+
+    names = [manifest.user_input.project_name for manifest in manifests]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        output(f"Duplicate project names: {', '.join(duplicates)}", OutputType.ERROR)
+        return False
+    existing = [name for name in names if (output_dir / name).exists()]
+    if existing:
+        output(
+            f"Already exist in {output_dir}: {', '.join(existing)}", OutputType.ERROR
+        )
+        return False
+
+    settings = batch_settings(defaults, manifests)
+    if settings is None or not _check_settings(settings) or not warm_caches(settings):
+        return False
+
+    start = time.perf_counter()
+    results = run_batch(
+        manifests,
+        settings,
+        output_dir,
+        log_dir,
+        min(len(manifests), worker_count(workers)),
+    )
+    seconds = time.perf_counter() - start
+    print_batch_report(results, seconds)
+    if report_path is not None:
+        write_batch_report(report_path, results, seconds)
+    return all(result.ok for result in results)
+
+
+def _check_settings(settings: List[Dict[str, Any]]) -> bool:
+    for workspace_settings in settings:
+        templates = workspace_settings.get("templates")
+        if templates and not Path(templates).is_dir():
+            output(f"Template directory '{templates}' not found.", OutputType.ERROR)
+            return False
+        golden = workspace_settings.get("golden")
+        if golden and not Path(golden).is_file():
+            output(f"Golden archive '{golden}' not found.", OutputType.ERROR)
+            return False
+    return True
+
+
+def run_batch(
+    manifests: List[Manifest],
+    settings: List[Dict[str, Any]],
+    output_dir: Path,
+    log_dir: Path,
+    workers: int,
+) -> List[WorkspaceResult]:
+    """
+    Scaffolds every workspace of a batch on a pool of worker processes.
+    Each workspace writes its messages to <log_dir>/<project_name>.log.
+
+    Args:
+        manifests: The workspaces to create.
+        settings: The options of each workspace (see batch_settings).
+        output_dir: The directory the workspaces are created in.
+        log_dir: The directory of the workspace logs.
+        workers: The number of worker processes.
+    Returns:
+        The result of every workspace, in the order they finished.
+    """
+    log_dir.mkdir(parents=True, exist_ok=True)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    output(
+        f"Creating {len(manifests)} workspaces in {output_dir} "
+        f"with {workers} workers",
+        OutputType.INFO,
+    )
+
+    results = []
+    # spawn, so no worker inherits the threads of this process
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        futures = [
+            executor.submit(
+                build_workspace,
+                manifest.user_input,
+                workspace_settings,
+                str(output_dir.resolve()),
+                str(log_dir.resolve() / f"{manifest.user_input.project_name}.log"),
+            )
+            for manifest, workspace_settings in zip(manifests, settings)
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            if result.ok:
+                output(
+                    f"{result.project_name}: created in {result.seconds:.1f}s",
+                    OutputType.SUCCESS,
+                )
+            else:
+                output(
+                    f"{result.project_name}: failed after {result.seconds:.1f}s, "
+                    f"see {result.log_path}",
+                    OutputType.ERROR,
+                )
+            results.append(result)
+    return results
+
+
+def build_workspace(
+    input: UserInput, settings: Dict[str, Any], output_dir: str, log_path: str
+) -> WorkspaceResult:
+    """
+    Creates one workspace in a worker process, with every message of the
+    scaffold going to its log file.
+    """
+    from src.command_stats import save_command_stats
+    from src.package_util import set_jobs
+    from src.pipeline import create_monorepo
+    from src.profiler import enable_profiling, events
+    from src.process_util import install_interrupt_handler
+    from src.pub_util import set_offline
+    from src.template_cache import set_share_platform_files
+    from src.template_registry import set_user_template_dir
+
+    start = time.perf_counter()
+    first_event = len(events())
+    ok = False
+    with open(log_path, "w", encoding="utf-8") as log, redirect_stdout(
+        log
+    ), redirect_stderr(log):
+        set_offline(bool(settings.get("offline")))
+        set_jobs(settings.get("jobs"))
+        set_share_platform_files(bool(settings.get("share_platform_files")))
+        templates = settings.get("templates")
+        set_user_template_dir(Path(templates) if templates else None)
+        golden = settings.get("golden")
+        golden_path = Path(golden) if golden else None
+        enable_profiling()
+        install_interrupt_handler()
+
+        # workers run one workspace at a time, so changing directory is safe
+        os.chdir(output_dir)
+        try:
+            create_monorepo(input, golden=golden_path)
+            ok = True
+        except SystemExit as e:
+            ok = not e.code
+        except Exception:
+            traceback.print_exc()
+        # pool workers exit without running atexit handlers
+        save_command_stats()
+
+    stages: Dict[str, float] = {}
+    for event in events()[first_event:]:
+        if event.category == "step":
+            stages[event.name] = stages.get(event.name, 0.0) + event.wall
+    return WorkspaceResult(
+        input.project_name, ok, time.perf_counter() - start, log_path, stages
+    )
+
+
+def print_batch_report(results: List[WorkspaceResult], seconds: float) -> None:
+    """
+    Prints the throughput of a batch and the time of every scaffold step
+    across its workspaces.
+    """
+    created = [result for result in results if result.ok]
+    rate = len(created) / seconds * 60 if seconds else 0.0
+    output(
+        f"Created {len(created)} of {len(results)} workspaces in {seconds:.1f}s: "
+        f"{rate:.1f} workspaces/min",
+        OutputType.SUCCESS if len(created) == len(results) else OutputType.ERROR,
+    )
+
+    stage_times: Dict[str, List[float]] = {}
+    for result in created:
+        for stage, wall in result.stages.items():
+            stage_times.setdefault(stage, []).append(wall)
+    if not stage_times:
+        return
+
+    rows = sorted(stage_times.items(), key=lambda row: sum(row[1]), reverse=True)
+    name_width = max(len(stage) for stage in stage_times)
+    output("Time per stage (sorted by total wall time):", OutputType.INFO)
+    lines = [f"{'stage':<{name_width}} {'total s':>9} {'avg s':>9} {'max s':>9}"]
+    for stage, walls in rows:
+        lines.append(
+            f"{stage:<{name_width}} {sum(walls):>9.3f} "
+            f"{sum(walls) / len(walls):>9.3f} {max(walls):>9.3f}"
+        )
+    output_lines(lines)
+
+
+def write_batch_report(
+    report_path: Path, results: List[WorkspaceResult], seconds: float
+) -> None:
+    report = {
+        "seconds": seconds,
+        "workspaces_per_minute": sum(r.ok for r in results) / seconds * 60
+        if seconds
+        else 0.0,
+        "workspaces": [asdict(result) for result in results],
+    }
+    report_path.write_text(json.dumps(report, indent=2))
+    output(f"Wrote batch report: {report_path}", OutputType.SUCCESS)
@@ -25,3 +25,7 @@ def pascal_to_camel(pascal_str: str) -> str:
 def camel_to_pascal(camel_str: str) -> str:
     """Convert camelCase to PascalCase."""
     return camel_str[0].upper() + camel_str[1:] if camel_str else ''
+
+def snake_to_title(snake_str: str) -> str:
+    """Convert snake_case to Title Case words."""
+    return ' '.join(x.title() for x in snake_str.split('_') if x)
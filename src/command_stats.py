@@ -0,0 +1,135 @@
+import json
+import math
+import os
+import threading
+from typing import Dict, List, Optional
+
+from src.constants import CACHE_DIR
+from src.output_util import OutputType, output
+
+# Durations of every external command, one JSON object per line.
+# Each process appends its records in a single write, so concurrent runs
+# (e.g. the workers of `batch`) do not overwrite each other.
+COMMAND_STATS_FILE = CACHE_DIR / "command_stats.jsonl"
+# Runs per command type that the percentiles are computed from
+HISTORY = 500
+# The file is rewritten with the last HISTORY runs once it is this long
+MAX_RECORDS = 20000
+
+_records: List[dict] = []
+_lock = threading.Lock()
+
+
+def record_command(name: str, seconds: float, outcome: str) -> None:
+    """
+    Records one run of an external command.
+
+    Args:
+        name: The command type, see process_util.command_name.
+        seconds: The wall time of the run.
+        outcome: "ok", "failed" or "timeout".
+    """
+    with _lock:
+        _records.append(
+            {"command": name, "seconds": round(seconds, 4), "outcome": outcome}
+        )
+
+
+def save_command_stats() -> None:
+    """
+    Appends the commands recorded by this process to COMMAND_STATS_FILE.
+    """
+    with _lock:
+        records = list(_records)
+        _records.clear()
+    if not records:
+        return
+    data = "".join(json.dumps(record) + "\n" for record in records)
+    try:
+        COMMAND_STATS_FILE.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(COMMAND_STATS_FILE, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, data.encode())
+        finally:
+            os.close(fd)
+    except OSError as e:
+        output(f"Could not write the command stats: {e}", OutputType.INFO)
+
+
+def load_command_stats() -> Dict[str, List[dict]]:
+    """
+    Reads the last HISTORY runs of every command type, compacting the file
+    when it grew past MAX_RECORDS lines.
+    """
+    try:
+        lines = COMMAND_STATS_FILE.read_text().splitlines()
+    except OSError:
+        return {}
+
+    runs: Dict[str, List[dict]] = {}
+    for line in lines:
+        try:
+            record = json.loads(line)
+            runs.setdefault(record["command"], []).append(record)
+        except (ValueError, KeyError, TypeError):
+            continue
+    runs = {name: records[-HISTORY:] for name, records in runs.items()}
+
+    if len(lines) > MAX_RECORDS:
+        temp_path = COMMAND_STATS_FILE.with_name(
+            f"{COMMAND_STATS_FILE.name}.{os.getpid()}.tmp"
+        )
+        try:
+            temp_path.write_text(
+                "".join(
+                    json.dumps(record) + "\n"
+                    for records in runs.values()
+                    for record in records
+                )
+            )
+            os.replace(temp_path, COMMAND_STATS_FILE)
+        except OSError:
+            temp_path.unlink(missing_ok=True)
+    return runs
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """
+    The nearest-rank percentile of a non-empty list, e.g. fraction 0.95.
+    """
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def print_command_stats(timeout_of) -> bool:
+    """
+    Prints the p50, p95 and p99 duration of every command type over its
+    last HISTORY runs, next to its timeout.
+
+    Args:
+        timeout_of: Returns the timeout of a command type in seconds, or None.
+    Returns:
+        False if no command was recorded yet.
+    """
+    runs = load_command_stats()
+    if not runs:
+        output(f"No commands recorded in {COMMAND_STATS_FILE} yet.", OutputType.INFO)
+        return False
+
+    width = max(len("command"), *(len(name) for name in runs))
+    print(
+        f"{'command':<{width}} {'runs':>6} {'failed':>6} {'timeout':>7} "
+        f"{'p50 s':>8} {'p95 s':>8} {'p99 s':>8} {'limit s':>8}"
+    )
+    for name, records in sorted(runs.items()):
+        seconds = [record["seconds"] for record in records]
+        failed = sum(record.get("outcome") == "failed" for record in records)
+        timed_out = sum(record.get("outcome") == "timeout" for record in records)
+        limit: Optional[float] = timeout_of(name)
+        print(
+            f"{name:<{width}} {len(records):>6} {failed:>6} {timed_out:>7} "
+            f"{percentile(seconds, 0.5):>8.2f} {percentile(seconds, 0.95):>8.2f} "
+            f"{percentile(seconds, 0.99):>8.2f} "
+            f"{'-' if limit is None else f'{limit:.0f}':>8}"
+        )
+    return True
@@ -1,3 +1,16 @@
+import os
+from pathlib import Path
+
 LIB = "lib"
 L10N = "l10n"
 SRC = "src"
+
+CACHE_DIR = Path(
+    os.environ.get("MONO_PY_CACHE_DIR", Path.home() / ".cache" / "mono_py")
+)
+
+DEFAULT_LOCALES = ["en", "ne"]
+TEMPLATE_LOCALE = "en"
+
+# Tool state kept inside a monorepo (journal, indexes, shared files)
+STATE_DIR = ".mono_py"
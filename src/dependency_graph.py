@@ -0,0 +1,191 @@
+import heapq
+import json
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from src.output_util import OutputType, output
+from src.process_util import run_command
+from src.workspace_index import WorkspaceIndex, load_workspace_index
+
+# A change to one of these root files affects every member
+ROOT_FILES = {"pubspec.yaml", "pubspec.lock", "melos.yaml"}
+# Printed by --format scope when no member is affected. melos runs in every
+# package when it gets no --scope, and no package name can contain a dash.
+NO_MEMBER_SCOPE = "--scope=no-affected-members"
+
+
+@dataclass
+class DependencyGraph:
+    """
+    The dependencies between the members of a monorepo, by package name.
+    """
+
+    dependencies: Dict[str, Set[str]]
+    dev_dependencies: Dict[str, Set[str]]
+    # members that depend on a member, through either kind of dependency
+    dependents: Dict[str, Set[str]]
+
+
+def build_graph(index: WorkspaceIndex) -> DependencyGraph:
+    members = index.members()
+    names = {member.name for member in members}
+
+    def workspace_names(dependencies: List[str], member: str) -> Set[str]:
+        return {name for name in dependencies if name in names and name != member}
+
+    dependencies = {m.name: workspace_names(m.dependencies, m.name) for m in members}
+    dev_dependencies = {
+        m.name: workspace_names(m.dev_dependencies, m.name) for m in members
+    }
+    dependents: Dict[str, Set[str]] = {name: set() for name in dependencies}
+    for kind in (dependencies, dev_dependencies):
+        for name, member_dependencies in kind.items():
+            for dependency in member_dependencies:
+                dependents[dependency].add(name)
+    return DependencyGraph(dependencies, dev_dependencies, dependents)
+
+
+def topological_order(graph: DependencyGraph) -> Tuple[List[str], List[str]]:
+    """
+    Orders the members so every member comes after its dependencies
+    (Kahn's algorithm, ties broken by name so the order is stable).
+    Dev dependencies are not ordered, since Dart allows cycles through them.
+
+    Returns:
+        The ordered members, and the members on a dependency cycle,
+        which are left out of the order.
+    """
+    dependents: Dict[str, List[str]] = {name: [] for name in graph.dependencies}
+    for name, dependencies in graph.dependencies.items():
+        for dependency in dependencies:
+            dependents[dependency].append(name)
+
+    remaining = {name: len(deps) for name, deps in graph.dependencies.items()}
+    ready = [name for name, count in remaining.items() if count == 0]
+    heapq.heapify(ready)
+    order = []
+    while ready:
+        name = heapq.heappop(ready)
+        order.append(name)
+        for dependent in dependents[name]:
+            remaining[dependent] -= 1
+            if remaining[dependent] == 0:
+                heapq.heappush(ready, dependent)
+    cyclic = sorted(name for name, count in remaining.items() if count > 0)
+    return order, cyclic
+
+
+def changed_members(
+    index: WorkspaceIndex, root_path: Path, changed_paths: Iterable[str]
+) -> Set[str]:
+    """
+    Maps changed files (relative to the root, or absolute) to the members
+    that contain them. Files outside every member are ignored, except the
+    ROOT_FILES, which change every member.
+    """
+    root = root_path.resolve()
+    changed = set()
+    for changed_path in changed_paths:
+        path = PurePosixPath(changed_path.strip().replace("\\", "/"))
+        if path.is_absolute():
+            try:
+                path = PurePosixPath(Path(path).relative_to(root).as_posix())
+            except ValueError:
+                continue
+        if str(path) in ROOT_FILES:
+            return {member.name for member in index.members()}
+        member = index.by_path("/".join(path.parts[:2]))
+        if member is not None:
+            changed.add(member.name)
+    return changed
+
+
+def affected_members(graph: DependencyGraph, changed: Set[str]) -> Set[str]:
+    """
+    The changed members and everything that depends on them, directly or not,
+    including through dev dependencies.
+    """
+    affected = set(changed)
+    pending = list(changed)
+    while pending:
+        for dependent in graph.dependents[pending.pop()]:
+            if dependent not in affected:
+                affected.add(dependent)
+                pending.append(dependent)
+    return affected
+
+
+def git_changed_paths(root_path: Path, since: str) -> Optional[List[str]]:
+    """
+    The files changed since a git revision, relative to the monorepo root.
+    """
+    try:
+        result = run_command(
+            ["git", "diff", "--name-only", "--relative", since],
+            cwd=root_path,
+            text=True,
+        )
+    except (subprocess.SubprocessError, FileNotFoundError):
+        output(f"Failed to list the changes since '{since}'.", OutputType.ERROR)
+        return None
+    return [line for line in result.stdout.splitlines() if line]
+
+
+def print_graph(
+    root_path: Path, changed_paths: Optional[List[str]], output_format: str
+) -> bool:
+    """
+    Prints the members in dependency order. With changed paths only the
+    affected members are printed, still in dependency order.
+
+    Args:
+        root_path: The monorepo root.
+        changed_paths: Changed files, e.g. from `git diff --name-only`;
+            None prints every member.
+        output_format: "lines" (one name per line), "scope" (melos
+            --scope arguments, NO_MEMBER_SCOPE when nothing is selected)
+            or "json".
+    Returns:
+        False if the graph has a dependency cycle.
+    """
+    index = load_workspace_index(root_path)
+    graph = build_graph(index)
+    order, cyclic = topological_order(graph)
+    if cyclic:
+        output(f"Dependency cycle between: {', '.join(cyclic)}", OutputType.ERROR)
+        return False
+
+    selected = order
+    if changed_paths is not None:
+        affected = affected_members(
+            graph, changed_members(index, root_path, changed_paths)
+        )
+        selected = [name for name in order if name in affected]
+        if not selected:
+            output("No member is affected by the changes.", OutputType.INFO)
+
+    if output_format == "json":
+        print(
+            json.dumps(
+                {
+                    "order": selected,
+                    "paths": {name: index.by_name(name).path for name in selected},
+                    "dependencies": {
+                        name: sorted(graph.dependencies[name]) for name in selected
+                    },
+                    "dev_dependencies": {
+                        name: sorted(graph.dev_dependencies[name]) for name in selected
+                    },
+                },
+                indent=2,
+            )
+        )
+    elif output_format == "scope":
+        scopes = [f"--scope={name}" for name in selected] or [NO_MEMBER_SCOPE]
+        print(" ".join(scopes))
+    else:
+        for name in selected:
+            print(name)
+    return True
@@ -0,0 +1,69 @@
+import json
+import threading
+from enum import Enum
+from pathlib import Path
+from typing import Dict
+
+from src.package_util import add_packages
+
+
+class DependencyKind(Enum):
+    REGULAR = "regular"
+    DEV = "dev"
+    SDK = "sdk"
+
+
+_pending: Dict[Path, Dict[str, str]] = {}
+_lock = threading.Lock()
+
+
+def dependency_spec(
+    package_name: str, kind: DependencyKind, sdk: str = "flutter"
+) -> str:
+    """
+    Formats a dependency as a `flutter pub add` argument.
+
+    Examples:
+        intl, dev:melos, flutter_localizations:{"sdk":"flutter"}
+    """
+    if kind is DependencyKind.DEV:
+        return f"dev:{package_name}"
+    if kind is DependencyKind.SDK:
+        return f"{package_name}:{json.dumps({'sdk': sdk}, separators=(',', ':'))}"
+    return package_name
+
+
+def register_dependency(
+    pub_path: Path,
+    package_name: str,
+    kind: DependencyKind = DependencyKind.REGULAR,
+    sdk: str = "flutter",
+) -> None:
+    """
+    Records a dependency to add to the package at pub_path on the next flush.
+    Registering the same package twice keeps the last registration.
+
+    Args:
+        pub_path: The directory where the pubspec.yaml is located.
+        package_name: The name of the package to add.
+        kind: Whether it is a regular, dev or SDK dependency.
+        sdk: The SDK providing the package, for SDK dependencies.
+    """
+    with _lock:
+        specs = _pending.setdefault(pub_path.resolve(), {})
+        specs[package_name] = dependency_spec(package_name, kind, sdk)
+
+
+def flush_dependencies(pub_path: Path) -> bool:
+    """
+    Adds every registered dependency of the package with a single
+    `flutter pub add`, so pub resolves the package only once.
+
+    Returns:
+        True if nothing was pending or the command succeeded, False otherwise.
+    """
+    with _lock:
+        specs = _pending.pop(pub_path.resolve(), {})
+    if not specs:
+        return True
+    return add_packages(pub_path, list(specs.values()))
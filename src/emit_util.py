@@ -0,0 +1,178 @@
+import hashlib
+import os
+import secrets
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Dict, Iterator, List, Optional, Tuple, Union
+
+from src.output_util import OutputType, output
+
+_counts = {"written": 0, "skipped": 0}
+_counts_lock = threading.Lock()
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _file_digest(path: Path) -> Optional[str]:
+    digest = hashlib.sha256()
+    try:
+        with path.open("rb") as f:
+            for chunk in iter(lambda: f.read(1 << 16), b""):
+                digest.update(chunk)
+    except (FileNotFoundError, IsADirectoryError):
+        return None
+    return digest.hexdigest()
+
+
+def _count(written: bool) -> None:
+    with _counts_lock:
+        _counts["written" if written else "skipped"] += 1
+
+
+def _create_temp(path: Path) -> Tuple[int, Path]:
+    """
+    Creates a temporary file next to path. Unlike mkstemp (0600) it is
+    created with 0666, so the kernel applies the umask like for any new file.
+    """
+    while True:
+        temp_path = path.with_name(f".{path.name}.{secrets.token_hex(4)}")
+        try:
+            flags = os.O_CREAT | os.O_EXCL | os.O_WRONLY | getattr(os, "O_BINARY", 0)
+            return os.open(temp_path, flags, 0o666), temp_path
+        except FileExistsError:
+            continue
+
+
+def _replace(temp_path: Path, path: Path) -> None:
+    # an existing file keeps its mode, new files keep the umask mode
+    try:
+        os.chmod(temp_path, path.stat().st_mode & 0o7777)
+    except FileNotFoundError:
+        pass
+    os.replace(temp_path, path)
+
+
+def emit_file(path: Path, data: Union[str, bytes]) -> bool:
+    """
+    Writes a file only if its content changes, so unchanged files keep their
+    mtime and incremental tools (gen-l10n, build_runner, IDEs) skip them.
+    The new content is written to a temporary file and renamed into place.
+
+    Args:
+        path: The file to write.
+        data: The new content, str is encoded as UTF-8.
+    Returns:
+        True if the file was written, False if it was already up to date.
+    """
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+
+    try:
+        same_size = path.stat().st_size == len(data)
+    except FileNotFoundError:
+        same_size = False
+    if same_size and _file_digest(path) == _digest(data):
+        _count(False)
+        return False
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = _create_temp(path)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        _replace(temp_path, path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+    _count(True)
+    return True
+
+
+class StagedFiles:
+    """
+    Files that are replaced together: each is streamed into a temporary file
+    next to its target, and commit() moves them into place only after every
+    one of them was written. discard() removes the temporary files.
+    """
+
+    def __init__(self):
+        self._staged: List[Tuple[Path, Path]] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def writer(self, path: Path, mode: str = "w", **kwargs) -> Iterator[IO]:
+        """
+        Streams one file into its temporary file, which is removed on error.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = _create_temp(path)
+        try:
+            with os.fdopen(fd, mode, **kwargs) as f:
+                yield f
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+        with self._lock:
+            self._staged.append((temp_path, path))
+
+    def commit(self) -> int:
+        """
+        Replaces the targets whose content differs.
+
+        Returns:
+            The number of files written.
+        """
+        with self._lock:
+            staged, self._staged = self._staged, []
+        written = 0
+        for temp_path, path in staged:
+            if _file_digest(temp_path) == _file_digest(path):
+                temp_path.unlink()
+                _count(False)
+            else:
+                _replace(temp_path, path)
+                _count(True)
+                written += 1
+        return written
+
+    def discard(self) -> None:
+        with self._lock:
+            staged, self._staged = self._staged, []
+        for temp_path, _ in staged:
+            temp_path.unlink(missing_ok=True)
+
+
+@contextmanager
+def atomic_writer(path: Path, mode: str = "w", **kwargs) -> Iterator[IO]:
+    """
+    Streams a file into a temporary file next to it. On success the file
+    replaces the target only if the content differs; on error it is removed.
+
+    Example:
+        with atomic_writer(arb_path, encoding="utf-8") as f:
+            for chunk in chunks:
+                f.write(chunk)
+    """
+    staged = StagedFiles()
+    with staged.writer(path, mode, **kwargs) as f:
+        yield f
+    staged.commit()
+
+
+def emit_counts() -> Dict[str, int]:
+    """
+    Returns how many files were written and skipped as unchanged.
+    """
+    with _counts_lock:
+        return dict(_counts)
+
+
+def print_emit_summary() -> None:
+    counts = emit_counts()
+    output(
+        f"Files: {counts['written']} written, {counts['skipped']} unchanged",
+        OutputType.INFO,
+    )
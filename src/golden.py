@@ -0,0 +1,278 @@
+import io
+import json
+import os
+import tarfile
+from pathlib import Path, PurePosixPath
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.constants import L10N, LIB, STATE_DIR
+from src.emit_util import atomic_writer, emit_file
+from src.input_util import default_packages
+from src.l10n_codegen import generate_localizations
+from src.localization_setup import get_arb_content
+from src.models import UserInput
+from src.object_store import is_platform_file, place_shared_file
+from src.output_util import OutputType, output
+from src.package_util import pub_get
+from src.profiler import profile_span
+from src.template_cache import (SKIPPED_ENTRIES, flutter_sdk_version,
+                                name_replacer, platform_store_dir)
+from src.workspace import Workspace
+
+# Names the golden monorepo is scaffolded with. They are replaced with the
+# real project, app and package names when the archive is extracted.
+GOLDEN_PROJECT = "mono_py_golden"
+GOLDEN_APP = "golden_sample_app"
+GOLDEN_PACKAGE = "golden_sample_package"
+
+GOLDEN_FORMAT = 1
+
+# The first member of the archive; the monorepo files follow under ROOT_PREFIX
+METADATA_NAME = "golden.json"
+ROOT_PREFIX = "monorepo"
+
+# Entries written by pub get or the Flutter tool for one machine
+GOLDEN_SKIPPED_ENTRIES = SKIPPED_ENTRIES | {
+    STATE_DIR,
+    "ephemeral",
+    "local.properties",
+    "Generated.xcconfig",
+    "flutter_export_environment.sh",
+}
+
+
+def golden_input(locales: List[str]) -> UserInput:
+    """
+    The input a golden monorepo is scaffolded from: one app and one package
+    besides the default packages, each standing for all of its kind.
+    """
+    return UserInput(
+        GOLDEN_PROJECT,
+        [GOLDEN_APP],
+        default_packages(GOLDEN_PROJECT) + [GOLDEN_PACKAGE],
+        locales,
+    )
+
+
+def write_golden_archive(
+    monorepo_path: Path, archive_path: Path, locales: List[str]
+) -> int:
+    """
+    Writes a scaffolded golden monorepo into a .tar.gz archive, leaving out
+    the files that pub get and the Flutter tool generate per machine.
+
+    Returns:
+        The number of files in the archive.
+    """
+    metadata = {
+        "format": GOLDEN_FORMAT,
+        "flutter": flutter_sdk_version(),
+        "project_name": GOLDEN_PROJECT,
+        "app": GOLDEN_APP,
+        "package": GOLDEN_PACKAGE,
+        "locales": locales,
+    }
+    count = 0
+    with atomic_writer(archive_path, "wb") as f:
+        # dereference, so files shared through hardlinks are stored in full
+        with tarfile.open(fileobj=f, mode="w:gz", dereference=True) as archive:
+            data = json.dumps(metadata, indent=2).encode("utf-8")
+            info = tarfile.TarInfo(METADATA_NAME)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+
+            for root, dirs, files in os.walk(monorepo_path):
+                dirs[:] = sorted(d for d in dirs if d not in GOLDEN_SKIPPED_ENTRIES)
+                relative = Path(root).relative_to(monorepo_path)
+                for file_name in sorted(files):
+                    if file_name in GOLDEN_SKIPPED_ENTRIES:
+                        continue
+                    archive.add(
+                        Path(root) / file_name,
+                        arcname=f"{ROOT_PREFIX}/{(relative / file_name).as_posix()}",
+                        recursive=False,
+                        filter=_anonymize,
+                    )
+                    count += 1
+    return count
+
+
+def _anonymize(info: tarfile.TarInfo) -> tarfile.TarInfo:
+    info.uid = info.gid = 0
+    info.uname = info.gname = ""
+    return info
+
+
+def scaffold_from_golden(
+    archive_path: Path, monorepo_path: Path, input: UserInput
+) -> bool:
+    """
+    Creates a monorepo from a golden archive instead of running the scaffold
+    steps: the archive is extracted as a stream with the names substituted,
+    the golden app and package are written once per app and package, then the
+    workspace, locales and localizations are updated and pub get is run.
+
+    Args:
+        archive_path: An archive written by export-golden.
+        monorepo_path: The new, empty monorepo directory.
+        input: The project name, apps, packages and locales.
+    Returns:
+        True if the monorepo was created.
+    """
+    output(f"Extracting golden monorepo from {archive_path}", OutputType.INFO)
+    try:
+        with profile_span("extract_golden"), tarfile.open(
+            archive_path, "r|gz"
+        ) as archive:
+            metadata = _read_metadata(archive)
+            if metadata["flutter"] != flutter_sdk_version():
+                output(
+                    f"The golden archive was made with Flutter {metadata['flutter']}",
+                    OutputType.INFO,
+                )
+            count = _extract_members(archive, monorepo_path, metadata, input)
+    except (tarfile.TarError, OSError, ValueError, KeyError) as e:
+        output(f"Failed to extract '{archive_path}': {e}", OutputType.ERROR)
+        return False
+    output(f"Extracted {count} files", OutputType.SUCCESS)
+
+    with profile_span("workspace"):
+        update_golden_workspace(monorepo_path, metadata, input)
+        update_golden_locales(monorepo_path, metadata["locales"], input)
+    with profile_span("generate_localizations"):
+        if not generate_localizations(monorepo_path):
+            return False
+    with profile_span("pub_get"):
+        return pub_get(monorepo_path)
+
+
+def _read_metadata(archive: tarfile.TarFile) -> Dict[str, Any]:
+    member = archive.next()
+    if member is None or member.name != METADATA_NAME:
+        raise ValueError("not a golden monorepo archive")
+    metadata = json.load(archive.extractfile(member))
+    if metadata.get("format") != GOLDEN_FORMAT:
+        raise ValueError(f"unsupported golden format {metadata.get('format')}")
+    return metadata
+
+
+def _extract_members(
+    archive: tarfile.TarFile,
+    monorepo_path: Path,
+    metadata: Dict[str, Any],
+    input: UserInput,
+) -> int:
+    """
+    Writes every file of the archive, in archive order, to all its targets.
+
+    Returns:
+        The number of files written.
+    """
+    project_name = input.project_name
+    golden_project = metadata["project_name"]
+    extra_packages = [
+        package
+        for package in input.packages
+        if package not in default_packages(project_name)
+    ]
+    replicated = {
+        ("apps", metadata["app"]): [
+            (
+                "apps",
+                app,
+                name_replacer({golden_project: project_name, metadata["app"]: app}),
+            )
+            for app in input.apps
+        ],
+        ("packages", metadata["package"]): [
+            (
+                "packages",
+                package,
+                name_replacer(
+                    {golden_project: project_name, metadata["package"]: package}
+                ),
+            )
+            for package in extra_packages
+        ],
+    }
+    root_rename = name_replacer({golden_project: project_name})
+    store_dir = platform_store_dir(monorepo_path)
+
+    count = 0
+    for member in archive:
+        # iterating starts over with the metadata member, which was already read
+        if not member.isfile() or member.name == METADATA_NAME:
+            continue
+        relative = PurePosixPath(member.name).relative_to(ROOT_PREFIX)
+        if relative.is_absolute() or ".." in relative.parts:
+            raise ValueError(f"unsafe path in archive: {member.name}")
+
+        targets: List[Tuple[str, Callable[[str], str]]]
+        shareable = False
+        if tuple(relative.parts[:2]) in replicated:
+            rest = PurePosixPath(*relative.parts[2:])
+            targets = [
+                (f"{folder}/{name}/{rename(str(rest))}", rename)
+                for folder, name, rename in replicated[tuple(relative.parts[:2])]
+            ]
+            shareable = relative.parts[0] == "apps" and is_platform_file(rest)
+        else:
+            targets = [(root_rename(str(relative)), root_rename)]
+
+        data = archive.extractfile(member).read()
+        try:
+            text: Optional[str] = data.decode("utf-8")
+        except UnicodeDecodeError:
+            text = None
+        for target, rename in targets:
+            path = monorepo_path / target
+            content = data if text is None else rename(text).encode("utf-8")
+            if store_dir is not None and shareable and content == data:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                place_shared_file(store_dir, path, data, member.mode)
+            else:
+                emit_file(path, content)
+                os.chmod(path, member.mode & 0o777)
+            count += 1
+    return count
+
+
+def update_golden_workspace(
+    monorepo_path: Path, metadata: Dict[str, Any], input: UserInput
+) -> None:
+    """
+    Replaces the golden app and package in the root pubspec workspace and in
+    the melos release script with the real apps and packages.
+    """
+    workspace = Workspace(monorepo_path)
+    workspace.remove_member(f"apps/{metadata['app']}")
+    workspace.remove_member(f"packages/{metadata['package']}")
+    workspace.add_members(input.apps, input.packages)
+
+    release = (workspace.melos.get("scripts") or {}).get("release") or {}
+    if isinstance(release.get("packageFilters"), dict):
+        release["packageFilters"]["ignore"] = list(input.packages)
+        workspace.mark_dirty(Path("melos.yaml"))
+    workspace.flush()
+
+
+def update_golden_locales(
+    monorepo_path: Path, golden_locales: List[str], input: UserInput
+) -> None:
+    """
+    Adds the ARB files of the requested locales the archive does not have and
+    removes the ones, with their generated localizations, that were not requested.
+    """
+    res_package = f"{input.project_name}_resources"
+    l10n_dir = monorepo_path / "packages" / res_package / LIB / L10N
+    for locale in golden_locales:
+        if locale not in input.locales:
+            (l10n_dir / f"app_{locale}.arb").unlink(missing_ok=True)
+            (l10n_dir / f"app_localizations_{locale}.dart").unlink(missing_ok=True)
+    for locale in input.locales:
+        if locale not in golden_locales:
+            output(f"Creating '{locale}' localization file...", OutputType.INFO)
+            emit_file(
+                l10n_dir / f"app_{locale}.arb",
+                json.dumps(get_arb_content(locale), ensure_ascii=False, indent=2),
+            )
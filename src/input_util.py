@@ -22,10 +22,7 @@ def take_user_input() -> UserInput:
         else:
             output("Project Name can't be empty", OutputType.ERROR)
 
-    RES_PACKAGE = project_name + "_resources"
-    COMP_PACKAGE = project_name + "_components"
-
-    packages = [RES_PACKAGE, COMP_PACKAGE]
+    packages = default_packages(project_name)
     # while True:
     #     print("Enter the packages:(seperated by a comma)")
     #     packages_str = input("Packages:")
@@ -53,6 +50,43 @@ def take_user_input() -> UserInput:
     return UserInput(project_name, apps, packages)
 
 
+def take_addition_input(project_name: str) -> UserInput:
+    """
+    Takes the apps and packages to add to an existing monorepo.
+    The root project name is read from the monorepo instead of asked.
+    """
+    while True:
+        output("Enter the apps to add (separated by a comma):", OutputType.INFO)
+        apps_str = input("apps:")
+        apps = [app.strip() for app in apps_str.split(",")] if apps_str else []
+
+        output("Enter the packages to add (separated by a comma):", OutputType.INFO)
+        packages_str = input("packages:")
+        packages = (
+            [package.strip() for package in packages_str.split(",")]
+            if packages_str
+            else []
+        )
+
+        are_apps_valid = validate_names(apps, project_name)
+        are_pacakges_valid = validate_names(packages, project_name)
+
+        if are_pacakges_valid and are_apps_valid:
+            break
+
+    output("Input validation successful", OutputType.SUCCESS)
+    return UserInput(project_name, apps, packages)
+
+
+def default_packages(project_name: str) -> List[str]:
+    """
+    The packages every monorepo starts with
+    """
+    RES_PACKAGE = project_name + "_resources"
+    COMP_PACKAGE = project_name + "_components"
+    return [RES_PACKAGE, COMP_PACKAGE]
+
+
 def validate_names(names: List[str], project_name: str) -> bool:
     """
     wrapper for multiple package/app names
@@ -0,0 +1,56 @@
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict
+
+from src.constants import STATE_DIR
+
+JOURNAL_FILE = "journal.json"
+
+
+def inputs_hash(step_name: str, inputs: Any) -> str:
+    """
+    Hashes the name and inputs of a step.
+    """
+    data = json.dumps([step_name, inputs], sort_keys=True, default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+class StepJournal:
+    """
+    Records the finished steps of a scaffold in the project root,
+    so a failed run can be resumed from the failure point.
+    """
+
+    def __init__(self, root_path: Path, resume: bool = True):
+        self.path = root_path / STATE_DIR / JOURNAL_FILE
+        self._lock = threading.Lock()
+        self._entries: Dict[str, str] = {}
+        if resume and self.path.exists():
+            with self.path.open("r") as f:
+                self._entries = json.load(f)
+
+    @staticmethod
+    def exists(root_path: Path) -> bool:
+        return (root_path / STATE_DIR / JOURNAL_FILE).exists()
+
+    def is_finished(self, step_name: str, inputs: Any) -> bool:
+        """
+        True if the step finished in an earlier run with the same inputs.
+        """
+        with self._lock:
+            return self._entries.get(step_name) == inputs_hash(step_name, inputs)
+
+    def record(self, step_name: str, inputs: Any) -> None:
+        """
+        Records a finished step and writes the journal atomically.
+        """
+        with self._lock:
+            self._entries[step_name] = inputs_hash(step_name, inputs)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.path.with_name(self.path.name + ".tmp")
+            with temp_path.open("w") as f:
+                json.dump(self._entries, f, indent=2, sort_keys=True)
+            os.replace(temp_path, self.path)
@@ -0,0 +1,818 @@
+import hashlib
+import json
+import re
+import subprocess
+import threading
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from src.case_util import snake_to_pascal
+from src.emit_util import emit_file
+from src.output_util import OutputType, output
+from src.process_util import run_command
+from src.workspace_index import load_workspace_index
+from src.yaml import load_yaml
+
+# Bump when the generated code changes, so cached outputs are regenerated
+GENERATOR_VERSION = "2"
+
+CACHE_FILE = Path(".dart_tool") / "mono_py" / "l10n_cache.json"
+
+# l10n.yaml options the generator understands; any other option is left to
+# `flutter gen-l10n`
+SUPPORTED_OPTIONS = {
+    "arb-dir",
+    "output-dir",
+    "template-arb-file",
+    "output-localization-file",
+    "output-class",
+    "nullable-getter",
+    "synthetic-package",
+    "preferred-supported-locales",
+    "header",
+}
+
+NUMBER_FORMATS = {
+    "compact",
+    "compactCurrency",
+    "compactSimpleCurrency",
+    "compactLong",
+    "currency",
+    "decimalPattern",
+    "decimalPercentPattern",
+    "percentPattern",
+    "scientificPattern",
+    "simpleCurrency",
+}
+NUMBER_TYPES = {"num", "int", "double"}
+
+# =0, =1 and =2 are what gen-l10n maps onto the CLDR plural categories
+PLURAL_CASES = {
+    "=0": "zero",
+    "=1": "one",
+    "=2": "two",
+    "zero": "zero",
+    "one": "one",
+    "two": "two",
+    "few": "few",
+    "many": "many",
+    "other": "other",
+}
+
+ARGUMENT_REG = re.compile(r"\{\s*(\w+)\s*([},])")
+CHOICE_TYPE_REG = re.compile(r"\s*(plural|select)\s*,")
+CASE_REG = re.compile(r"\s*(=?\w+)\s*\{")
+CLOSE_REG = re.compile(r"\s*\}")
+
+# Outputs generated in this run; apps whose l10n.yaml points at the resources
+# package's ARB files produce the same files and are only generated once
+_generated: Dict[Tuple[str, str], List[str]] = {}
+_generated_lock = threading.Lock()
+
+
+@dataclass
+class Argument:
+    name: str
+
+
+@dataclass
+class Choice:
+    name: str
+    kind: str
+    cases: Dict[str, List["Node"]]
+
+
+Node = Union[str, Argument, Choice]
+
+
+@dataclass
+class Placeholder:
+    name: str
+    type: str = "Object"
+    format: Optional[str] = None
+    optional_parameters: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def is_formatted(self) -> bool:
+        if self.type in NUMBER_TYPES:
+            return self.format in NUMBER_FORMATS
+        return self.type == "DateTime" and bool(self.format)
+
+
+@dataclass
+class L10nConfig:
+    arb_dir: Path
+    output_dir: Path
+    template_arb_file: str
+    output_file: str
+    output_class: str
+    nullable_getter: bool
+    preferred_locales: List[str]
+    header: Optional[str]
+
+
+def load_l10n_config(package_path: Path) -> Optional[L10nConfig]:
+    """
+    Reads the l10n.yaml of a package.
+
+    Returns:
+        The configuration, or None if it uses options this generator
+        does not implement.
+    """
+    options = load_yaml(package_path / "l10n.yaml") or {}
+    if set(options) - SUPPORTED_OPTIONS:
+        return None
+
+    arb_dir = (package_path / options.get("arb-dir", "lib/l10n")).resolve()
+    if options.get("synthetic-package", True) is False:
+        output_dir = package_path / options.get(
+            "output-dir", options.get("arb-dir", "lib/l10n")
+        )
+    elif "output-dir" in options:
+        output_dir = package_path / options["output-dir"]
+    else:
+        output_dir = package_path / ".dart_tool" / "flutter_gen" / "gen_l10n"
+
+    return L10nConfig(
+        arb_dir=arb_dir,
+        output_dir=output_dir.resolve(),
+        template_arb_file=options.get("template-arb-file", "app_en.arb"),
+        output_file=options.get("output-localization-file", "app_localizations.dart"),
+        output_class=options.get("output-class", "AppLocalizations"),
+        nullable_getter=options.get("nullable-getter", True),
+        preferred_locales=list(options.get("preferred-supported-locales") or []),
+        header=options.get("header"),
+    )
+
+
+def parse_message(message: str) -> List[Node]:
+    """
+    Parses an ICU message with {placeholder}, plural and select arguments.
+
+    Raises:
+        ValueError: If the message uses unsupported ICU syntax.
+    """
+    nodes, position = _parse_nodes(message, 0, nested=False)
+    if position != len(message):
+        raise ValueError(f"unexpected '}}' in '{message}'")
+    return nodes
+
+
+def _parse_nodes(message: str, position: int, nested: bool) -> Tuple[List[Node], int]:
+    nodes: List[Node] = []
+    text: List[str] = []
+    while position < len(message):
+        char = message[position]
+        if char == "}" and nested:
+            break
+        argument = None
+        if char == "{":
+            argument, end = _parse_argument(message, position)
+        if argument is None:
+            text.append(char)
+            position += 1
+            continue
+        if text:
+            nodes.append("".join(text))
+            text = []
+        nodes.append(argument)
+        position = end
+    if text:
+        nodes.append("".join(text))
+    return nodes, position
+
+
+def _parse_argument(
+    message: str, position: int
+) -> Tuple[Optional[Union[Argument, Choice]], int]:
+    match = ARGUMENT_REG.match(message, position)
+    if match is None:
+        return None, position
+    name, end_char = match.groups()
+    if end_char == "}":
+        return Argument(name), match.end()
+
+    match = CHOICE_TYPE_REG.match(message, match.end())
+    if match is None:
+        raise ValueError(f"unsupported argument '{name}' in '{message}'")
+    kind = match.group(1)
+    position = match.end()
+    cases: Dict[str, List[Node]] = {}
+    while True:
+        case = CASE_REG.match(message, position)
+        if case is None:
+            break
+        body, position = _parse_nodes(message, case.end(), nested=True)
+        if position >= len(message):
+            raise ValueError(f"unclosed case '{case.group(1)}' in '{message}'")
+        cases[case.group(1)] = body
+        position += 1
+
+    close = CLOSE_REG.match(message, position)
+    if close is None or "other" not in cases:
+        raise ValueError(f"invalid {kind} '{name}' in '{message}'")
+    if kind == "plural" and set(cases) - set(PLURAL_CASES):
+        raise ValueError(f"unsupported plural case in '{message}'")
+    return Choice(name, kind, cases), close.end()
+
+
+def _argument_names(nodes: List[Node], kinds: Dict[str, str]) -> None:
+    for node in nodes:
+        if isinstance(node, Argument):
+            kinds.setdefault(node.name, "argument")
+        elif isinstance(node, Choice):
+            kinds[node.name] = node.kind
+            for body in node.cases.values():
+                _argument_names(body, kinds)
+
+
+def message_placeholders(nodes: List[Node], metadata: Dict) -> List[Placeholder]:
+    """
+    The parameters of a message: the placeholders declared in its @key
+    metadata, in order, then the undeclared ones used in the message.
+    """
+    kinds: Dict[str, str] = {}
+    _argument_names(nodes, kinds)
+    declared = (metadata or {}).get("placeholders") or {}
+    placeholders = []
+    for name, options in declared.items():
+        options = options or {}
+        default_type = "num" if kinds.get(name) == "plural" else "Object"
+        placeholders.append(
+            Placeholder(
+                name,
+                options.get("type", default_type),
+                options.get("format"),
+                dict(options.get("optionalParameters") or {}),
+            )
+        )
+    for name, kind in kinds.items():
+        if name not in declared:
+            default_type = {"plural": "num", "select": "String"}.get(kind, "Object")
+            placeholders.append(Placeholder(name, default_type))
+    return placeholders
+
+
+def dart_string(parts: List[Tuple[bool, str]]) -> str:
+    """
+    Builds a single quoted Dart string from (is_variable, text) parts.
+    """
+    result = []
+    for index, (is_variable, text) in enumerate(parts):
+        if not is_variable:
+            result.append(
+                text.replace("\\", "\\\\")
+                .replace("'", "\\'")
+                .replace("$", "\\$")
+                .replace("\n", "\\n")
+                .replace("\r", "\\r")
+                .replace("\t", "\\t")
+            )
+            continue
+        following = parts[index + 1][1][:1] if index + 1 < len(parts) else ""
+        if following and (following.isalnum() or following == "_"):
+            result.append(f"${{{text}}}")
+        else:
+            result.append(f"${text}")
+    return "'" + "".join(result) + "'"
+
+
+def _dart_value(value: Any) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return str(value)
+    return dart_string([(False, str(value))])
+
+
+class _MessageBody:
+    """
+    Generates the statements and the returned expression of one message.
+    """
+
+    def __init__(self, placeholders: Dict[str, Placeholder]):
+        self.placeholders = placeholders
+        self.lines: List[str] = []
+        self._temps = 0
+        self._formatted = set()
+
+    def variable(self, name: str) -> str:
+        placeholder = self.placeholders.get(name)
+        if placeholder is None:
+            raise ValueError(f"unknown placeholder '{name}'")
+        if not placeholder.is_formatted:
+            return name
+        if name not in self._formatted:
+            self._formatted.add(name)
+            self.lines += self._format_lines(placeholder)
+        return f"{name}String"
+
+    def _format_lines(self, placeholder: Placeholder) -> List[str]:
+        name = placeholder.name
+        if placeholder.type == "DateTime":
+            if re.fullmatch(r"[A-Za-z]+", placeholder.format) and not (
+                placeholder.optional_parameters.get("isCustomDateFormat")
+            ):
+                formatter = f"intl.DateFormat.{placeholder.format}(localeName)"
+            else:
+                pattern = dart_string([(False, placeholder.format)])
+                formatter = f"intl.DateFormat({pattern}, localeName)"
+            return [
+                f"    final intl.DateFormat {name}DateFormat = {formatter};",
+                f"    final String {name}String = {name}DateFormat.format({name});",
+                "",
+            ]
+
+        arguments = ["      locale: localeName,"] + [
+            f"      {key}: {_dart_value(value)},"
+            for key, value in placeholder.optional_parameters.items()
+        ]
+        return [
+            f"    final intl.NumberFormat {name}NumberFormat = "
+            f"intl.NumberFormat.{placeholder.format}(",
+            *arguments,
+            "    );",
+            f"    final String {name}String = {name}NumberFormat.format({name});",
+            "",
+        ]
+
+    def expression(self, nodes: List[Node]) -> str:
+        parts: List[Tuple[bool, str]] = []
+        for node in nodes:
+            if isinstance(node, str):
+                parts.append((False, node))
+            elif isinstance(node, Argument):
+                parts.append((True, self.variable(node.name)))
+            else:
+                parts.append((True, self.choice(node)))
+        return dart_string(parts)
+
+    def choice(self, node: Choice) -> str:
+        if node.name not in self.placeholders:
+            raise ValueError(f"unknown placeholder '{node.name}'")
+        cases = [
+            (selector, self.expression(body)) for selector, body in node.cases.items()
+        ]
+        temp = f"_temp{self._temps}"
+        self._temps += 1
+        if node.kind == "plural":
+            self.lines += [
+                f"    String {temp} = intl.Intl.pluralLogic(",
+                f"      {node.name},",
+                "      locale: localeName,",
+                *[f"      {PLURAL_CASES[case]}: {value}," for case, value in cases],
+                "    );",
+            ]
+        else:
+            self.lines += [
+                f"    String {temp} = intl.Intl.selectLogic(",
+                f"      {node.name},",
+                "      {",
+                *[f"        '{selector}': {value}," for selector, value in cases],
+                "      },",
+                "    );",
+            ]
+        return temp
+
+
+def _signature(key: str, placeholders: List[Placeholder]) -> str:
+    if not placeholders:
+        return f"String get {key}"
+    parameters = ", ".join(f"{p.type} {p.name}" for p in placeholders)
+    return f"String {key}({parameters})"
+
+
+def _message_member(key: str, message: str, placeholders: List[Placeholder]) -> str:
+    signature = _signature(key, placeholders)
+    body = _MessageBody({p.name: p for p in placeholders})
+    expression = body.expression(parse_message(message))
+    if not placeholders:
+        return f"  @override\n  {signature} => {expression};\n"
+    lines = body.lines + [f"    return {expression};"]
+    return "  @override\n  " + signature + " {\n" + "\n".join(lines) + "\n  }\n"
+
+
+@dataclass
+class _ArbLocale:
+    locale: str
+    language: str
+    script: Optional[str]
+    country: Optional[str]
+    messages: Dict[str, Any]
+
+    @property
+    def class_suffix(self) -> str:
+        return snake_to_pascal(self.locale.lower())
+
+    @property
+    def dart_locale(self) -> str:
+        if self.script is None and self.country is None:
+            return f"Locale('{self.language}')"
+        if self.script is None:
+            return f"Locale('{self.language}', '{self.country}')"
+        if self.country is None:
+            return (
+                f"Locale.fromSubtags(languageCode: '{self.language}', "
+                f"scriptCode: '{self.script}')"
+            )
+        return (
+            f"Locale.fromSubtags(languageCode: '{self.language}', "
+            f"countryCode: '{self.country}', scriptCode: '{self.script}')"
+        )
+
+
+def _arb_locale(locale: str, messages: Dict[str, Any]) -> _ArbLocale:
+    """
+    Splits a locale into language, script and country, accepting the forms
+    gen-l10n accepts: lang, lang_CC, lang_Script and lang_Script_CC.
+    """
+    language, *rest = locale.replace("-", "_").split("_")
+    if not rest:
+        return _ArbLocale(locale, language, None, None, messages)
+    if len(rest) == 1 and len(rest[0]) == 4:
+        return _ArbLocale(locale, language, rest[0], None, messages)
+    if len(rest) == 1 and len(rest[0]) in (2, 3):
+        return _ArbLocale(locale, language, None, rest[0], messages)
+    if len(rest) == 2 and len(rest[0]) == 4 and len(rest[1]) in (2, 3):
+        return _ArbLocale(locale, language, rest[0], rest[1], messages)
+    raise ValueError(f"unsupported locale '{locale}'")
+
+
+def read_arb_files(config: L10nConfig) -> Tuple[_ArbLocale, List[_ArbLocale]]:
+    """
+    Reads the ARB files of the arb-dir.
+
+    Returns:
+        The template locale and all locales, including the template.
+    """
+    template_path = config.arb_dir / config.template_arb_file
+    prefix = config.template_arb_file.rsplit("_", 1)[0] + "_"
+    locales = []
+    template = None
+    for path in sorted(config.arb_dir.glob("*.arb")):
+        with path.open("r", encoding="utf-8") as f:
+            messages = json.load(f)
+        name = path.stem[len(prefix) :] if path.stem.startswith(prefix) else path.stem
+        arb_locale = _arb_locale(messages.get("@@locale", name), messages)
+        locales.append(arb_locale)
+        if path == template_path:
+            template = arb_locale
+    if template is None:
+        raise ValueError(f"template ARB file {template_path} not found")
+    return template, locales
+
+
+def _locale_file(config: L10nConfig, language: str) -> str:
+    return f"{Path(config.output_file).stem}_{language}.dart"
+
+
+def _sorted_locales(config: L10nConfig, locales: List[_ArbLocale]) -> List[_ArbLocale]:
+    preferred = {locale: index for index, locale in enumerate(config.preferred_locales)}
+    return sorted(
+        locales,
+        key=lambda arb: (preferred.get(arb.locale, len(preferred)), arb.locale),
+    )
+
+
+def _doc_comment(template: _ArbLocale, key: str) -> str:
+    metadata = template.messages.get(f"@{key}") or {}
+    description = metadata.get("description") or f"No description provided for @{key}."
+    message = template.messages[key].replace("\n", "\\n")
+    return (
+        f"  /// {description}\n"
+        "  ///\n"
+        f"  /// In {template.locale}, this message translates to:\n"
+        f"  /// **'{message}'**\n"
+    )
+
+
+def generate_main_file(
+    config: L10nConfig, template: _ArbLocale, locales: List[_ArbLocale], keys: List[str]
+) -> str:
+    """
+    Generates the abstract localizations class with its delegate and lookup.
+    """
+    cls = config.output_class
+    languages = sorted({arb.language for arb in locales})
+    of_method = (
+        f"  static {cls}? of(BuildContext context) {{\n"
+        f"    return Localizations.of<{cls}>(context, {cls});\n"
+        "  }\n"
+        if config.nullable_getter
+        else f"  static {cls} of(BuildContext context) {{\n"
+        f"    return Localizations.of<{cls}>(context, {cls})!;\n"
+        "  }\n"
+    )
+    members = []
+    for key in keys:
+        placeholders = message_placeholders(
+            parse_message(template.messages[key]), template.messages.get(f"@{key}")
+        )
+        members.append(
+            _doc_comment(template, key) + f"  {_signature(key, placeholders)};\n"
+        )
+
+    lines = [
+        config.header + "\n" if config.header else "",
+        "import 'dart:async';\n\n"
+        "import 'package:flutter/foundation.dart';\n"
+        "import 'package:flutter/widgets.dart';\n"
+        "import 'package:flutter_localizations/flutter_localizations.dart';\n"
+        "import 'package:intl/intl.dart' as intl;\n\n",
+        "".join(
+            f"import '{_locale_file(config, language)}';\n" for language in languages
+        ),
+        "\n// ignore_for_file: type=lint\n\n",
+        f"abstract class {cls} {{\n"
+        f"  {cls}(String locale)\n"
+        "      : localeName = intl.Intl.canonicalizedLocale(locale.toString());\n\n"
+        "  final String localeName;\n\n",
+        of_method,
+        f"\n  static const LocalizationsDelegate<{cls}> delegate =\n"
+        f"      _{cls}Delegate();\n\n"
+        "  static const List<LocalizationsDelegate<dynamic>> localizationsDelegates =\n"
+        "      <LocalizationsDelegate<dynamic>>[\n"
+        "    delegate,\n"
+        "    GlobalMaterialLocalizations.delegate,\n"
+        "    GlobalCupertinoLocalizations.delegate,\n"
+        "    GlobalWidgetsLocalizations.delegate,\n"
+        "  ];\n\n"
+        "  static const List<Locale> supportedLocales = <Locale>[\n",
+        "".join(
+            f"    {arb.dart_locale},\n" for arb in _sorted_locales(config, locales)
+        ),
+        "  ];\n\n",
+        "\n".join(members),
+        "}\n\n",
+        f"class _{cls}Delegate extends LocalizationsDelegate<{cls}> {{\n"
+        f"  const _{cls}Delegate();\n\n"
+        "  @override\n"
+        f"  Future<{cls}> load(Locale locale) {{\n"
+        f"    return SynchronousFuture<{cls}>(lookup{cls}(locale));\n"
+        "  }\n\n"
+        "  @override\n"
+        "  bool isSupported(Locale locale) =>\n"
+        f"      <String>[{', '.join(repr(language) for language in languages)}]"
+        ".contains(locale.languageCode);\n\n"
+        "  @override\n"
+        f"  bool shouldReload(_{cls}Delegate old) => false;\n"
+        "}\n\n",
+        _lookup_function(config, locales),
+    ]
+    return "".join(lines)
+
+
+def _lookup_function(config: L10nConfig, locales: List[_ArbLocale]) -> str:
+    cls = config.output_class
+    lines = [f"{cls} lookup{cls}(Locale locale) {{\n"]
+    full_locales = [arb for arb in locales if arb.script and arb.country]
+    if full_locales:
+        lines.append(
+            "  // Lookup logic when language+script+country codes are specified.\n"
+            "  switch (locale.toString()) {\n"
+        )
+        for arb in full_locales:
+            lines.append(
+                f"    case '{arb.language}_{arb.script}_{arb.country}':\n"
+                f"      return {cls}{arb.class_suffix}();\n"
+            )
+        lines.append("  }\n\n")
+
+    for attribute, other in (("script", "country"), ("country", "script")):
+        variants: Dict[str, List[_ArbLocale]] = {}
+        for arb in locales:
+            if getattr(arb, attribute) is not None and getattr(arb, other) is None:
+                variants.setdefault(arb.language, []).append(arb)
+        if not variants:
+            continue
+        lines.append(
+            f"  // Lookup logic when language+{attribute} codes are specified.\n"
+            "  switch (locale.languageCode) {\n"
+        )
+        for language, arbs in sorted(variants.items()):
+            lines.append(
+                f"    case '{language}':\n      {{\n"
+                f"        switch (locale.{attribute}Code) {{\n"
+            )
+            for arb in arbs:
+                lines.append(
+                    f"          case '{getattr(arb, attribute)}':\n"
+                    f"            return {cls}{arb.class_suffix}();\n"
+                )
+            lines.append("        }\n        break;\n      }\n")
+        lines.append("  }\n\n")
+
+    lines.append(
+        "  // Lookup logic when only language code is specified.\n"
+        "  switch (locale.languageCode) {\n"
+    )
+    for arb in locales:
+        if arb.script is None and arb.country is None:
+            lines.append(
+                f"    case '{arb.language}':\n"
+                f"      return {cls}{arb.class_suffix}();\n"
+            )
+    lines.append(
+        "  }\n\n"
+        "  throw FlutterError(\n"
+        f"      '{cls}.delegate failed to load unsupported locale \"$locale\". '\n"
+        "      'This is likely an issue with the localizations generation tool. '\n"
+        "      'Please file an issue on GitHub with a reproducible sample app and '\n"
+        "      'the gen-l10n configuration that was used.');\n"
+        "}\n"
+    )
+    return "".join(lines)
+
+
+def generate_language_file(
+    config: L10nConfig,
+    template: _ArbLocale,
+    language: str,
+    locales: List[_ArbLocale],
+    keys: List[str],
+) -> str:
+    """
+    Generates the classes of one language: the language itself, overriding
+    every message, and its script and country variants extending it.
+    """
+    cls = config.output_class
+    base = next(
+        (arb for arb in locales if arb.script is None and arb.country is None), None
+    )
+    if base is None:
+        raise ValueError(f"no ARB file for the base language '{language}'")
+
+    lines = [
+        config.header + "\n" if config.header else "",
+        "// ignore: unused_import\n"
+        "import 'package:intl/intl.dart' as intl;\n"
+        f"import '{config.output_file}';\n\n"
+        "// ignore_for_file: type=lint\n",
+    ]
+    for arb in [base] + [arb for arb in locales if arb is not base]:
+        parent = cls if arb is base else f"{cls}{base.class_suffix}"
+        lines.append(
+            f"\n/// The translations for `{arb.locale}`.\n"
+            f"class {cls}{arb.class_suffix} extends {parent} {{\n"
+            f"  {cls}{arb.class_suffix}([String locale = '{arb.locale}'])\n"
+            "      : super(locale);\n"
+        )
+        for key in keys:
+            message = arb.messages.get(key)
+            if not isinstance(message, str):
+                if arb is not base:
+                    continue
+                # untranslated messages fall back to the template locale
+                message = template.messages[key]
+            placeholders = message_placeholders(
+                parse_message(template.messages[key]), template.messages.get(f"@{key}")
+            )
+            lines.append("\n" + _message_member(key, message, placeholders))
+        lines.append("}\n")
+    return "".join(lines)
+
+
+def generate_files(config: L10nConfig) -> Dict[Path, str]:
+    """
+    Generates the localization sources of an l10n.yaml configuration.
+
+    Raises:
+        ValueError: If the ARB files use syntax the generator does not support.
+    """
+    template, locales = read_arb_files(config)
+    keys = [
+        key
+        for key, value in template.messages.items()
+        if not key.startswith("@") and isinstance(value, str)
+    ]
+    files = {
+        config.output_dir / config.output_file: generate_main_file(
+            config, template, locales, keys
+        )
+    }
+    by_language: Dict[str, List[_ArbLocale]] = {}
+    for arb in locales:
+        by_language.setdefault(arb.language, []).append(arb)
+    for language, language_locales in by_language.items():
+        files[config.output_dir / _locale_file(config, language)] = (
+            generate_language_file(config, template, language, language_locales, keys)
+        )
+    return files
+
+
+def inputs_hash(config: L10nConfig) -> str:
+    """
+    Hashes the generator version, the configuration and every ARB file.
+    """
+    digest = hashlib.sha256(GENERATOR_VERSION.encode("utf-8"))
+    digest.update(json.dumps(asdict(config), default=str, sort_keys=True).encode())
+    for path in sorted(config.arb_dir.glob("*.arb")):
+        digest.update(path.name.encode("utf-8"))
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def _output_stamps(paths: List[str]) -> Optional[Dict[str, int]]:
+    try:
+        return {path: Path(path).stat().st_mtime_ns for path in paths}
+    except FileNotFoundError:
+        return None
+
+
+def _read_cache(package_path: Path) -> Dict[str, Any]:
+    try:
+        with (package_path / CACHE_FILE).open("r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def generate_package_localizations(package_path: Path) -> bool:
+    """
+    Generates the localizations of one package from its l10n.yaml,
+    like `flutter gen-l10n` but without starting the Flutter tool.
+
+    A cache in .dart_tool remembers the hash of the ARB files and options and
+    the generated files, so unchanged packages are skipped. Packages whose
+    l10n.yaml or ARB files use features the generator does not implement
+    fall back to `flutter gen-l10n`.
+
+    Returns:
+        True if the localizations are up to date.
+    """
+    package_path = package_path.resolve()
+    config = load_l10n_config(package_path)
+    if config is None:
+        return _flutter_gen_l10n(package_path, "unsupported l10n.yaml options")
+
+    try:
+        input_hash = inputs_hash(config)
+    except OSError as e:
+        output(f"Cannot read the ARB files of {package_path}: {e}", OutputType.ERROR)
+        return False
+
+    cache = _read_cache(package_path)
+    outputs = cache.get("outputs") or {}
+    if cache.get("hash") == input_hash and _output_stamps(list(outputs)) == outputs:
+        output(f"Localizations of {package_path.name} are up to date", OutputType.INFO)
+        return True
+
+    run_key = (input_hash, str(config.output_dir))
+    with _generated_lock:
+        paths = _generated.get(run_key)
+    if paths is None:
+        try:
+            files = generate_files(config)
+        except ValueError as e:
+            return _flutter_gen_l10n(package_path, str(e))
+        for path, content in files.items():
+            emit_file(path, content)
+        paths = sorted(str(path) for path in files)
+        with _generated_lock:
+            _generated[run_key] = paths
+        output(
+            f"Generated the localizations of {package_path.name}", OutputType.SUCCESS
+        )
+
+    emit_file(
+        package_path / CACHE_FILE,
+        json.dumps({"hash": input_hash, "outputs": _output_stamps(paths)}, indent=2),
+    )
+    return True
+
+
+def _flutter_gen_l10n(package_path: Path, reason: str) -> bool:
+    output(
+        f"Running flutter gen-l10n for {package_path.name} ({reason})", OutputType.INFO
+    )
+    try:
+        run_command(["flutter", "gen-l10n"], cwd=package_path)
+        return True
+    except (subprocess.SubprocessError, FileNotFoundError) as e:
+        output(f"flutter gen-l10n failed for {package_path}: {e}", OutputType.ERROR)
+        return False
+
+
+def localization_packages(root_path: Path) -> List[Path]:
+    """
+    The apps and packages of a monorepo that have an l10n.yaml.
+    """
+    index = load_workspace_index(root_path)
+    return sorted(
+        root_path / member.path for member in index.members() if member.has_l10n
+    )
+
+
+def generate_localizations(root_path: Path) -> bool:
+    """
+    Generates the localizations of every app and package with an l10n.yaml,
+    replacing `melos loc`.
+
+    Returns:
+        True if all packages succeeded.
+    """
+    ok = True
+    for package_path in localization_packages(root_path):
+        ok = generate_package_localizations(package_path) and ok
+    return ok
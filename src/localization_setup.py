@@ -1,13 +1,13 @@
 import json
-import subprocess
 from pathlib import Path
 from typing import List
 
-from src.constants import L10N, LIB, SRC
-from src.dart_util import create_dart_file
+from src.constants import DEFAULT_LOCALES, L10N, LIB, TEMPLATE_LOCALE
+from src.dependency_util import DependencyKind, register_dependency
+from src.emit_util import emit_file
 from src.output_util import OutputType, output
-from src.package_util import add_package
-from src.templates import apps_main_template, get_res_l10n_template
+from src.template_registry import render_file_set
+from src.workspace import Workspace
 from src.yaml import create_l10n_yaml
 
 # def find_res_package(root_path: Path, packages: List[str]) -> Path:
@@ -48,93 +48,94 @@ ne_arb_content = {
     },
 }
 
+arb_contents = {"en": en_arb_content, "ne": ne_arb_content}
 
-def setup_localization(
-    project_name: str, package_name: str, root_path: Path, apps: List[str]
-):
-    output("Starting localization setup...", OutputType.INFO)
 
-    package_pubspec = root_path / "packages" / package_name / "pubspec.yaml"
-    package_path = root_path / "packages" / package_name
+def get_arb_content(locale: str) -> dict:
+    """
+    Returns the starter ARB content for a locale.
+    Locales without translations start from the template locale messages.
+    """
+    if locale in arb_contents:
+        return arb_contents[locale]
+    return {**arb_contents[TEMPLATE_LOCALE], "@@locale": locale}
+
+
+def check_resource_package(package_path: Path) -> bool:
+    package_pubspec = package_path / "pubspec.yaml"
 
     output(f"Checking resource package at: {package_path}", OutputType.INFO)
     if package_path.exists() is False:
         output("Resource package path doesn't exist", OutputType.ERROR)
-        return
+        return False
 
     output(f"Checking package pubspec at: {package_pubspec}", OutputType.INFO)
     if package_pubspec.exists() is False:
         output("Resource package pubspec doesn't exist", OutputType.ERROR)
-        return
-
-    # install flutter localization
-    output("Adding flutter_localizations package...", OutputType.INFO)
-    try:
-        subprocess.run(
-            ["flutter", "pub", "add", "flutter_localizations", "--sdk=flutter"],
-            check=True,
-            cwd=package_path,
-            capture_output=True,
-        )
-        output("Added flutter_localizations package", OutputType.SUCCESS)
-    except subprocess.CalledProcessError:
-        output("Failed to add flutter_localizations package", OutputType.ERROR)
-        return
-
-    # Install intl package
-    output("Adding intl package...", OutputType.INFO)
-    add_package(pub_path=package_path, package_name="intl", is_dev=False)
-    output("Added intl package", OutputType.SUCCESS)
+        return False
+    return True
+
+
+def register_localization_dependencies(package_path: Path) -> None:
+    """
+    Registers flutter_localizations and intl for the resource package
+    """
+    register_dependency(package_path, "flutter_localizations", DependencyKind.SDK)
+    register_dependency(package_path, "intl")
+
+
+def create_localization_files(
+    project_name: str,
+    package_name: str,
+    root_path: Path,
+    apps: List[str],
+    locales: List[str] = DEFAULT_LOCALES,
+) -> bool:
+    """
+    Creates the ARB files and the l10n.yaml files, and renders the "app"
+    template set into every app
+    """
+    package_path = root_path / "packages" / package_name
+    if not check_resource_package(package_path):
+        return False
 
     # create arb files
     arb_folder = package_path / LIB / L10N
     output(f"Setting up localization files in: {arb_folder}", OutputType.INFO)
     if arb_folder.exists():
+        # keep existing translations, but finish the rest of the setup
         output("Localization folder already exists", OutputType.INFO)
-        return
-    arb_folder.mkdir(parents=True, exist_ok=True)
-    arb_file_en = arb_folder / "app_en.arb"
-    arb_file_np = arb_folder / "app_ne.arb"
-
-    output("Creating English localization file...", OutputType.INFO)
-    with arb_file_en.open("w") as f:
-        json.dump(en_arb_content, f, ensure_ascii=False, indent=2)
+    else:
+        arb_folder.mkdir(parents=True, exist_ok=True)
 
-    output("Creating Nepali localization file...", OutputType.INFO)
-    with arb_file_np.open("w") as f:
-        json.dump(ne_arb_content, f, ensure_ascii=False, indent=2)
+        for locale in locales:
+            output(f"Creating '{locale}' localization file...", OutputType.INFO)
+            emit_file(
+                arb_folder / f"app_{locale}.arb",
+                json.dumps(get_arb_content(locale), ensure_ascii=False, indent=2),
+            )
 
-    output("Created the ARB files", OutputType.SUCCESS)
+        output("Created the ARB files", OutputType.SUCCESS)
 
     # Creating the l10n yaml file for package
     output("Creating l10n.yaml for resource package...", OutputType.INFO)
-    create_l10n_yaml(path=package_path, is_res=True, res_package=package_name)
+    workspace = Workspace(root_path)
+    create_l10n_yaml(
+        path=package_path, is_res=True, res_package=package_name, workspace=workspace
+    )
 
     # Creating l10n yaml for apps
     output("Setting up localization for apps...", OutputType.INFO)
     for app in apps:
         output(f"Configuring localization for app: {app}", OutputType.INFO)
         app_path = root_path / "apps" / app
-        app_lib_path = app_path / LIB
-        if app_lib_path.exists() is False:
-            output(f"Creating lib directory for app: {app}", OutputType.INFO)
-            app_lib_path.mkdir(parents=True, exist_ok=True)
-        app_dart_path = app_path / LIB / "app"
-        main_file_name = f"{app}_app.dart"
-        create_l10n_yaml(path=app_path, is_res=False, res_package=package_name)
-        create_dart_file(
-            app_dart_path, main_file_name, apps_main_template(app, project_name)
+        create_l10n_yaml(
+            path=app_path, is_res=False, res_package=package_name, workspace=workspace
         )
+        context = {"app_name": app, "project_name": project_name}
+        render_file_set("app", app_path, context)
 
-    output("Creating localization source files...", OutputType.INFO)
-    src_path = package_path / LIB / SRC
-
-    if src_path.exists() is False:
-        output("Creating src directory...", OutputType.INFO)
-        src_path.mkdir(parents=True, exist_ok=True)
-
-    localization_path = src_path / f"{project_name}_localization.dart"
-    output(f"Creating localization class file: {localization_path}", OutputType.INFO)
-    with open(localization_path, "w") as f:
-        f.write(get_res_l10n_template(f"{project_name}"))
+    workspace.flush()
     output("Localization setup completed successfully!", OutputType.SUCCESS)
+    return True
+
@@ -0,0 +1,187 @@
+import json
+import re
+from pathlib import Path
+from typing import List, Optional
+
+from src.constants import DEFAULT_LOCALES, TEMPLATE_LOCALE
+from src.input_util import default_packages, validate_name_format, validate_names
+from src.models import Manifest, UserInput
+from src.output_util import OutputType, output
+
+LOCALE_REG = re.compile(r"^[a-z]{2,3}(?:_(?:[A-Z]{2}|[A-Z][a-z]{3}))?$")
+
+MANIFEST_KEYS = {"project_name", "apps", "packages", "locales", "options"}
+
+
+def load_manifest(manifest_path: Path) -> Optional[Manifest]:
+    """
+    Reads and validates a scaffolding manifest (YAML or JSON).
+
+    Example:
+        project_name: shop
+        apps: [customer, admin]
+        packages: [payments]
+        locales: [en, ne]
+        options:
+          refresh-template-cache: true
+
+    Args:
+        manifest_path: Path to the .yaml, .yml or .json manifest.
+    Returns:
+        The manifest, or None if it is missing or invalid.
+    """
+    data = _read_manifest_file(manifest_path)
+    if data is None:
+        return None
+    return parse_manifest(data)
+
+
+def load_catalog(catalog_path: Path) -> Optional[List[Manifest]]:
+    """
+    Reads the workspaces of a batch: either a single manifest, or a catalog
+    with a list of manifests under 'workspaces'.
+
+    Example:
+        workspaces:
+          - project_name: shop
+            apps: [customer, admin]
+          - project_name: clinic
+            apps: [patient]
+
+    Returns:
+        The manifests, or None if the file or any manifest is invalid.
+    """
+    data = _read_manifest_file(catalog_path)
+    if data is None:
+        return None
+    if set(data) != {"workspaces"}:
+        manifest = parse_manifest(data)
+        return None if manifest is None else [manifest]
+
+    workspaces = data["workspaces"]
+    if not isinstance(workspaces, list) or not workspaces:
+        output("Catalog 'workspaces' must be a list of manifests.", OutputType.ERROR)
+        return None
+    manifests = []
+    for workspace in workspaces:
+        manifest = parse_manifest(workspace)
+        if manifest is None:
+            return None
+        manifests.append(manifest)
+    return manifests
+
+
+def _read_manifest_file(manifest_path: Path) -> Optional[dict]:
+    if not manifest_path.is_file():
+        output(f"Manifest '{manifest_path}' does not exist.", OutputType.ERROR)
+        return None
+
+    try:
+        with manifest_path.open("r") as f:
+            if manifest_path.suffix == ".json":
+                data = json.load(f)
+            else:
+                from ruamel.yaml import YAML
+
+                data = YAML(typ="safe").load(f)
+    except Exception as e:
+        output(f"Failed to read manifest '{manifest_path}': {e}", OutputType.ERROR)
+        return None
+
+    if not isinstance(data, dict):
+        output("Manifest must be a mapping.", OutputType.ERROR)
+        return None
+    return data
+
+
+def parse_manifest(data: object) -> Optional[Manifest]:
+    """
+    Validates the content of a manifest.
+
+    Returns:
+        The manifest, or None if it is invalid.
+    """
+    if not isinstance(data, dict):
+        output("Manifest must be a mapping.", OutputType.ERROR)
+        return None
+
+    unknown_keys = set(data) - MANIFEST_KEYS
+    if unknown_keys:
+        output(
+            f"Unknown manifest keys: {', '.join(sorted(unknown_keys))}",
+            OutputType.ERROR,
+        )
+        return None
+
+    project_name = data.get("project_name")
+    if not isinstance(project_name, str) or not validate_name_format(project_name):
+        output("Manifest needs a valid 'project_name'.", OutputType.ERROR)
+        return None
+
+    apps = _string_list(data, "apps")
+    packages = _string_list(data, "packages")
+    locales = _string_list(data, "locales")
+    options = data.get("options") or {}
+    if apps is None or packages is None or locales is None:
+        return None
+    if not isinstance(options, dict):
+        output("Manifest 'options' must be a mapping.", OutputType.ERROR)
+        return None
+
+    packages = default_packages(project_name) + packages
+    if not validate_names(apps, project_name) or not validate_names(
+        packages, project_name
+    ):
+        return None
+
+    duplicates = _duplicates(apps + packages)
+    if duplicates:
+        output(
+            f"Duplicate app or package names: {', '.join(duplicates)}",
+            OutputType.ERROR,
+        )
+        return None
+
+    locales = locales or list(DEFAULT_LOCALES)
+    if not validate_locales(locales):
+        return None
+
+    output("Manifest validation successful", OutputType.SUCCESS)
+    return Manifest(UserInput(project_name, apps, packages, locales), options)
+
+
+def validate_locales(locales: List[str]) -> bool:
+    """
+    Validates the locale codes of a manifest.
+    The template locale must always be present.
+    """
+    for locale in locales:
+        if not LOCALE_REG.match(locale):
+            output(f"Invalid locale '{locale}'.", OutputType.ERROR)
+            return False
+
+    if TEMPLATE_LOCALE not in locales:
+        output(
+            f"Locales must include the template locale '{TEMPLATE_LOCALE}'.",
+            OutputType.ERROR,
+        )
+        return False
+
+    duplicates = _duplicates(locales)
+    if duplicates:
+        output(f"Duplicate locales: {', '.join(duplicates)}", OutputType.ERROR)
+        return False
+    return True
+
+
+def _string_list(data: dict, key: str) -> Optional[List[str]]:
+    values = data.get(key) or []
+    if not isinstance(values, list) or not all(isinstance(v, str) for v in values):
+        output(f"Manifest '{key}' must be a list of names.", OutputType.ERROR)
+        return None
+    return [v.strip() for v in values]
+
+
+def _duplicates(names: List[str]) -> List[str]:
+    seen = set()
+    return sorted({name for name in names if name in seen or seen.add(name)})
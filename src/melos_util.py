@@ -1,67 +1,66 @@
-import shutil
 import subprocess
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
 from src.output_util import OutputType, output
+from src.process_util import run_command
+from src.pub_util import pub_flags
 
 
-def is_melos_installed() -> bool:
+def melos_invocation(
+    commands: List[str], packages: Optional[List[str]] = None
+) -> Tuple[List[str], Dict[str, str]]:
     """
-    Check if Melos is globally installed and available in PATH.
+    Builds the melos command line and extra environment for a command.
+
+    Packages are selected with --scope for bootstrap and exec, and with
+    MELOS_PACKAGES for scripts (`melos run loc` or `melos loc`), which
+    do not accept filter flags.
 
     Returns:
-        True if melos is available and working, False otherwise.
+        The command and the environment variables to add.
     """
-    if shutil.which("melos") is None:
-        return False
+    command = ["melos", *commands]
+    env: Dict[str, str] = {}
+    name = commands[0] if commands else None
 
-    try:
-        subprocess.run(
-            ["melos", "--version"],
-            check=True,
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-        )
-        return True
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        return False
+    if name in ("bs", "bootstrap"):
+        command += pub_flags()
+    if name in ("bs", "bootstrap", "exec"):
+        # flags go before the `--` that starts the exec'd command
+        position = command.index("--") if "--" in command else len(command)
+        scopes = [f"--scope={package}" for package in packages or []]
+        command[position:position] = scopes
+    elif packages is not None:
+        env["MELOS_PACKAGES"] = ",".join(packages)
+    return command, env
 
 
-def activate_melos() -> bool:
+def melos_command(
+    path: Path, commands: List[str], packages: Optional[List[str]] = None
+) -> bool:
     """
-    Activates Melos globally using Dart if it is not already installed.
+    Runs a melos command in the workspace.
 
+    Args:
+        path: The monorepo root.
+        commands: The melos command and its arguments, e.g. ["bs"].
+        packages: Only run for these packages, all packages when None.
     Returns:
-        True if Melos is successfully activated or already present, False otherwise.
+        True if the command succeeded.
     """
-    output("Checking if Melos is installed...", OutputType.INFO)
-
-    try:
-        subprocess.run(["dart", "pub", "global", "activate", "melos"], check=True)
-        output("Melos has been activated globally.", OutputType.SUCCESS)
+    if packages is not None and not packages:
         return True
-    except subprocess.CalledProcessError as e:
-        output("Failed to activate Melos.", OutputType.ERROR)
-        output(f"Error: {e}", OutputType.ERROR)
-        return False
-    except FileNotFoundError:
-        output(
-            "Dart SDK not found. Make sure Dart is installed and in your PATH.",
-            OutputType.ERROR,
-        )
-        return False
-
 
-def melos_command(path: Path, commands: List[str]):
-    output("Running melos commands", OutputType.INFO)
+    scope = f" for {len(packages)} packages" if packages is not None else ""
+    output(f"Running melos {' '.join(commands)}{scope}", OutputType.INFO)
+    command, env = melos_invocation(commands, packages)
     try:
-        subprocess.run(["melos", *commands], check=True, cwd=path)
+        run_command(command, check=True, cwd=path, capture_output=True, env=env)
         output("Melos command executed successfully.", OutputType.SUCCESS)
         return True
-    except subprocess.CalledProcessError as e:
+    except subprocess.SubprocessError:
         output("Failed to run Melos command.", OutputType.ERROR)
-        output(f"Error: {e}", OutputType.ERROR)
         return False
     except FileNotFoundError:
         output(
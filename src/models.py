@@ -1,5 +1,7 @@
-from dataclasses import dataclass
-from typing import List, Optional
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from src.constants import DEFAULT_LOCALES
 
 
 @dataclass
@@ -11,3 +13,38 @@ class UserInput:
     project_name: Optional[str]
     apps: List[str]
     packages: List[str]
+    locales: List[str] = field(default_factory=lambda: list(DEFAULT_LOCALES))
+
+
+@dataclass
+class Manifest:
+    """
+    class to pass the contents of a scaffolding manifest
+    """
+
+    user_input: UserInput
+    options: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class AdditionPlan:
+    """
+    class to pass what `--add` will change in an existing monorepo
+    """
+
+    new_apps: List[str]
+    new_packages: List[str]
+    existing_apps: List[str]
+    existing_packages: List[str]
+    workspace_entries: List[str]
+    resolution_updates: List[str]
+    # new members whose name is already used by another member
+    conflicts: List[str] = field(default_factory=list)
+
+    def is_empty(self) -> bool:
+        return not (
+            self.new_apps
+            or self.new_packages
+            or self.workspace_entries
+            or self.resolution_updates
+        )
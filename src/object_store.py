@@ -0,0 +1,155 @@
+import hashlib
+import os
+import sys
+import tempfile
+import threading
+from pathlib import Path, PurePath
+from typing import Dict
+
+from src.constants import STATE_DIR
+from src.output_util import OutputType, output
+
+OBJECTS_DIR = "objects"
+
+# Top level folders of an app that hold the runner project of a platform
+PLATFORM_DIRS = {"android", "ios", "web", "linux", "macos", "windows"}
+
+# ioctl that makes a file share the data blocks of another (Btrfs, XFS, ...)
+FICLONE = 0x40049409
+
+_reflink_supported: Dict[Path, bool] = {}
+_counts = {"reflink": 0, "hardlink": 0, "copy": 0, "bytes": 0}
+_lock = threading.Lock()
+
+
+def object_store_dir(monorepo_path: Path) -> Path:
+    return monorepo_path / STATE_DIR / OBJECTS_DIR
+
+
+def is_platform_file(relative: PurePath) -> bool:
+    """
+    Whether a path relative to an app is inside one of its platform folders.
+    """
+    return len(relative.parts) > 1 and relative.parts[0] in PLATFORM_DIRS
+
+
+def store_object(store_dir: Path, data: bytes) -> Path:
+    """
+    Stores content once under its SHA-256 and returns the read-only object.
+    """
+    digest = hashlib.sha256(data).hexdigest()
+    object_path = store_dir / digest[:2] / digest[2:]
+    if not object_path.exists():
+        object_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_name = tempfile.mkstemp(prefix=".", dir=object_path.parent)
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(temp_name, 0o444)
+        # another thread may store the same object, both copies are equal
+        os.replace(temp_name, object_path)
+    return object_path
+
+
+def place_shared_file(store_dir: Path, target: Path, data: bytes, mode: int) -> str:
+    """
+    Writes a file whose content is the same in every app from the object store.
+
+    The file is a reflink of the stored object where the file system supports
+    it, so it shares the data blocks but can be edited like any other file.
+    Otherwise read-only files become hardlinks to the object, and the other
+    files are plain copies that are not stored.
+
+    Args:
+        store_dir: The object store of the monorepo.
+        target: The file to create.
+        data: The content of the file.
+        mode: The mode of the file when it is not a hardlink.
+    Returns:
+        How the file was created: "reflink", "hardlink" or "copy".
+    """
+    target.unlink(missing_ok=True)
+    read_only = not mode & 0o222
+
+    kind = "copy"
+    if read_only or supports_reflink(store_dir):
+        object_path = store_object(store_dir, data)
+        if _reflink(store_dir, object_path, target):
+            os.chmod(target, mode & 0o777)
+            kind = "reflink"
+        elif read_only and _hardlink(object_path, target):
+            kind = "hardlink"
+    if kind == "copy":
+        target.write_bytes(data)
+        os.chmod(target, mode & 0o777)
+
+    with _lock:
+        _counts[kind] += 1
+        if kind != "copy":
+            _counts["bytes"] += len(data)
+    return kind
+
+
+def supports_reflink(store_dir: Path) -> bool:
+    """
+    Whether the file system of the object store can reflink, probed once per
+    store with two empty files.
+    """
+    if not sys.platform.startswith("linux"):
+        return False
+    with _lock:
+        supported = _reflink_supported.get(store_dir)
+    if supported is not None:
+        return supported
+
+    import fcntl
+
+    store_dir.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryFile(dir=store_dir) as src, tempfile.TemporaryFile(
+        dir=store_dir
+    ) as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            supported = True
+        except OSError:
+            supported = False
+    with _lock:
+        _reflink_supported[store_dir] = supported
+    return supported
+
+
+def _reflink(store_dir: Path, source: Path, target: Path) -> bool:
+    if not supports_reflink(store_dir):
+        return False
+    import fcntl
+
+    with source.open("rb") as src, target.open("wb") as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            return True
+        except OSError:
+            # the whole store lives on one file system, so stop trying
+            with _lock:
+                _reflink_supported[store_dir] = False
+    target.unlink()
+    return False
+
+
+def _hardlink(source: Path, target: Path) -> bool:
+    try:
+        os.link(source, target)
+        return True
+    except OSError:
+        return False
+
+
+def print_share_summary() -> None:
+    with _lock:
+        counts = dict(_counts)
+    if not counts["reflink"] + counts["hardlink"] + counts["copy"]:
+        return
+    output(
+        f"Shared platform files: {counts['reflink']} reflinked, "
+        f"{counts['hardlink']} hardlinked, {counts['copy']} copied "
+        f"({counts['bytes'] // 1024} KiB stored once)",
+        OutputType.INFO,
+    )
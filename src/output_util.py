@@ -1,14 +1,84 @@
+import shutil
+import sys
+import threading
 from enum import Enum
-from colorama import Fore, Style, init
+from functools import lru_cache
+from typing import Callable, List, Optional, TextIO
+
+
+@lru_cache(maxsize=None)
+def _colorama():
+    """
+    Loads and initializes colorama on the first message.
+    """
+    import colorama
+
+    colorama.init()
+    return colorama
 
-# Initialize colorama
-init()
 
 class OutputType(Enum):
     ERROR = "❌"
     INFO = "ℹ️"
     SUCCESS = "✓"
 
+
+# Messages and the live progress block share the terminal
+_print_lock = threading.RLock()
+# Where messages go; None is the sys.stdout of the moment
+_message_stream: Optional[TextIO] = None
+_live_block: Optional[Callable[[], List[str]]] = None
+_drawn_lines = 0
+
+
+def set_message_stream(stream: Optional[TextIO]) -> None:
+    """
+    Sends the messages to another stream, e.g. stderr for commands whose
+    stdout is read by other programs. None sends them to stdout again.
+    """
+    global _message_stream
+    with _print_lock:
+        _message_stream = stream
+
+
+def set_live_block(renderer: Optional[Callable[[], List[str]]]) -> None:
+    """
+    Keeps the lines returned by renderer at the bottom of the terminal,
+    below all messages. None removes the block.
+    """
+    global _live_block
+    with _print_lock:
+        _clear_live_block()
+        _live_block = renderer
+        _draw_live_block()
+
+
+def redraw_live_block() -> None:
+    with _print_lock:
+        _clear_live_block()
+        _draw_live_block()
+
+
+def _clear_live_block() -> None:
+    global _drawn_lines
+    if _drawn_lines:
+        # move to the first line of the block and clear to the end of the screen
+        sys.stdout.write(f"\033[{_drawn_lines}F\033[J")
+        _drawn_lines = 0
+
+
+def _draw_live_block() -> None:
+    global _drawn_lines
+    if _live_block is None:
+        return
+    width = shutil.get_terminal_size().columns - 1
+    lines = [line[:width] for line in _live_block()]
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+    _drawn_lines = len(lines)
+    sys.stdout.flush()
+
+
 def output(message: str, output_type: OutputType) -> None:
     """
     Output a message with appropriate color and tag based on the type.
@@ -17,10 +87,32 @@ def output(message: str, output_type: OutputType) -> None:
         message: The message to display
         output_type: The type of message (ERROR, INFO, or SUCCESS)
     """
+    colorama = _colorama()
     color = {
-        OutputType.ERROR: Fore.RED,
-        OutputType.INFO: Fore.BLUE,
-        OutputType.SUCCESS: Fore.GREEN
+        OutputType.ERROR: colorama.Fore.RED,
+        OutputType.INFO: colorama.Fore.BLUE,
+        OutputType.SUCCESS: colorama.Fore.GREEN
     }[output_type]
 
-    print(f"{color}{output_type.value} {message}{Style.RESET_ALL}")
\ No newline at end of file
+    with _print_lock:
+        _clear_live_block()
+        print(
+            f"{color}{output_type.value} {message}{colorama.Style.RESET_ALL}",
+            file=_message_stream,
+        )
+        _draw_live_block()
+
+
+def output_lines(lines: List[str]) -> None:
+    """
+    Prints lines of command output, dimmed and indented, as one block.
+    """
+    colorama = _colorama()
+    with _print_lock:
+        _clear_live_block()
+        for line in lines:
+            print(
+                f"{colorama.Style.DIM}    {line}{colorama.Style.RESET_ALL}",
+                file=_message_stream,
+            )
+        _draw_live_block()
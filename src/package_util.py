@@ -1,85 +1,142 @@
 import subprocess
-import sys
+import time
 from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import List, Optional, Tuple
 
 from src.output_util import OutputType, output
-from src.yaml import add_resolution_workspace_to_packages
+from src.process_util import (CancelScope, CommandCancelled, cancel_scope,
+                              current_scope, run_command)
+from src.profiler import profile_span
+from src.pub_util import pub_flags
+from src.resource_util import worker_count
+from src.template_cache import create_from_template_cache
 
+_jobs: Optional[int] = None
 
-def add_package(
-    pub_path: Path,
-    package_name: str,
-    is_dev: bool,
-) -> None:
+
+def add_packages(pub_path: Path, specs: List[str]) -> bool:
     """
-    Adds a Dart/Flutter package using `flutter pub add` or `flutter pub add --dev`.
+    Adds several Dart/Flutter packages with a single `flutter pub add`.
 
     Args:
-        pubspec_dir: The directory where the pubspec.yaml is located.
-        package_name: The name of the package to add. dev: If True, add as a dev dependency.
+        pub_path: The directory where the pubspec.yaml is located.
+        specs: `flutter pub add` arguments, e.g. intl, dev:melos or
+            flutter_localizations:{"sdk":"flutter"}.
     Returns:
         True if the command succeeded, False otherwise.
     """
-
-    cmd = ["flutter", "pub", "add"]
-    if is_dev:
-        cmd.append("-d")
-    cmd.append(package_name)
+    cmd = ["flutter", "pub", "add", *pub_flags(), *specs]
 
     try:
-        subprocess.run(cmd, cwd=pub_path, check=True, capture_output=True)
-        output(
-            f"Added {package_name} as {'dev dependency' if is_dev else 'dependency'}",
-            OutputType.SUCCESS,
+        run_command(cmd, cwd=pub_path, check=True, capture_output=True)
+        output(f"Added {', '.join(specs)} in {pub_path}", OutputType.SUCCESS)
+        return True
+    except subprocess.SubprocessError:
+        output(f"Failed to add {', '.join(specs)} in {pub_path}", OutputType.ERROR)
+        return False
+
+
+def set_jobs(jobs: Optional[int]) -> None:
+    """
+    Limits how many apps and packages are created at the same time.
+    None sizes the pool from the CPU count and the available memory.
+    """
+    global _jobs
+    _jobs = jobs
+
+
+def create_flutter_templates(
+    monorepo_path: Path, apps: List[str], packages: List[str]
+) -> bool:
+    """
+    creates the basic flutter applications and packages
+    for all the names that are provided, on one shared worker pool
+
+    Returns:
+        True if every app or package was created, False otherwise.
+    """
+    tasks = [(single_flutter_app_template, monorepo_path / "apps", app) for app in apps]
+    tasks += [
+        (single_flutter_package_template, monorepo_path / "packages", package)
+        for package in packages
+    ]
+    if not tasks:
+        return True
+    for _, parent_path, _ in tasks:
+        parent_path.mkdir(parents=True, exist_ok=True)
+
+    workers = min(worker_count(_jobs), len(tasks))
+    output(
+        f"Creating {len(apps)} apps and {len(packages)} packages "
+        f"with {workers} workers",
+        OutputType.INFO,
+    )
+
+    submitted = time.perf_counter()
+    # the first failure cancels the other templates and kills their commands
+    scope = CancelScope(current_scope())
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        timings = list(
+            executor.map(lambda task: _timed_template(submitted, scope, *task), tasks)
+        )
+    if scope.cancelled():
+        skipped = sum(result is None for result, _, _ in timings)
+        # the scope is also cancelled from outside, e.g. by a failed step
+        reason = (
+            " after a failure"
+            if any(result is False for result, _, _ in timings)
+            else ""
         )
-    except subprocess.CalledProcessError:
+        output(f"Cancelled {skipped} apps and packages{reason}", OutputType.ERROR)
+        timings = [timing for timing in timings if timing[0] is not None]
+
+    if timings:
+        queued = [queue for _, queue, _ in timings]
+        running = [run for _, _, run in timings]
         output(
-            f"Failed to add package '{package_name}' in {pub_path}", OutputType.ERROR
+            f"Template queue time avg {sum(queued) / len(queued):.2f}s "
+            f"max {max(queued):.2f}s, run time avg "
+            f"{sum(running) / len(running):.2f}s max {max(running):.2f}s",
+            OutputType.INFO,
         )
-        sys.exit()
+    return not scope.cancelled() and all(result for result, _, _ in timings)
 
 
-def create_flutter_templates(monorepo_path: Path, apps: list, is_app: bool):
+def _timed_template(
+    submitted: float, scope: CancelScope, create, parent_path: Path, name: str
+) -> Tuple[Optional[bool], float, float]:
     """
-    creates the basic flutter application
-    for  all the application names that are provided
+    Runs one template creation and returns its result (None if it was
+    cancelled), queue time and run time. A failure cancels the scope.
     """
-    if is_app:
-        app_path = monorepo_path / "apps"
-    else:
-        app_path = monorepo_path / "packages"
-    app_path.mkdir(parents=True, exist_ok=True)
-
-    with ThreadPoolExecutor() as executor:
-        if is_app:
-            list(
-                executor.map(
-                    lambda app: single_flutter_app_template(app_path, app), apps
-                )
-            )
+    started = time.perf_counter()
+    if scope.cancelled():
+        return None, started - submitted, 0.0
+    with cancel_scope(scope), profile_span(
+        create.__name__, "template", {"name": name}
+    ):
+        try:
+            result = create(parent_path, name)
+        except CommandCancelled:
+            result = None
+    if result is False:
+        if scope.cancelled():
+            # killed because a sibling failed first
+            result = None
         else:
-            list(
-                executor.map(
-                    lambda app: single_flutter_package_template(app_path, app), apps
-                )
-            )
+            scope.cancel()
+    return result, started - submitted, time.perf_counter() - started
 
 
 def single_flutter_app_template(app_path: Path, app: str) -> bool:
     """
     Does the thing for single app
     """
-    cmd = ["flutter", "create", app]
-    try:
-        output(f"Creating Flutter app: {app}", OutputType.INFO)
-        subprocess.run(cmd, cwd=app_path, check=True, capture_output=True)
-    except subprocess.CalledProcessError:
+    output(f"Creating Flutter app: {app}", OutputType.INFO)
+    if not create_from_template_cache(app_path, app, "app"):
         output(f"Failed to create app for {app}", OutputType.ERROR)
         return False
-
-    app_pubspec_path = app_path / app / "pubspec.yaml"
-    add_resolution_workspace_to_packages(app_pubspec_path, app)
     output(f"Successfully created Flutter app: {app}", OutputType.SUCCESS)
     return True
 
@@ -88,25 +145,24 @@ def single_flutter_package_template(package_path: Path, package: str) -> bool:
     """
     Does the thing for single package
     """
-    cmd = ["flutter", "create", "-t", "package", package]
-    try:
-        output(f"Creating Flutter package: {package}", OutputType.INFO)
-        subprocess.run(cmd, cwd=package_path, check=True, capture_output=True)
-    except subprocess.CalledProcessError:
+    output(f"Creating Flutter package: {package}", OutputType.INFO)
+    if not create_from_template_cache(package_path, package, "package"):
         output(f"Failed to create package for {package}", OutputType.ERROR)
         return False
-
-    package_pubspec_path = package_path / package / "pubspec.yaml"
-    add_resolution_workspace_to_packages(package_pubspec_path, package)
     output(f"Successfully created Flutter package: {package}", OutputType.SUCCESS)
     return True
 
 
-def pub_get(path: Path):
+def pub_get(path: Path) -> bool:
     try:
-        subprocess.run(
-            ["flutter", "pub", "get"], check=True, capture_output=True, cwd=path
+        run_command(
+            ["flutter", "pub", "get", *pub_flags()],
+            check=True,
+            capture_output=True,
+            cwd=path,
         )
         output(f"Ran pub get at {path}", OutputType.SUCCESS)
+        return True
     except subprocess.SubprocessError:
         output(f"Failed pub get at {path}", OutputType.ERROR)
+        return False
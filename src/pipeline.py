@@ -0,0 +1,244 @@
+import sys
+import tempfile
+from pathlib import Path
+from typing import List, Optional
+
+from src.dependency_util import (DependencyKind, flush_dependencies,
+                                 register_dependency)
+from src.emit_util import print_emit_summary
+from src.golden import (GOLDEN_PROJECT, golden_input, scaffold_from_golden,
+                        write_golden_archive)
+from src.input_util import take_addition_input
+from src.journal import StepJournal
+from src.l10n_codegen import generate_localizations
+from src.localization_setup import (create_localization_files,
+                                    register_localization_dependencies)
+from src.melos_util import melos_command
+from src.models import UserInput
+from src.object_store import print_share_summary
+from src.output_util import OutputType, output
+from src.package_util import create_flutter_templates, pub_get
+from src.step_scheduler import Step, run_steps
+from src.template_registry import render_file_set
+from src.workspace import (Workspace, add_to_workspace, plan_additions,
+                           print_addition_plan)
+from src.yaml import create_root_melos_yaml, create_root_pubspec_yaml
+
+
+def add_to_monorepo(monorepo_path: Path, input: Optional[UserInput]):
+    """
+    Adds the missing apps and packages to an existing monorepo.
+    Members that already exist are left alone, only changed pubspecs are written
+    and only the new members are bootstrapped.
+    """
+    output(f"Adding to existing monorepo at: {monorepo_path}", OutputType.INFO)
+    workspace = Workspace(monorepo_path)
+    project_name = workspace.root_pubspec["name"]
+    if input is None:
+        input = take_addition_input(project_name)
+    elif input.project_name != project_name:
+        # the manifest's default packages are named after its project
+        output(
+            f"Manifest is for project '{input.project_name}', but the monorepo "
+            f"at {monorepo_path} is '{project_name}'.",
+            OutputType.ERROR,
+        )
+        sys.exit(1)
+
+    plan = plan_additions(workspace, input.apps, input.packages)
+    if plan.conflicts:
+        output(
+            f"Package names already in use: {', '.join(plan.conflicts)}",
+            OutputType.ERROR,
+        )
+        sys.exit(1)
+    print_addition_plan(plan)
+    if plan.is_empty():
+        return
+
+    if not create_flutter_templates(
+        monorepo_path, plan.new_apps, plan.new_packages
+    ):
+        sys.exit(1)
+    workspace.add_members(input.apps, input.packages)
+    written = workspace.flush()
+    output(f"Updated {written} pubspec files.", OutputType.SUCCESS)
+
+    # only the new members need resolving, the rest of the workspace is unchanged
+    if not melos_command(
+        monorepo_path, ["bs"], packages=plan.new_apps + plan.new_packages
+    ):
+        sys.exit(1)
+    print_share_summary()
+    print_emit_summary()
+
+
+def monorepo_steps(monorepo_path: Path, input: UserInput) -> List[Step]:
+    """
+    The steps that scaffold a new monorepo, with the resources each needs and produces
+    """
+    project_name = input.project_name
+    res_package = project_name + "_resources"
+    res_package_path = monorepo_path / "packages" / res_package
+    members = [input.apps, input.packages]
+
+    def add_root_dependencies():
+        register_dependency(monorepo_path, "melos", DependencyKind.DEV)
+        return flush_dependencies(monorepo_path)
+
+    def add_resource_dependencies():
+        register_localization_dependencies(res_package_path)
+        register_dependency(res_package_path, "google_fonts")
+        return flush_dependencies(res_package_path)
+
+    def create_resource_files():
+        output("Creating resource package sources...", OutputType.INFO)
+        render_file_set("resources", res_package_path, {"project_name": project_name})
+
+    return [
+        Step(
+            "root_pubspec",
+            lambda: create_root_pubspec_yaml(monorepo_path, project_name),
+            produces=["root_pubspec"],
+            inputs=project_name,
+        ),
+        Step(
+            "melos_yaml",
+            lambda: create_root_melos_yaml(
+                monorepo_path, project_name, input.packages
+            ),
+            produces=["melos_yaml"],
+            inputs=[project_name, input.packages],
+        ),
+        Step(
+            "root_dependencies",
+            add_root_dependencies,
+            needs=["root_pubspec"],
+            produces=["root_dependencies"],
+            inputs=["melos"],
+        ),
+        Step(
+            "create_templates",
+            lambda: create_flutter_templates(
+                monorepo_path, input.apps, input.packages
+            ),
+            produces=["apps", "packages"],
+            inputs=members,
+        ),
+        Step(
+            "workspace",
+            lambda: add_to_workspace(monorepo_path, input.apps, input.packages),
+            needs=["root_dependencies", "apps", "packages"],
+            produces=["workspace"],
+            inputs=members,
+        ),
+        Step(
+            "resource_dependencies",
+            add_resource_dependencies,
+            needs=["workspace"],
+            produces=["resource_dependencies"],
+            inputs=res_package,
+        ),
+        Step(
+            "localization_files",
+            lambda: create_localization_files(
+                project_name, res_package, monorepo_path, input.apps, input.locales
+            ),
+            needs=["apps", "packages"],
+            produces=["arb_files"],
+            inputs=[project_name, input.apps, input.locales],
+        ),
+        Step(
+            "resource_files",
+            create_resource_files,
+            needs=["packages"],
+            produces=["resource_files"],
+            inputs=project_name,
+        ),
+        Step(
+            "bootstrap",
+            lambda: melos_command(monorepo_path, ["bs"]),
+            needs=["melos_yaml", "workspace", "resource_dependencies"],
+            produces=["bootstrap"],
+            inputs=members,
+        ),
+        Step(
+            "generate_localizations",
+            lambda: generate_localizations(monorepo_path),
+            needs=["arb_files"],
+            produces=["localizations"],
+            inputs=[members, input.locales],
+        ),
+        Step(
+            "pub_get",
+            lambda: pub_get(monorepo_path),
+            needs=["bootstrap", "localizations", "resource_files"],
+            inputs=members,
+        ),
+    ]
+
+
+def create_monorepo(
+    input: UserInput, resume: bool = False, golden: Optional[Path] = None
+):
+    """
+    Creates a new monorepo in the current directory.
+    With resume, an interrupted scaffold continues from its failed step.
+    With golden, the monorepo is extracted from a golden archive instead.
+    """
+    project_name = input.project_name
+    if project_name is None:
+        return
+    monorepo_path = Path.cwd() / project_name
+    resuming = resume and StepJournal.exists(monorepo_path)
+    try:
+        monorepo_path.mkdir(parents=True, exist_ok=resuming)
+    except FileExistsError:
+        output(f"Folder '{project_name}' already exists.", OutputType.ERROR)
+        if StepJournal.exists(monorepo_path):
+            output("Run again with --resume to continue it.", OutputType.INFO)
+        sys.exit(1)
+
+    if resuming:
+        output(f"Resuming setup in: {monorepo_path}", OutputType.INFO)
+    else:
+        output(f"Created folder: {monorepo_path}", OutputType.SUCCESS)
+
+    if golden is not None:
+        if not scaffold_from_golden(golden, monorepo_path, input):
+            output("Monorepo setup failed", OutputType.ERROR)
+            sys.exit(1)
+        print_share_summary()
+        print_emit_summary()
+        return
+
+    journal = StepJournal(monorepo_path, resume=resuming)
+    if not run_steps(monorepo_steps(monorepo_path, input), journal=journal):
+        output("Monorepo setup failed", OutputType.ERROR)
+        output("Run again with --resume to continue it.", OutputType.INFO)
+        sys.exit(1)
+    print_share_summary()
+    print_emit_summary()
+
+
+def export_golden(archive_path: Path, locales: List[str]) -> bool:
+    """
+    Scaffolds a monorepo with the golden names in a temporary directory and
+    saves it as a golden archive, which `--golden` extracts into new monorepos.
+
+    Args:
+        archive_path: The .tar.gz file to write.
+        locales: The locales of the golden monorepo.
+    Returns:
+        True if the archive was written.
+    """
+    with tempfile.TemporaryDirectory() as build_dir:
+        monorepo_path = Path(build_dir) / GOLDEN_PROJECT
+        monorepo_path.mkdir()
+        output(f"Scaffolding the golden monorepo in {monorepo_path}", OutputType.INFO)
+        if not run_steps(monorepo_steps(monorepo_path, golden_input(locales))):
+            output("Golden monorepo setup failed", OutputType.ERROR)
+            return False
+        count = write_golden_archive(monorepo_path, archive_path, locales)
+    output(f"Wrote {count} files to {archive_path}", OutputType.SUCCESS)
+    return True
@@ -0,0 +1,431 @@
+import functools
+import math
+import os
+import random
+import signal
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Dict, Iterator, List, Optional, Set
+
+from src.command_stats import record_command
+from src.output_util import OutputType, output, output_lines
+from src.profiler import ProfileEvent, is_profiling, now, record_event, rusage_rss_kb
+from src.progress_util import Task, finish_task, start_task
+
+# Lines of a failed command's output that are printed
+FAILURE_LINES = 20
+
+
+@dataclass(frozen=True)
+class CommandPolicy:
+    """
+    How long a type of command may run and whether it is retried.
+    """
+
+    timeout: float
+    # extra attempts after a timeout or a transient failure
+    retries: int = 0
+
+
+# Timeouts in seconds by command type (see command_name); pub operations
+# go over the network and are retried unless they run --offline
+COMMAND_POLICIES = {
+    "flutter pub add": CommandPolicy(300, retries=2),
+    "flutter pub get": CommandPolicy(300, retries=2),
+    "dart pub cache": CommandPolicy(300, retries=2),
+    "dart pub global": CommandPolicy(300, retries=2),
+    "melos bs": CommandPolicy(900, retries=1),
+    "melos bootstrap": CommandPolicy(900, retries=1),
+    "flutter create": CommandPolicy(300),
+    "flutter gen-l10n": CommandPolicy(300),
+    "flutter --version": CommandPolicy(120),
+    "dart --version": CommandPolicy(60),
+    "melos --version": CommandPolicy(60),
+    "git diff": CommandPolicy(60),
+}
+DEFAULT_POLICY = CommandPolicy(600)
+# Environment variable that multiplies every timeout, e.g. 3 on slow agents
+TIMEOUT_SCALE_VARIABLE = "MONO_PY_TIMEOUT_SCALE"
+# pub exits with EX_UNAVAILABLE or EX_TEMPFAIL (sysexits.h) when the package
+# server cannot be reached; other failures are not retried
+TRANSIENT_EXIT_CODES = {69, 75}
+# Seconds before the first retry, doubled for every further retry
+RETRY_BACKOFF = 2.0
+# Seconds the output of a killed command is still read for
+READER_GRACE = 1.0
+
+
+class CommandCancelled(subprocess.SubprocessError):
+    """
+    Raised by run_command when its CancelScope was cancelled.
+    """
+
+    def __init__(self, cmd: List[str]):
+        super().__init__(f"Command {cmd} was cancelled")
+        self.cmd = cmd
+
+
+class CancelScope:
+    """
+    Cancels the commands of a group of tasks together: cancel() kills the
+    commands that are running in the scope and makes new ones fail at once.
+    Threads join a scope with `with cancel_scope(scope):`. A scope created
+    with a parent is cancelled together with it.
+    """
+
+    def __init__(self, parent: Optional["CancelScope"] = None):
+        self.event = threading.Event()
+        self._processes: Set[subprocess.Popen] = set()
+        self._children: List["CancelScope"] = []
+        self._lock = threading.Lock()
+        if parent is not None:
+            parent._add_child(self)
+
+    def cancel(self) -> None:
+        with self._lock:
+            self.event.set()
+            processes = list(self._processes)
+            children = list(self._children)
+        for process in processes:
+            _kill(process)
+        for child in children:
+            child.cancel()
+
+    def cancelled(self) -> bool:
+        return self.event.is_set()
+
+    def _add_child(self, child: "CancelScope") -> None:
+        with self._lock:
+            self._children.append(child)
+            cancelled = self.event.is_set()
+        if cancelled:
+            child.cancel()
+
+    def _register(self, process: subprocess.Popen) -> bool:
+        with self._lock:
+            if self.event.is_set():
+                return False
+            self._processes.add(process)
+            return True
+
+    def _unregister(self, process: subprocess.Popen) -> None:
+        with self._lock:
+            self._processes.discard(process)
+
+
+_scope = threading.local()
+# every running command, killed together on Ctrl+C
+_running: Set[subprocess.Popen] = set()
+_running_lock = threading.Lock()
+
+
+@contextmanager
+def cancel_scope(scope: CancelScope) -> Iterator[CancelScope]:
+    """
+    Runs the commands started by this thread in a CancelScope.
+    """
+    previous = current_scope()
+    _scope.current = scope
+    try:
+        yield scope
+    finally:
+        _scope.current = previous
+
+
+def current_scope() -> Optional[CancelScope]:
+    """
+    The CancelScope of the calling thread, if any.
+    """
+    return getattr(_scope, "current", None)
+
+
+def kill_running_commands() -> None:
+    """
+    Kills every running command. Commands run in process groups of their own,
+    so Ctrl+C on the terminal does not reach them.
+    """
+    with _running_lock:
+        processes = list(_running)
+    for process in processes:
+        _kill(process)
+
+
+def install_interrupt_handler() -> None:
+    """
+    Makes Ctrl+C kill the running commands before raising KeyboardInterrupt.
+    Must be called from the main thread.
+    """
+
+    def interrupt(signum, frame):
+        kill_running_commands()
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGINT, interrupt)
+
+
+def command_name(cmd: List[str]) -> str:
+    """
+    Short name of a command for reports, e.g. "flutter pub add".
+    """
+    words = cmd[:1] + [part for part in cmd[1:3] if not part.startswith("-")]
+    if len(words) == 1:
+        words += cmd[1:2]
+    return " ".join(words)
+
+
+def command_policy(name: str) -> CommandPolicy:
+    return COMMAND_POLICIES.get(name, DEFAULT_POLICY)
+
+
+@functools.lru_cache(maxsize=None)
+def _timeout_scale(value: Optional[str]) -> float:
+    if value is None or not value.strip():
+        return 1.0
+    try:
+        scale = float(value)
+    except ValueError:
+        scale = 0.0
+    # rejects NaN as well
+    if not scale > 0 or math.isinf(scale):
+        output(
+            f"Ignoring {TIMEOUT_SCALE_VARIABLE}={value!r}, it must be a number "
+            "greater than 0.",
+            OutputType.INFO,
+        )
+        return 1.0
+    return scale
+
+
+def command_timeout(name: str) -> float:
+    """
+    The timeout of a command type in seconds, after MONO_PY_TIMEOUT_SCALE.
+    """
+    scale = _timeout_scale(os.environ.get(TIMEOUT_SCALE_VARIABLE))
+    return command_policy(name).timeout * scale
+
+
+def run_command(
+    cmd: List[str],
+    cwd: Optional[Path] = None,
+    check: bool = True,
+    capture_output: bool = True,
+    text: bool = False,
+    env: Optional[Dict[str, str]] = None,
+    label: Optional[str] = None,
+    timeout: Optional[float] = None,
+) -> subprocess.CompletedProcess:
+    """
+    Runs an external command like `subprocess.run`.
+    `env` holds variables added to the current environment.
+
+    With capture_output, stdout and stderr are read line by line into a ring
+    buffer of the last TAIL_LINES lines, which drives the live progress view.
+    The result holds only those lines, and when the command fails the last
+    FAILURE_LINES of them are printed under its label.
+
+    The command and its child processes are killed after the timeout of its
+    type (COMMAND_POLICIES), or `timeout` seconds when given. Commands with
+    retries are run again with exponential backoff after a timeout or a
+    transient exit code, unless they run --offline. Every run is recorded
+    for the duration percentiles of `command-stats`.
+
+    When profiling is enabled, the wall time, CPU time and peak RSS of the
+    child process are recorded.
+
+    Raises:
+        subprocess.CalledProcessError: If check is True and the command fails.
+        subprocess.TimeoutExpired: If the last attempt timed out.
+        CommandCancelled: If the CancelScope of the thread was cancelled.
+        FileNotFoundError: If the executable is not found.
+    """
+    if env is not None:
+        env = {**os.environ, **env}
+    name = command_name(cmd)
+    if label is None:
+        label = name + (f" ({Path(cwd).resolve().name})" if cwd else "")
+    if timeout is None:
+        timeout = command_timeout(name)
+    retries = 0 if "--offline" in cmd else command_policy(name).retries
+
+    for attempt in range(retries + 1):
+        if attempt:
+            delay = RETRY_BACKOFF * 2 ** (attempt - 1) * random.uniform(0.5, 1.0)
+            output(
+                f"Retrying {label} in {delay:.1f}s "
+                f"(attempt {attempt + 1} of {retries + 1})",
+                OutputType.INFO,
+            )
+            scope = current_scope()
+            if scope is None:
+                time.sleep(delay)
+            elif scope.event.wait(delay):
+                raise CommandCancelled(cmd)
+        result = _run_once(cmd, cwd, capture_output, text, env, label, timeout)
+        if isinstance(result, subprocess.TimeoutExpired):
+            if attempt < retries:
+                continue
+            raise result
+        if result.returncode in TRANSIENT_EXIT_CODES and attempt < retries:
+            continue
+        break
+
+    if check:
+        result.check_returncode()
+    return result
+
+
+def _run_once(
+    cmd: List[str],
+    cwd: Optional[Path],
+    capture_output: bool,
+    text: bool,
+    env: Optional[Dict[str, str]],
+    label: str,
+    timeout: float,
+):
+    """
+    Runs a command once.
+
+    Returns:
+        The CompletedProcess, or a TimeoutExpired if it was killed.
+    """
+    scope = current_scope()
+    if scope is not None and scope.cancelled():
+        raise CommandCancelled(cmd)
+
+    pipe = subprocess.PIPE if capture_output else None
+    start = now()
+    # a process group of its own, so a timeout also kills the tool's children
+    process = subprocess.Popen(
+        cmd,
+        cwd=cwd,
+        stdout=pipe,
+        stderr=pipe,
+        env=env,
+        start_new_session=os.name == "posix",
+    )
+    with _running_lock:
+        _running.add(process)
+    if scope is not None and not scope._register(process):
+        _kill(process)
+    timed_out = threading.Event()
+
+    def on_timeout() -> None:
+        timed_out.set()
+        _kill(process)
+
+    deadline = time.monotonic() + timeout
+    timer = threading.Timer(timeout, on_timeout)
+    timer.daemon = True
+    timer.start()
+
+    task = start_task(label) if capture_output else None
+    readers = [
+        threading.Thread(target=_read_lines, args=(stream, name, task), daemon=True)
+        for name, stream in (("stdout", process.stdout), ("stderr", process.stderr))
+        if stream is not None
+    ]
+    for reader in readers:
+        reader.start()
+
+    usage = None
+    try:
+        if is_profiling() and hasattr(os, "wait4"):
+            # os.wait4 also returns the resource usage of that single child
+            _, status, usage = os.wait4(process.pid, 0)
+            process.returncode = os.waitstatus_to_exitcode(status)
+        else:
+            process.wait()
+    finally:
+        if process.returncode is None:
+            _kill(process)
+            process.wait()
+        # a child the command left running can hold its output open; the
+        # timer kills it with the process group at the deadline
+        for reader in readers:
+            reader.join(max(deadline - time.monotonic(), 0) + READER_GRACE)
+        timer.cancel()
+        with _running_lock:
+            _running.discard(process)
+        if scope is not None:
+            scope._unregister(process)
+        if any(reader.is_alive() for reader in readers):
+            # the child left the process group, stop waiting for its output
+            timed_out.set()
+        else:
+            for stream in (process.stdout, process.stderr):
+                if stream is not None:
+                    stream.close()
+        if task is not None:
+            finish_task(task)
+
+    wall = now() - start
+    name = command_name(cmd)
+    if usage is not None:
+        record_event(
+            ProfileEvent(
+                name=name,
+                category="process",
+                start=start,
+                wall=wall,
+                cpu=usage.ru_utime + usage.ru_stime,
+                max_rss_kb=rusage_rss_kb(usage.ru_maxrss),
+                thread_id=threading.get_ident(),
+                detail={"cmd": " ".join(cmd), "cwd": str(cwd or ".")},
+            )
+        )
+
+    if scope is not None and scope.cancelled():
+        output(f"{label} cancelled", OutputType.INFO)
+        raise CommandCancelled(cmd)
+
+    if timed_out.is_set():
+        outcome = "timeout"
+    else:
+        outcome = "ok" if process.returncode == 0 else "failed"
+    record_command(name, wall, outcome)
+
+    stdout = stderr = None
+    if task is not None:
+        stdout, stderr = task.text("stdout"), task.text("stderr")
+        if not text:
+            stdout, stderr = stdout.encode(), stderr.encode()
+        if timed_out.is_set():
+            _print_failure(task, f"timed out after {timeout:.0f}s")
+        elif process.returncode != 0:
+            _print_failure(task, f"exited with code {process.returncode}")
+    elif timed_out.is_set():
+        output(f"{label} timed out after {timeout:.0f}s", OutputType.ERROR)
+
+    if timed_out.is_set():
+        return subprocess.TimeoutExpired(cmd, timeout, stdout, stderr)
+    return subprocess.CompletedProcess(cmd, process.returncode, stdout, stderr)
+
+
+def _kill(process: subprocess.Popen) -> None:
+    """
+    Kills a command and every process it started.
+    """
+    try:
+        if os.name == "posix":
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def _read_lines(stream: IO[bytes], name: str, task: Task) -> None:
+    for line in iter(stream.readline, b""):
+        task.add_line(name, line.decode("utf-8", errors="replace"))
+
+
+def _print_failure(task: Task, reason: str) -> None:
+    lines = task.tail(FAILURE_LINES)
+    output(f"{task.label} {reason}", OutputType.ERROR)
+    if lines:
+        output_lines(lines)
@@ -0,0 +1,206 @@
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from src.output_util import OutputType, output, output_lines
+
+
+@dataclass
+class ProfileEvent:
+    """
+    A timed pipeline step, template creation or subprocess
+    """
+
+    name: str
+    category: str
+    start: float
+    wall: float
+    cpu: Optional[float] = None
+    # peak RSS of a subprocess
+    max_rss_kb: Optional[int] = None
+    # how much this process's peak RSS rose during a step or span; concurrent
+    # spans share the process, so the growth is attributed to each of them
+    rss_growth_kb: Optional[int] = None
+    thread_id: int = 0
+    detail: Dict[str, str] = field(default_factory=dict)
+
+
+_enabled = False
+_events: List[ProfileEvent] = []
+_lock = threading.Lock()
+_origin = time.perf_counter()
+
+
+def enable_profiling() -> None:
+    global _enabled
+    _enabled = True
+
+
+def is_profiling() -> bool:
+    return _enabled
+
+
+def now() -> float:
+    """
+    Seconds since the profiler was loaded, the time base of every event.
+    """
+    return time.perf_counter() - _origin
+
+
+def rusage_rss_kb(max_rss: int) -> int:
+    """
+    Converts ru_maxrss to kilobytes (macOS reports bytes).
+    """
+    return max_rss // 1024 if sys.platform == "darwin" else max_rss
+
+
+def _self_rss_kb() -> Optional[int]:
+    if resource is None:
+        return None
+    return rusage_rss_kb(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def record_event(event: ProfileEvent) -> None:
+    if not _enabled:
+        return
+    with _lock:
+        _events.append(event)
+
+
+@contextmanager
+def profile_span(
+    name: str, category: str = "step", detail: Optional[Dict[str, str]] = None
+) -> Iterator[None]:
+    """
+    Records wall time, CPU time of the current thread and the growth of the
+    process's peak RSS during the block (ru_maxrss is a process-wide
+    high-water mark, so it cannot be measured per block).
+    Does nothing unless profiling is enabled.
+    """
+    if not _enabled:
+        yield
+        return
+
+    start = now()
+    cpu_start = time.thread_time()
+    rss_start = _self_rss_kb()
+    try:
+        yield
+    finally:
+        record_event(
+            ProfileEvent(
+                name=name,
+                category=category,
+                start=start,
+                wall=now() - start,
+                cpu=time.thread_time() - cpu_start,
+                rss_growth_kb=None if rss_start is None else _self_rss_kb() - rss_start,
+                thread_id=threading.get_ident(),
+                detail=detail or {},
+            )
+        )
+
+
+def events() -> List[ProfileEvent]:
+    with _lock:
+        return list(_events)
+
+
+def print_profile_summary() -> None:
+    """
+    Prints the recorded events grouped by category and name, most expensive first.
+    """
+    groups: Dict[tuple, List[ProfileEvent]] = {}
+    for event in events():
+        groups.setdefault((event.category, event.name), []).append(event)
+
+    if not groups:
+        output("No profile data recorded", OutputType.INFO)
+        return
+
+    rows = []
+    for (category, name), group in groups.items():
+        cpu_values = [e.cpu for e in group if e.cpu is not None]
+        rss_values = [e.max_rss_kb for e in group if e.max_rss_kb is not None]
+        growth_values = [
+            e.rss_growth_kb for e in group if e.rss_growth_kb is not None
+        ]
+        rows.append(
+            (
+                category,
+                name,
+                len(group),
+                sum(e.wall for e in group),
+                sum(cpu_values) if cpu_values else None,
+                max(rss_values) / 1024 if rss_values else None,
+                max(growth_values) / 1024 if growth_values else None,
+            )
+        )
+    rows.sort(key=lambda row: row[3], reverse=True)
+
+    def fmt(value: Optional[float], spec: str) -> str:
+        # the width of spec without its precision, e.g. ">9" for ">9.3f"
+        return format("-", spec.split(".")[0]) if value is None else format(value, spec)
+
+    name_width = max(len(row[1]) for row in rows)
+    output("Profile (sorted by total wall time):", OutputType.INFO)
+    # child peak MB: peak RSS of a subprocess; RSS growth MB: how much the
+    # peak RSS of this process rose during a step
+    lines = [
+        f"{'category':<10} {'name':<{name_width}} {'count':>5} "
+        f"{'wall s':>9} {'cpu s':>9} {'child peak MB':>13} {'RSS growth MB':>13}"
+    ]
+    for category, name, count, wall, cpu, rss, growth in rows:
+        lines.append(
+            f"{category:<10} {name:<{name_width}} {count:>5} "
+            f"{wall:>9.3f} {fmt(cpu, '>9.3f')} {fmt(rss, '>13.1f')} "
+            f"{fmt(growth, '>13.1f')}"
+        )
+    output_lines(lines)
+    peak = _self_rss_kb()
+    if peak is not None:
+        output(f"Process peak RSS: {peak / 1024:.1f} MB", OutputType.INFO)
+
+
+def write_chrome_trace(trace_path: Path) -> None:
+    """
+    Writes the recorded events in the Chrome trace-event format
+    (open with chrome://tracing or https://ui.perfetto.dev).
+    """
+    pid = os.getpid()
+    trace_events = []
+    for event in events():
+        args = dict(event.detail)
+        if event.cpu is not None:
+            args["cpu_s"] = round(event.cpu, 6)
+        if event.max_rss_kb is not None:
+            args["peak_rss_kb"] = event.max_rss_kb
+        if event.rss_growth_kb is not None:
+            args["rss_growth_kb"] = event.rss_growth_kb
+        trace_events.append(
+            {
+                "name": event.name,
+                "cat": event.category,
+                "ph": "X",
+                "ts": round(event.start * 1e6),
+                "dur": round(event.wall * 1e6),
+                "pid": pid,
+                "tid": event.thread_id,
+                "args": args,
+            }
+        )
+
+    with trace_path.open("w") as f:
+        json.dump({"traceEvents": trace_events, "displayTimeUnit": "ms"}, f)
+    output(f"Wrote Chrome trace to {trace_path}", OutputType.SUCCESS)
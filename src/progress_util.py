@@ -0,0 +1,103 @@
+import os
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, List, Optional, Tuple
+
+from src.output_util import redraw_live_block, set_live_block
+
+# Lines of output kept per task; older lines are dropped
+TAIL_LINES = 200
+
+MAX_VISIBLE_TASKS = 8
+REFRESH_INTERVAL = 0.1
+SPINNER = "⠋⠙⠹⠸⠼⠴⠦⠧⠇⠏"
+
+
+@dataclass
+class Task:
+    """
+    A running command and the last lines it printed.
+    """
+
+    label: str
+    start: float = field(default_factory=time.monotonic)
+    lines: Deque[Tuple[str, str]] = field(
+        default_factory=lambda: deque(maxlen=TAIL_LINES)
+    )
+
+    def add_line(self, stream: str, line: str) -> None:
+        # deque.append is atomic, reader threads need no lock
+        self.lines.append((stream, line.rstrip("\r\n")))
+
+    def text(self, stream: str) -> str:
+        return "".join(line + "\n" for name, line in self.lines if name == stream)
+
+    def tail(self, count: int) -> List[str]:
+        return [line for _, line in list(self.lines)[-count:]]
+
+
+_tasks: List[Task] = []
+_lock = threading.Lock()
+_live = False
+_refresher: Optional[threading.Thread] = None
+
+
+def enable_live_progress() -> None:
+    """
+    Shows the running commands below the messages while they run.
+    Only enabled on a terminal.
+    """
+    global _live
+    if sys.stdout.isatty() and os.environ.get("TERM") != "dumb":
+        _live = True
+        set_live_block(_render)
+
+
+def start_task(label: str) -> Task:
+    global _refresher
+    task = Task(label)
+    with _lock:
+        _tasks.append(task)
+        if _live and _refresher is None:
+            _refresher = threading.Thread(target=_refresh_loop, daemon=True)
+            _refresher.start()
+    return task
+
+
+def finish_task(task: Task) -> None:
+    with _lock:
+        _tasks.remove(task)
+    if _live:
+        redraw_live_block()
+
+
+def _render() -> List[str]:
+    with _lock:
+        tasks = list(_tasks)
+    if not tasks:
+        return []
+
+    now = time.monotonic()
+    frame = SPINNER[int(now / REFRESH_INTERVAL) % len(SPINNER)]
+    lines = []
+    for task in tasks[:MAX_VISIBLE_TASKS]:
+        last_line = task.tail(1)
+        status = last_line[0].strip() if last_line else ""
+        lines.append(f"{frame} {task.label} {now - task.start:5.1f}s  {status}")
+    if len(tasks) > MAX_VISIBLE_TASKS:
+        lines.append(f"  ... {len(tasks) - MAX_VISIBLE_TASKS} more running")
+    return lines
+
+
+def _refresh_loop() -> None:
+    global _refresher
+    while True:
+        time.sleep(REFRESH_INTERVAL)
+        with _lock:
+            if not _tasks:
+                _refresher = None
+                return
+        redraw_live_block()
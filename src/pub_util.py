@@ -0,0 +1,72 @@
+import os
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from src.output_util import OutputType, output
+from src.process_util import run_command
+
+# Packages the scaffolder always adds to a new monorepo
+SCAFFOLD_PACKAGES = ["melos", "intl", "google_fonts", "flutter_riverpod"]
+
+_offline = False
+
+
+def set_offline(enabled: bool) -> None:
+    """
+    Makes every pub command resolve from the local pub cache only.
+    """
+    global _offline
+    _offline = enabled
+
+
+def is_offline() -> bool:
+    return _offline
+
+
+def pub_flags() -> List[str]:
+    """
+    Extra flags for `pub add`, `pub get` and `melos bootstrap`.
+    """
+    return ["--offline"] if _offline else []
+
+
+def cache_package(package_name: str) -> bool:
+    """
+    Downloads the latest version of a package into the pub cache.
+
+    Returns:
+        True if the command succeeded, False otherwise.
+    """
+    try:
+        run_command(
+            ["dart", "pub", "cache", "add", package_name],
+            check=True,
+            capture_output=True,
+        )
+        output(f"Cached {package_name}", OutputType.SUCCESS)
+        return True
+    except subprocess.SubprocessError:
+        output(f"Failed to cache {package_name}", OutputType.ERROR)
+        return False
+    except FileNotFoundError:
+        output(
+            "Dart SDK not found. Make sure Dart is installed and in your PATH.",
+            OutputType.ERROR,
+        )
+        return False
+
+
+def prime_pub_cache(packages: List[str] = SCAFFOLD_PACKAGES) -> bool:
+    """
+    Pre-downloads the packages the scaffolder adds, so later runs can use --offline.
+    Packages are fetched from PUB_HOSTED_URL when it is set.
+
+    Returns:
+        True if every package was cached, False otherwise.
+    """
+    hosted_url = os.environ.get("PUB_HOSTED_URL", "https://pub.dev")
+    output(f"Priming pub cache from {hosted_url}", OutputType.INFO)
+    with ThreadPoolExecutor() as executor:
+        results = list(executor.map(cache_package, packages))
+    return all(results)
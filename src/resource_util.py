@@ -0,0 +1,52 @@
+import os
+from typing import Optional
+
+# Peak memory of one `flutter create` (Flutter tool + Dart VM)
+FLUTTER_PROCESS_MEMORY = 1536 * 1024 * 1024
+
+
+def cpu_count() -> int:
+    """
+    Returns the number of CPUs this process may run on.
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def available_memory() -> Optional[int]:
+    """
+    Returns the memory available for new processes in bytes, if known.
+    """
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def worker_count(
+    jobs: Optional[int] = None, memory_per_worker: int = FLUTTER_PROCESS_MEMORY
+) -> int:
+    """
+    Returns how many memory-heavy tool processes can run at the same time.
+
+    Args:
+        jobs: An explicit limit (--jobs), used as is when given.
+        memory_per_worker: The peak memory of one worker in bytes.
+    """
+    if jobs:
+        return max(1, jobs)
+
+    workers = cpu_count()
+    memory = available_memory()
+    if memory is not None:
+        workers = min(workers, memory // memory_per_worker)
+    return max(1, workers)
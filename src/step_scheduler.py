@@ -0,0 +1,180 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from src.journal import StepJournal
+from src.output_util import OutputType, output
+from src.process_util import CancelScope, cancel_scope
+from src.profiler import profile_span
+
+DEFAULT_CONCURRENCY = os.cpu_count() or 1
+
+
+@dataclass
+class Step:
+    """
+    A unit of work in the scaffolding pipeline.
+
+    The step runs once every resource in `needs` has been produced by other
+    steps, and makes the resources in `produces` available when it succeeds.
+    A step fails when its action returns False or raises (including SystemExit).
+    `inputs` identifies what the step was run with, for the step journal.
+    """
+
+    name: str
+    action: Callable[[], Any]
+    needs: List[str] = field(default_factory=list)
+    produces: List[str] = field(default_factory=list)
+    inputs: Any = None
+
+
+def validate_steps(steps: List[Step]) -> bool:
+    """
+    Checks that every needed resource is produced by some step
+    and that the step graph has no cycles.
+    """
+    produced = {resource for step in steps for resource in step.produces}
+    for step in steps:
+        missing = set(step.needs) - produced
+        if missing:
+            output(
+                f"Step '{step.name}' needs {', '.join(sorted(missing))}, "
+                "which no step produces",
+                OutputType.ERROR,
+            )
+            return False
+
+    available: Set[str] = set()
+    remaining = list(steps)
+    while remaining:
+        ready = [step for step in remaining if set(step.needs) <= available]
+        if not ready:
+            names = ", ".join(step.name for step in remaining)
+            output(f"Steps have circular dependencies: {names}", OutputType.ERROR)
+            return False
+        for step in ready:
+            available.update(step.produces)
+            remaining.remove(step)
+    return True
+
+
+def finished_steps(steps: List[Step], journal: StepJournal) -> List[Step]:
+    """
+    Returns the steps that finished in an earlier run with the same inputs
+    and whose dependencies were all skipped as well.
+    """
+    producers: Dict[str, List[Step]] = {}
+    for step in steps:
+        for resource in step.produces:
+            producers.setdefault(resource, []).append(step)
+
+    finished: List[Step] = []
+    remaining = list(steps)
+    changed = True
+    while changed:
+        changed = False
+        for step in list(remaining):
+            upstream = [p for need in step.needs for p in producers[need]]
+            if any(p in remaining for p in upstream):
+                continue
+            remaining.remove(step)
+            changed = True
+            if journal.is_finished(step.name, step.inputs) and all(
+                p in finished for p in upstream
+            ):
+                finished.append(step)
+    return finished
+
+
+def run_steps(
+    steps: List[Step],
+    max_workers: int = DEFAULT_CONCURRENCY,
+    journal: Optional[StepJournal] = None,
+) -> bool:
+    """
+    Runs the steps as soon as their dependencies are met,
+    with at most `max_workers` steps running at the same time.
+    The first failure cancels the rest: steps that have not started are
+    dropped, the commands of running steps are killed, and run_steps
+    returns once every running step has stopped.
+
+    Args:
+        steps: The steps of the pipeline.
+        max_workers: The global concurrency limit.
+        journal: Records finished steps; steps it already has are skipped.
+    Returns:
+        True if every step succeeded, False otherwise.
+    """
+    if not validate_steps(steps):
+        return False
+
+    available: Set[str] = set()
+    pending = list(steps)
+    if journal is not None:
+        for step in finished_steps(steps, journal):
+            output(f"Skipping finished step '{step.name}'", OutputType.INFO)
+            pending.remove(step)
+            available.update(step.produces)
+    running: Dict[Future, Step] = {}
+    failed = False
+    scope = CancelScope()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while pending or running:
+            if not failed:
+                for step in [s for s in pending if set(s.needs) <= available]:
+                    pending.remove(step)
+                    running[executor.submit(_run_step, step, scope)] = step
+
+            if not running:
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                step = running.pop(future)
+                if future.cancelled():
+                    continue
+                if failed and not _finished_quietly(future):
+                    # killed by the cancellation, not a failure of its own
+                    output(f"Step '{step.name}' stopped", OutputType.INFO)
+                    continue
+                if _step_succeeded(step, future):
+                    available.update(step.produces)
+                    if journal is not None:
+                        journal.record(step.name, step.inputs)
+                    continue
+
+                failed = True
+                pending.clear()
+                for other in running:
+                    other.cancel()
+                output("Cancelling remaining steps after failure", OutputType.ERROR)
+                scope.cancel()
+
+    return not failed
+
+
+def _run_step(step: Step, scope: CancelScope) -> Any:
+    with cancel_scope(scope), profile_span(step.name, "step"):
+        return step.action()
+
+
+def _step_succeeded(step: Step, future: Future) -> bool:
+    try:
+        result = future.result()
+    except BaseException as e:
+        output(f"Step '{step.name}' failed: {e!r}", OutputType.ERROR)
+        return False
+
+    if result is False:
+        output(f"Step '{step.name}' failed", OutputType.ERROR)
+        return False
+    return True
+
+
+def _finished_quietly(future: Future) -> bool:
+    try:
+        return future.result() is not False
+    except BaseException:
+        return False
@@ -0,0 +1,237 @@
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set
+
+from src.case_util import snake_to_camel, snake_to_pascal, snake_to_title
+from src.constants import CACHE_DIR
+from src.object_store import (is_platform_file, object_store_dir,
+                              place_shared_file)
+from src.output_util import OutputType, output
+from src.process_util import run_command
+from src.toolchain import tool_info
+
+TEMPLATE_CACHE_DIR = CACHE_DIR / "templates"
+
+# Name used for the cached `flutter create` output. It is replaced with the
+# real app/package name (in all its case variants) when a snapshot is copied.
+PLACEHOLDER_NAME = "mono_py_template"
+
+# Entries that depend on the machine or on pub resolution and are never cached.
+SKIPPED_ENTRIES = {
+    ".dart_tool",
+    "build",
+    ".flutter-plugins",
+    ".flutter-plugins-dependencies",
+    "pubspec.lock",
+}
+
+_refresh = False
+_share_platform_files = False
+_refreshed: Set[str] = set()
+_locks: Dict[str, threading.Lock] = {}
+_locks_guard = threading.Lock()
+
+
+def set_refresh_template_cache(enabled: bool) -> None:
+    """
+    Rebuild every snapshot the first time it is requested in this run.
+
+    Args:
+        enabled: True to discard existing snapshots before using them.
+    """
+    global _refresh
+    _refresh = enabled
+
+
+def set_share_platform_files(enabled: bool) -> None:
+    """
+    Store the platform files that are the same in every app once in the
+    object store of the monorepo, and link the apps' files to it.
+    """
+    global _share_platform_files
+    _share_platform_files = enabled
+
+
+def platform_store_dir(monorepo_path: Path) -> Optional[Path]:
+    """
+    The object store for the platform files of new apps, None when they
+    are not shared.
+    """
+    return object_store_dir(monorepo_path) if _share_platform_files else None
+
+
+def flutter_sdk_version() -> str:
+    """
+    Returns the version of the Flutter SDK in PATH, or "unknown".
+    Read from the toolchain probe cache.
+    """
+    return tool_info("flutter").version or "unknown"
+
+
+def snapshot_key(template: str, platforms: Optional[List[str]] = None) -> str:
+    """
+    Builds the cache key for a template snapshot.
+
+    Args:
+        template: The `flutter create` template type (app or package).
+        platforms: The platforms passed to `flutter create`, None for the default set.
+    """
+    platform_key = "-".join(sorted(platforms)) if platforms else "default"
+    return f"flutter-{flutter_sdk_version()}_{template}_{platform_key}"
+
+
+def _key_lock(key: str) -> threading.Lock:
+    with _locks_guard:
+        return _locks.setdefault(key, threading.Lock())
+
+
+def get_template_snapshot(
+    template: str, platforms: Optional[List[str]] = None
+) -> Optional[Path]:
+    """
+    Returns the snapshot directory for the template, building it when missing.
+
+    Args:
+        template: The `flutter create` template type (app or package).
+        platforms: The platforms passed to `flutter create`, None for the default set.
+    Returns:
+        Path of the snapshot, or None if `flutter create` failed.
+    """
+    key = snapshot_key(template, platforms)
+    snapshot_path = TEMPLATE_CACHE_DIR / key
+
+    with _key_lock(key):
+        if _refresh and key not in _refreshed:
+            shutil.rmtree(snapshot_path, ignore_errors=True)
+            _refreshed.add(key)
+
+        if snapshot_path.exists():
+            return snapshot_path
+
+        output(f"Building template cache: {key}", OutputType.INFO)
+        TEMPLATE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cmd = ["flutter", "create", "--no-pub", "-t", template]
+        if platforms:
+            cmd.append(f"--platforms={','.join(platforms)}")
+        cmd.append(PLACEHOLDER_NAME)
+
+        with tempfile.TemporaryDirectory(dir=TEMPLATE_CACHE_DIR) as build_dir:
+            try:
+                run_command(cmd, cwd=Path(build_dir), check=True, capture_output=True)
+            except subprocess.SubprocessError:
+                output(f"Failed to build template cache: {key}", OutputType.ERROR)
+                return None
+            # rename is atomic, so a snapshot directory is always complete
+            try:
+                os.rename(Path(build_dir) / PLACEHOLDER_NAME, snapshot_path)
+            except OSError:
+                # another process (a second run, a batch worker) installed
+                # the same snapshot first; use that one
+                if not snapshot_path.is_dir():
+                    raise
+                output(
+                    f"Using the template cache another run built: {key}",
+                    OutputType.INFO,
+                )
+                return snapshot_path
+
+        output(f"Cached template: {key}", OutputType.SUCCESS)
+        return snapshot_path
+
+
+def name_replacer(names: Dict[str, str]) -> Callable[[str], str]:
+    """
+    Returns a function that replaces every placeholder name, in its snake,
+    title, Pascal and camel case variants, with the matching new name.
+
+    Args:
+        names: The new name of each placeholder, e.g. {"mono_py_template": "shop"}.
+    """
+    variants = {}
+    for placeholder, name in names.items():
+        variants[snake_to_title(placeholder)] = snake_to_title(name)
+        variants[snake_to_pascal(placeholder)] = snake_to_pascal(name)
+        variants[snake_to_camel(placeholder)] = snake_to_camel(name)
+        variants[placeholder] = name
+    # longest first, so a placeholder wins over a shorter one it starts with
+    alternatives = sorted(variants, key=len, reverse=True)
+    pattern = re.compile("|".join(re.escape(v) for v in alternatives))
+    return lambda text: pattern.sub(lambda m: variants[m.group(0)], text)
+
+
+def copy_template_snapshot(
+    snapshot_path: Path,
+    destination: Path,
+    name: str,
+    store_dir: Optional[Path] = None,
+) -> None:
+    """
+    Copies a snapshot to destination, renaming the placeholder identifiers
+    (pubspec name, Dart imports, Android/iOS bundle IDs, file and folder names).
+
+    Args:
+        snapshot_path: The cached snapshot directory.
+        destination: The directory of the new app or package.
+        name: The name of the new app or package.
+        store_dir: When given, platform files without the placeholder name
+            are placed from this object store instead of copied.
+    """
+    rename = name_replacer({PLACEHOLDER_NAME: name})
+
+    for root, dirs, files in os.walk(snapshot_path):
+        dirs[:] = [d for d in dirs if d not in SKIPPED_ENTRIES]
+        relative = Path(root).relative_to(snapshot_path)
+        target_dir = destination / rename(str(relative))
+        target_dir.mkdir(parents=True, exist_ok=True)
+
+        for file_name in files:
+            if file_name in SKIPPED_ENTRIES:
+                continue
+            source = Path(root) / file_name
+            target = target_dir / rename(file_name)
+            data = source.read_bytes()
+            try:
+                content = rename(data.decode("utf-8")).encode("utf-8")
+            except UnicodeDecodeError:
+                content = data
+
+            # unchanged by the rename, so the same in every app
+            if (
+                store_dir is not None
+                and content == data
+                and is_platform_file(relative / file_name)
+            ):
+                place_shared_file(store_dir, target, data, source.stat().st_mode)
+                continue
+            target.write_bytes(content)
+            shutil.copymode(source, target)
+
+
+def create_from_template_cache(
+    parent_path: Path,
+    name: str,
+    template: str,
+    platforms: Optional[List[str]] = None,
+) -> bool:
+    """
+    Creates an app or package by copying the cached `flutter create` output.
+
+    Args:
+        parent_path: The apps or packages directory.
+        name: The name of the app or package.
+        template: The `flutter create` template type (app or package).
+        platforms: The platforms passed to `flutter create`, None for the default set.
+    Returns:
+        True if the project was created, False otherwise.
+    """
+    snapshot_path = get_template_snapshot(template, platforms)
+    if snapshot_path is None:
+        return False
+    store_dir = platform_store_dir(parent_path.parent) if template == "app" else None
+    copy_template_snapshot(snapshot_path, parent_path / name, name, store_dir)
+    return True
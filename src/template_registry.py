@@ -0,0 +1,166 @@
+import re
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from src.case_util import snake_to_camel, snake_to_pascal, snake_to_title
+from src.emit_util import emit_file
+
+# Built-in templates, laid out as <set>/<output path>.tmpl
+PACKAGE_TEMPLATE_DIR = Path(__file__).resolve().parent / "template_files"
+TEMPLATE_SUFFIX = ".tmpl"
+
+# {{ name }} or {{ name|filter }}; anything else (e.g. a Dart map literal) is text
+PLACEHOLDER_REG = re.compile(r"\{\{\s*(\w+)\s*(?:\|\s*(\w+)\s*)?\}\}")
+
+FILTERS: Dict[str, Callable[[str], str]] = {
+    "pascal": snake_to_pascal,
+    "camel": snake_to_camel,
+    "title": snake_to_title,
+}
+
+_user_template_dir: Optional[Path] = None
+_compiled: Dict[Tuple[str, str], "CompiledTemplate"] = {}
+_file_sets: Dict[str, Dict[str, Path]] = {}
+_lock = threading.Lock()
+
+
+class CompiledTemplate:
+    """
+    A template split once into literal text and placeholders,
+    so rendering it is a single join.
+    """
+
+    def __init__(self, source: str, origin: str):
+        self.origin = origin
+        self._parts: List[Union[str, Tuple[str, Callable[[str], str]]]] = []
+
+        position = 0
+        for match in PLACEHOLDER_REG.finditer(source):
+            name, filter_name = match.groups()
+            if filter_name is not None and filter_name not in FILTERS:
+                raise ValueError(f"{origin}: unknown template filter '{filter_name}'")
+            self._parts.append(source[position : match.start()])
+            self._parts.append((name, FILTERS.get(filter_name, str)))
+            position = match.end()
+        self._parts.append(source[position:])
+
+    @property
+    def variables(self) -> List[str]:
+        return sorted({part[0] for part in self._parts if isinstance(part, tuple)})
+
+    def render(self, context: Dict[str, str]) -> str:
+        missing = [name for name in self.variables if name not in context]
+        if missing:
+            raise ValueError(
+                f"{self.origin}: no value for template variable(s) {', '.join(missing)}"
+            )
+        return "".join(
+            part if isinstance(part, str) else part[1](context[part[0]])
+            for part in self._parts
+        )
+
+
+def set_user_template_dir(path: Optional[Path]) -> None:
+    """
+    Adds a user template directory (--templates) with the same layout as
+    src/template_files. Its files replace built-in files with the same
+    relative path and may add new files and new sets.
+    """
+    global _user_template_dir
+    with _lock:
+        _user_template_dir = path
+        _compiled.clear()
+        _file_sets.clear()
+
+
+def template_dirs() -> List[Path]:
+    """
+    The template directories, later ones take precedence.
+    """
+    dirs = [PACKAGE_TEMPLATE_DIR]
+    if _user_template_dir is not None:
+        dirs.append(_user_template_dir)
+    return dirs
+
+
+def file_set(set_name: str) -> Dict[str, Path]:
+    """
+    Returns the templates of a set by their relative output path (a template
+    itself, e.g. "lib/app/{{app_name}}_app.dart").
+
+    Raises:
+        ValueError: If no template directory contains the set.
+    """
+    with _lock:
+        if set_name not in _file_sets:
+            files = {}
+            for template_dir in template_dirs():
+                set_dir = template_dir / set_name
+                for path in sorted(set_dir.rglob(f"*{TEMPLATE_SUFFIX}")):
+                    relative = path.relative_to(set_dir).as_posix()
+                    files[relative[: -len(TEMPLATE_SUFFIX)]] = path
+            if not files:
+                raise ValueError(f"Template set '{set_name}' not found")
+            _file_sets[set_name] = files
+        return _file_sets[set_name]
+
+
+def compiled_template(set_name: str, relative_path: str) -> CompiledTemplate:
+    """
+    Returns a template of a set, compiled on first use.
+    """
+    key = (set_name, relative_path)
+    with _lock:
+        template = _compiled.get(key)
+    if template is not None:
+        return template
+
+    source_path = file_set(set_name).get(relative_path)
+    if source_path is None:
+        raise ValueError(f"Template '{set_name}/{relative_path}' not found")
+    template = CompiledTemplate(source_path.read_text(), str(source_path))
+    with _lock:
+        return _compiled.setdefault(key, template)
+
+
+def _compiled_path(set_name: str, relative_path: str) -> CompiledTemplate:
+    key = (set_name, "path:" + relative_path)
+    with _lock:
+        if key not in _compiled:
+            origin = f"{set_name}/{relative_path}"
+            _compiled[key] = CompiledTemplate(relative_path, origin)
+        return _compiled[key]
+
+
+def render_template(set_name: str, relative_path: str, context: Dict[str, str]) -> str:
+    """
+    Renders one template of a set.
+
+    Args:
+        set_name: The template set, e.g. "resources".
+        relative_path: The unrendered output path of the template in the set.
+        context: The template variables, e.g. {"project_name": "shop"}.
+    """
+    return compiled_template(set_name, relative_path).render(context)
+
+
+def render_file_set(
+    set_name: str, target_dir: Path, context: Dict[str, str]
+) -> List[Path]:
+    """
+    Renders every template of a set, paths included, into a directory.
+
+    Args:
+        set_name: The template set, e.g. "app".
+        target_dir: The app or package the files are written into.
+        context: The template variables.
+    Returns:
+        The written files; files whose content did not change are left alone.
+    """
+    written = []
+    for relative_path in file_set(set_name):
+        target = target_dir / _compiled_path(set_name, relative_path).render(context)
+        if emit_file(target, render_template(set_name, relative_path, context)):
+            written.append(target)
+    return written
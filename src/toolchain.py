@@ -0,0 +1,214 @@
+import json
+import os
+import re
+import shutil
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from src.constants import CACHE_DIR
+from src.output_util import OutputType, output
+from src.process_util import run_command
+from src.profiler import profile_span
+
+TOOLCHAIN_CACHE_FILE = CACHE_DIR / "toolchain.json"
+
+VERSION_COMMANDS = {
+    "flutter": ["flutter", "--version", "--machine"],
+    "dart": ["dart", "--version"],
+    "melos": ["melos", "--version"],
+}
+
+INSTALL_HINTS = {
+    "flutter": "Install Flutter: https://docs.flutter.dev/get-started/install",
+    "dart": "Dart ships with Flutter, make sure flutter/bin is in your PATH.",
+    "melos": "Please install Melos first:\ndart pub global activate melos",
+}
+
+VERSION_REG = re.compile(r"\d+\.\d+\.\d+[\w.+-]*")
+
+_probed: Dict[str, "ToolInfo"] = {}
+_probe_lock = threading.Lock()
+
+
+@dataclass
+class ToolInfo:
+    """
+    A probed tool. `stamp` identifies the binary the version was read from.
+    """
+
+    name: str
+    path: Optional[str]
+    stamp: Optional[str]
+    version: Optional[str]
+
+    @property
+    def available(self) -> bool:
+        return self.path is not None and self.version is not None
+
+
+def binary_stamp(path: str) -> Optional[str]:
+    """
+    Builds the cache key of a binary from its resolved path and mtime.
+    For flutter the SDK version file is included, since `flutter upgrade`
+    does not always rewrite the launcher script.
+    """
+    real_path = Path(path).resolve()
+    version_file = real_path.parent / "cache" / "flutter.version.json"
+    try:
+        stamp = f"{real_path}:{real_path.stat().st_mtime_ns}"
+        if version_file.exists():
+            stamp += f"|{version_file.name}:{version_file.stat().st_mtime_ns}"
+    except OSError:
+        return None
+    return stamp
+
+
+def parse_version(tool: str, stdout: str) -> Optional[str]:
+    """
+    Reads the version from the output of a tool's version command.
+    """
+    if tool == "flutter":
+        try:
+            return json.loads(stdout[stdout.index("{"):])["frameworkVersion"]
+        except (ValueError, KeyError):
+            return None
+    match = VERSION_REG.search(stdout)
+    return match.group(0) if match else None
+
+
+def _probe_tool(tool: str, path: Optional[str], stamp: Optional[str]) -> ToolInfo:
+    if path is None:
+        return ToolInfo(tool, None, None, None)
+    try:
+        result = run_command(VERSION_COMMANDS[tool], check=True, text=True)
+        # older Dart SDKs print the version to stderr
+        version = parse_version(tool, result.stdout + result.stderr)
+    except (subprocess.SubprocessError, OSError):
+        version = None
+    return ToolInfo(tool, path, stamp, version)
+
+
+def _load_cache() -> Dict[str, ToolInfo]:
+    try:
+        with TOOLCHAIN_CACHE_FILE.open("r") as f:
+            return {name: ToolInfo(**info) for name, info in json.load(f).items()}
+    except (OSError, ValueError, TypeError):
+        return {}
+
+
+def _save_cache(tools: Dict[str, ToolInfo]) -> None:
+    try:
+        TOOLCHAIN_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = TOOLCHAIN_CACHE_FILE.with_name(
+            f"{TOOLCHAIN_CACHE_FILE.name}.{os.getpid()}.tmp"
+        )
+        with temp_path.open("w") as f:
+            json.dump(
+                {name: asdict(info) for name, info in tools.items()},
+                f,
+                indent=2,
+                sort_keys=True,
+            )
+        os.replace(temp_path, TOOLCHAIN_CACHE_FILE)
+    except OSError as e:
+        output(f"Could not write the toolchain cache: {e}", OutputType.INFO)
+
+
+def probe_toolchain(tools: Optional[List[str]] = None) -> Dict[str, ToolInfo]:
+    """
+    Finds flutter, dart and melos and reads their versions.
+
+    The versions are cached in the user cache directory, keyed by the binary
+    path and mtime, so warm runs start no version processes at all. Tools
+    that are not cached are probed in parallel.
+
+    Args:
+        tools: The tools to probe, all of VERSION_COMMANDS by default.
+    Returns:
+        The probed tools by name.
+    """
+    tools = tools or list(VERSION_COMMANDS)
+    with _probe_lock:
+        missing = [tool for tool in tools if tool not in _probed]
+        if missing:
+            _probed.update(_probe_missing(missing))
+        return {tool: _probed[tool] for tool in tools}
+
+
+def _probe_missing(tools: List[str]) -> Dict[str, ToolInfo]:
+    cache = _load_cache()
+    found = {}
+    stale = {}
+    for tool in tools:
+        path = shutil.which(tool)
+        stamp = binary_stamp(path) if path else None
+        cached = cache.get(tool)
+        if (
+            cached is not None
+            and cached.available
+            and cached.path == path
+            and cached.stamp == stamp
+        ):
+            found[tool] = cached
+        else:
+            stale[tool] = (path, stamp)
+
+    if not stale:
+        return found
+
+    with profile_span("toolchain probe", "step", {"tools": sorted(stale)}):
+        with ThreadPoolExecutor(max_workers=len(stale)) as executor:
+            futures = {
+                tool: executor.submit(_probe_tool, tool, path, stamp)
+                for tool, (path, stamp) in stale.items()
+            }
+            probed = {tool: future.result() for tool, future in futures.items()}
+
+    found.update(probed)
+    for tool, info in probed.items():
+        if info.available:
+            cache[tool] = info
+        else:
+            cache.pop(tool, None)
+    _save_cache(cache)
+    return found
+
+
+def tool_info(tool: str) -> ToolInfo:
+    """
+    Returns the (cached) probe result of a single tool.
+    """
+    return probe_toolchain([tool])[tool]
+
+
+def check_toolchain(required: List[str]) -> bool:
+    """
+    Preflight check run before any step touches the file system.
+
+    Probes every known tool at once, so later lookups are free, and reports
+    the required tools that are missing or do not run.
+
+    Args:
+        required: The tools the command needs.
+    Returns:
+        True if all required tools are available.
+    """
+    tools = probe_toolchain()
+    ok = True
+    for tool in required:
+        info = tools[tool]
+        if info.path is None:
+            output(f"{tool} is not installed. {INSTALL_HINTS[tool]}", OutputType.ERROR)
+            ok = False
+        elif info.version is None:
+            output(
+                f"'{info.path} {' '.join(VERSION_COMMANDS[tool][1:])}' failed. "
+                f"{INSTALL_HINTS[tool]}",
+                OutputType.ERROR,
+            )
+            ok = False
+    return ok
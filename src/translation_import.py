@@ -0,0 +1,384 @@
+import csv
+import itertools
+import json
+import queue
+import re
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from src.constants import L10N, LIB, TEMPLATE_LOCALE
+from src.emit_util import StagedFiles
+from src.manifest_util import LOCALE_REG
+from src.output_util import OutputType, output
+from src.yaml import load_yaml
+
+KEY_COLUMN = "key"
+DESCRIPTION_COLUMN = "description"
+
+# Rows buffered per locale writer; bounds the memory used for large tables
+QUEUE_SIZE = 256
+
+# Simple ({name}) and ICU ({name, plural, ...}) placeholders
+PLACEHOLDER_REG = re.compile(r"\{\s*(\w+)\s*[,}]")
+
+_END = object()
+_ABORT = object()
+
+
+@dataclass
+class LocaleReport:
+    locale: str
+    written: int = 0
+    missing: List[str] = field(default_factory=list)
+    mismatched: List[str] = field(default_factory=list)
+
+
+def resource_l10n_dir(root_path: Path) -> Path:
+    """
+    The ARB folder of the monorepo's resources package.
+    """
+    project_name = load_yaml(root_path / "pubspec.yaml")["name"]
+    return root_path / "packages" / f"{project_name}_resources" / LIB / L10N
+
+
+def read_table(table_path: Path) -> Tuple[List[str], Iterator[Dict[str, str]]]:
+    """
+    Opens a translation table and returns its locales and a row iterator.
+
+    CSV, TSV and JSON Lines tables are streamed row by row; a .json table
+    ({"key": {"en": "...", "ne": "..."}}) is loaded at once.
+    Every row has a "key", an optional "description" and one column per locale.
+    The locales of a .jsonl table are the columns of its first line; later
+    lines may add more.
+    """
+    suffix = table_path.suffix.lower()
+    if suffix == ".json":
+        with table_path.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+        if not isinstance(data, dict) or not all(
+            isinstance(values, dict) for values in data.values()
+        ):
+            raise ValueError("expected an object of {locale: message} objects")
+        locales = sorted({locale for values in data.values() for locale in values})
+        rows = ({KEY_COLUMN: key, **values} for key, values in data.items())
+        return [locale for locale in locales if locale != DESCRIPTION_COLUMN], rows
+
+    if suffix == ".jsonl":
+        rows = _jsonl_rows(table_path)
+        first = next(rows, None)
+        if first is None:
+            return [], rows
+        return locale_columns(first), itertools.chain([first], rows)
+
+    delimiter = "\t" if suffix in (".tsv", ".tab") else ","
+    with table_path.open("r", encoding="utf-8-sig", newline="") as f:
+        header = next(csv.reader(f, delimiter=delimiter), [])
+    if KEY_COLUMN not in header:
+        raise ValueError(f"{table_path} has no '{KEY_COLUMN}' column")
+    return locale_columns(header), _csv_rows(table_path, delimiter)
+
+
+def locale_columns(columns) -> List[str]:
+    """
+    The locale columns of a table header or row, in their order.
+    """
+    return [
+        column
+        for column in columns
+        if isinstance(column, str) and column not in (KEY_COLUMN, DESCRIPTION_COLUMN)
+    ]
+
+
+def _csv_rows(table_path: Path, delimiter: str) -> Iterator[Dict[str, str]]:
+    with table_path.open("r", encoding="utf-8-sig", newline="") as f:
+        yield from csv.DictReader(f, delimiter=delimiter)
+
+
+def _jsonl_rows(table_path: Path) -> Iterator[Dict[str, str]]:
+    with table_path.open("r", encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            if line.strip():
+                row = json.loads(line)
+                if not isinstance(row, dict):
+                    raise ValueError(f"line {number} is not a JSON object")
+                yield row
+
+
+def placeholders(message: str) -> Set[str]:
+    return set(PLACEHOLDER_REG.findall(message))
+
+
+def _write_locale(
+    staged: StagedFiles,
+    arb_path: Path,
+    locale: str,
+    rows: "queue.Queue",
+    template: Dict[str, object],
+) -> LocaleReport:
+    """
+    Streams the queued (key, message, description) rows into one staged ARB
+    file, which import_translations commits with the others. After an error
+    the queue is still drained so the reader never blocks.
+    """
+    report = LocaleReport(locale)
+    is_template = locale == TEMPLATE_LOCALE
+    row = None
+    try:
+        with staged.writer(arb_path, encoding="utf-8") as f:
+            f.write("{\n  " + _entry("@@locale", locale))
+            while True:
+                row = rows.get()
+                if row is _END:
+                    break
+                if row is _ABORT:
+                    raise ValueError("the translation table could not be imported")
+                _write_message(f, report, is_template, template, *row)
+            f.write("\n}\n")
+    finally:
+        while row is not _END and row is not _ABORT:
+            row = rows.get()
+    return report
+
+
+class _LocaleWriter:
+    """
+    Writes the ARB file of one locale from a bounded queue on a thread.
+    """
+
+    def __init__(
+        self,
+        staged: StagedFiles,
+        arb_path: Path,
+        locale: str,
+        template: Dict[str, object],
+    ):
+        self.locale = locale
+        self.rows: "queue.Queue" = queue.Queue(maxsize=QUEUE_SIZE)
+        self.report: Optional[LocaleReport] = None
+        self.error: Optional[Exception] = None
+        self._thread = threading.Thread(
+            target=self._run, args=(staged, arb_path, template), daemon=True
+        )
+        self._thread.start()
+
+    def _run(
+        self, staged: StagedFiles, arb_path: Path, template: Dict[str, object]
+    ) -> None:
+        try:
+            self.report = _write_locale(
+                staged, arb_path, self.locale, self.rows, template
+            )
+        except Exception as e:
+            self.error = e
+
+    def join(self) -> None:
+        self._thread.join()
+
+
+def _write_message(
+    f: IO[str],
+    report: LocaleReport,
+    is_template: bool,
+    template: Dict[str, object],
+    key: str,
+    message: str,
+    description: Optional[str],
+) -> None:
+    template_message = template.get(key)
+    if not message and is_template:
+        # keep the current message of the template locale
+        message = template_message
+    if not message:
+        report.missing.append(key)
+        return
+
+    if isinstance(template_message, str) and placeholders(message) != placeholders(
+        template_message
+    ):
+        report.mismatched.append(key)
+
+    f.write(",\n  " + _entry(key, message))
+    if is_template:
+        metadata = dict(template.get(f"@{key}") or {})
+        if description:
+            metadata["description"] = description
+        if metadata:
+            f.write(",\n  " + _entry(f"@{key}", metadata))
+    report.written += 1
+
+
+def _entry(key: str, value: object) -> str:
+    text = json.dumps(value, ensure_ascii=False, indent=2).replace("\n", "\n  ")
+    return f"{json.dumps(key, ensure_ascii=False)}: {text}"
+
+
+def import_translations(root_path: Path, table_path: Path) -> bool:
+    """
+    Writes one app_<locale>.arb per locale column of a translation table into
+    the resources package. The locales are written in parallel, each from a
+    bounded queue, so the table is never held in memory as a whole. The ARB
+    files are replaced together once every one of them was written; after
+    any error none is changed.
+
+    The @key metadata (descriptions, placeholders) of the template locale ARB
+    is kept; a "description" column replaces the description.
+
+    Args:
+        root_path: The monorepo root.
+        table_path: A .csv, .tsv, .json or .jsonl translation table.
+    Returns:
+        True if every ARB file was written.
+    """
+    if not table_path.is_file():
+        output(f"Translation table '{table_path}' does not exist.", OutputType.ERROR)
+        return False
+
+    l10n_dir = resource_l10n_dir(root_path)
+    template_path = l10n_dir / f"app_{TEMPLATE_LOCALE}.arb"
+    template: Dict[str, object] = {}
+    if template_path.exists():
+        try:
+            with template_path.open("r", encoding="utf-8") as f:
+                template = json.load(f)
+        except ValueError as e:
+            output(f"Failed to read '{template_path}': {e}", OutputType.ERROR)
+            return False
+
+    try:
+        locales, rows = read_table(table_path)
+    except (ValueError, OSError) as e:
+        output(f"Failed to read '{table_path}': {e}", OutputType.ERROR)
+        return False
+
+    if not _valid_locales(locales):
+        return False
+    if not locales:
+        output("The translation table has no locale columns.", OutputType.ERROR)
+        return False
+    if TEMPLATE_LOCALE not in locales and not template:
+        output(
+            f"The table has no '{TEMPLATE_LOCALE}' column and {template_path} "
+            "does not exist.",
+            OutputType.ERROR,
+        )
+        return False
+
+    output(
+        f"Importing {', '.join(locales)} from {table_path} into {l10n_dir}",
+        OutputType.INFO,
+    )
+    staged = StagedFiles()
+    writers: Dict[str, _LocaleWriter] = {}
+
+    def start_writer(locale: str) -> _LocaleWriter:
+        writers[locale] = _LocaleWriter(
+            staged, l10n_dir / f"app_{locale}.arb", locale, template
+        )
+        return writers[locale]
+
+    for locale in locales:
+        start_writer(locale)
+    fed = _feed_rows(rows, writers, start_writer, table_path)
+    for writer in writers.values():
+        writer.join()
+
+    failed = [writer for writer in writers.values() if writer.error is not None]
+    for writer in failed if fed else []:
+        output(
+            f"Failed to write app_{writer.locale}.arb: {writer.error}",
+            OutputType.ERROR,
+        )
+    if not fed or failed:
+        staged.discard()
+        output("No ARB file was changed.", OutputType.ERROR)
+        return False
+    staged.commit()
+
+    for locale, writer in writers.items():
+        report = writer.report
+        output(
+            f"app_{locale}.arb: {report.written} messages, "
+            f"{len(report.missing)} missing",
+            OutputType.SUCCESS,
+        )
+        if report.mismatched:
+            output(
+                f"app_{locale}.arb: placeholders differ from the template in "
+                f"{', '.join(report.mismatched[:10])}"
+                + (" ..." if len(report.mismatched) > 10 else ""),
+                OutputType.INFO,
+            )
+    return True
+
+
+def _valid_locales(locales: List[str]) -> bool:
+    invalid = [locale for locale in locales if not LOCALE_REG.match(locale)]
+    if invalid:
+        output(f"Invalid locale columns: {', '.join(invalid)}", OutputType.ERROR)
+        return False
+    return True
+
+
+def _text(row: Dict[str, object], column: str, key: str) -> str:
+    value = row.get(column)
+    if value is None:
+        return ""
+    if not isinstance(value, str):
+        raise ValueError(f"the '{column}' of '{key}' is not a string")
+    return value
+
+
+def _feed_rows(
+    rows: Iterator[Dict[str, str]],
+    writers: Dict[str, _LocaleWriter],
+    start_writer: Callable[[str], _LocaleWriter],
+    table_path: Path,
+) -> bool:
+    """
+    Streams the table rows into the locale writers. A locale column that
+    first appears in a later row (JSON Lines) gets a writer that starts with
+    the keys read so far as missing messages.
+
+    Returns:
+        False if the table is unreadable, has duplicate keys or a value that
+        is not a string; the writers are then aborted.
+    """
+    keys: List[Tuple[str, Optional[str]]] = []
+    seen: Set[str] = set()
+    duplicates = []
+    ok = False
+    try:
+        for row in rows:
+            key = _text(row, KEY_COLUMN, "a row").strip()
+            if not key:
+                continue
+            if key in seen:
+                duplicates.append(key)
+                continue
+            seen.add(key)
+            description = _text(row, DESCRIPTION_COLUMN, key) or None
+            new_locales = [c for c in locale_columns(row) if c not in writers]
+            if new_locales and not _valid_locales(new_locales):
+                return False
+            for locale in new_locales:
+                writer = start_writer(locale)
+                for previous_key, previous_description in keys:
+                    writer.rows.put((previous_key, "", previous_description))
+            keys.append((key, description))
+            messages = {locale: _text(row, locale, key) for locale in writers}
+            for locale, writer in writers.items():
+                writer.rows.put((key, messages[locale], description))
+        ok = not duplicates
+    except (ValueError, csv.Error) as e:
+        output(f"Failed to read '{table_path}': {e}", OutputType.ERROR)
+    finally:
+        for writer in writers.values():
+            writer.rows.put(_END if ok else _ABORT)
+
+    if duplicates:
+        output(
+            f"Duplicate keys in the table: {', '.join(duplicates)}", OutputType.ERROR
+        )
+    return ok
@@ -0,0 +1,242 @@
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from src.models import AdditionPlan
+from src.output_util import OutputType, output, output_lines
+from src.workspace_index import load_workspace_index
+from src.yaml import dump_yaml, load_yaml
+
+
+class Workspace:
+    """
+    In-memory view of the monorepo YAML documents.
+
+    Documents (root pubspec, melos.yaml, member pubspecs, ...) are loaded
+    lazily, at most once, and changes are only written by `flush`,
+    which writes every dirty document in one batch.
+    """
+
+    def __init__(self, root_path: Path):
+        self.root_path = root_path
+        self._documents: Dict[Path, Any] = {}
+        self._dirty: Set[Path] = set()
+        self._members: Optional[Set[str]] = None
+
+    def _resolve(self, path: Path) -> Path:
+        return path if path.is_absolute() else self.root_path / path
+
+    def document(self, path: Path) -> Any:
+        """
+        Returns the loaded document at path (absolute or relative to the root),
+        or None if the file does not exist.
+        """
+        path = self._resolve(path)
+        if path not in self._documents:
+            self._documents[path] = load_yaml(path) if path.exists() else None
+        return self._documents[path]
+
+    def set_document(self, path: Path, data: Any) -> None:
+        """
+        Replaces the document at path and marks it to be written.
+        """
+        path = self._resolve(path)
+        self._documents[path] = data
+        self._dirty.add(path)
+
+    def mark_dirty(self, path: Path) -> None:
+        self._dirty.add(self._resolve(path))
+
+    @property
+    def root_pubspec(self) -> Any:
+        return self.document(Path("pubspec.yaml"))
+
+    @property
+    def melos(self) -> Any:
+        return self.document(Path("melos.yaml"))
+
+    def member_pubspec(self, member: str) -> Any:
+        """
+        Returns the pubspec of a member, e.g. member_pubspec("apps/shop").
+        """
+        return self.document(Path(member) / "pubspec.yaml")
+
+    def members(self) -> Set[str]:
+        """
+        Returns the workspace entries of the root pubspec.
+        """
+        if self._members is None:
+            self._members = set(self._workspace_entries())
+        return self._members
+
+    def _workspace_entries(self) -> List[str]:
+        pubspec_data = self.root_pubspec
+        if pubspec_data.get("workspace") is None:
+            pubspec_data["workspace"] = []
+        return pubspec_data["workspace"]
+
+    def add_member(self, member: str) -> bool:
+        """
+        Adds a member to the workspace and sets its resolution to workspace.
+
+        Returns:
+            True if the root pubspec or the member pubspec changed.
+        """
+        changed = False
+        members = self.members()
+        if member not in members:
+            members.add(member)
+            self._workspace_entries().append(member)
+            self.mark_dirty(Path("pubspec.yaml"))
+            changed = True
+        return self.set_resolution_workspace(member) or changed
+
+    def remove_member(self, member: str) -> bool:
+        """
+        Removes a member from the workspace entries of the root pubspec.
+
+        Returns:
+            True if the root pubspec changed.
+        """
+        members = self.members()
+        if member not in members:
+            return False
+        members.discard(member)
+        self._workspace_entries().remove(member)
+        self.mark_dirty(Path("pubspec.yaml"))
+        return True
+
+    def add_members(self, apps: Iterable[str], packages: Iterable[str]) -> bool:
+        """
+        Adds apps and packages to the workspace.
+
+        Returns:
+            True if any document changed.
+        """
+        members = [f"packages/{package}" for package in packages]
+        members += [f"apps/{app}" for app in apps]
+        return any([self.add_member(member) for member in members])
+
+    def set_resolution_workspace(self, member: str) -> bool:
+        """
+        Adds 'resolution: workspace' to the pubspec of a member.
+
+        Returns:
+            True if the pubspec changed.
+        """
+        pubspec_data = self.member_pubspec(member)
+        if pubspec_data is None:
+            output(
+                f"Skipping {member}, pubspec.yaml not found (on workspace resolution)",
+                OutputType.ERROR,
+            )
+            return False
+        if pubspec_data.get("resolution") == "workspace":
+            return False
+        pubspec_data["resolution"] = "workspace"
+        self.mark_dirty(Path(member) / "pubspec.yaml")
+        return True
+
+    def flush(self) -> int:
+        """
+        Writes every changed document.
+
+        Returns:
+            The number of files written.
+        """
+        written = 0
+        for path in sorted(self._dirty):
+            written += dump_yaml(path, self._documents[path])
+        self._dirty.clear()
+        return written
+
+
+def plan_additions(
+    workspace: Workspace, apps: List[str], packages: List[str]
+) -> AdditionPlan:
+    """
+    Compares the requested apps and packages with the workspace index,
+    so no pubspec has to be read again.
+    """
+    index = load_workspace_index(workspace.root_path)
+
+    def exists(member: str) -> bool:
+        return member in index
+
+    new_apps = [app for app in apps if not exists(f"apps/{app}")]
+    new_packages = [p for p in packages if not exists(f"packages/{p}")]
+    existing_apps = [app for app in apps if app not in new_apps]
+    existing_packages = [p for p in packages if p not in new_packages]
+
+    members = [f"packages/{package}" for package in packages]
+    members += [f"apps/{app}" for app in apps]
+    workspace_entries = [m for m in members if m not in workspace.members()]
+
+    existing_members = [f"packages/{package}" for package in existing_packages]
+    existing_members += [f"apps/{app}" for app in existing_apps]
+    resolution_updates = [
+        member
+        for member in existing_members
+        if index.by_path(member).resolution != "workspace"
+    ]
+
+    # pub workspaces need unique package names
+    conflicts = [
+        f"{folder}/{name} ({index.by_name(name).path} is named '{name}')"
+        for folder, names in (("apps", new_apps), ("packages", new_packages))
+        for name in names
+        if index.by_name(name) is not None
+    ]
+
+    return AdditionPlan(
+        new_apps,
+        new_packages,
+        existing_apps,
+        existing_packages,
+        workspace_entries,
+        resolution_updates,
+        conflicts,
+    )
+
+
+def print_addition_plan(plan: AdditionPlan) -> None:
+    if plan.is_empty():
+        output("Nothing to add, the monorepo is up to date.", OutputType.SUCCESS)
+        return
+
+    output("Plan:", OutputType.INFO)
+    lines = [f"+ create app apps/{app}" for app in plan.new_apps]
+    lines += [f"+ create package packages/{package}" for package in plan.new_packages]
+    lines += [
+        f"~ add {member} to the root pubspec workspace"
+        for member in plan.workspace_entries
+    ]
+    lines += [
+        f"~ set resolution: workspace in {member}/pubspec.yaml"
+        for member in plan.resolution_updates
+    ]
+    for member in [f"apps/{a}" for a in plan.existing_apps] + [
+        f"packages/{p}" for p in plan.existing_packages
+    ]:
+        if member not in plan.workspace_entries + plan.resolution_updates:
+            lines.append(f"= {member} already exists")
+    output_lines(lines)
+
+
+def add_to_workspace(monorepo_path: Path, apps: List[str], packages: List[str]):
+    """
+    Adds the provided apps and packages to the workspace section of the root
+    pubspec.yaml and sets 'resolution: workspace' in their pubspecs.
+
+    Args:
+        monorepo_path: Path to the root
+        apps: List of app names to be added to the workspace.
+        packages: List of package names to be added to the workspace.
+    """
+    workspace = Workspace(monorepo_path)
+    workspace.add_members(apps, packages)
+    written = workspace.flush()
+    output(
+        f"Updated workspace in {monorepo_path / 'pubspec.yaml'} with apps and "
+        f"packages ({written} files written).",
+        OutputType.SUCCESS,
+    )
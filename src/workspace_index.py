@@ -0,0 +1,166 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field, replace
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from src.constants import STATE_DIR
+from src.emit_util import emit_file
+from src.output_util import OutputType, output
+from src.yaml import load_plain_yaml
+
+INDEX_FILE = "index.json"
+INDEX_VERSION = 1
+
+MEMBER_FOLDERS = ("packages", "apps")
+
+
+@dataclass
+class MemberInfo:
+    """
+    What the index knows about one app or package.
+    """
+
+    name: str
+    path: str
+    dependencies: List[str] = field(default_factory=list)
+    dev_dependencies: List[str] = field(default_factory=list)
+    resolution: Optional[str] = None
+    has_l10n: bool = False
+    # (mtime_ns, size) of the pubspec it was read from, None if unreadable
+    stamp: Optional[List[int]] = None
+
+
+class WorkspaceIndex:
+    """
+    The apps and packages of a monorepo, looked up by name or path in O(1).
+    """
+
+    def __init__(self, root_path: Path, members: List[MemberInfo]):
+        self.root_path = root_path
+        self._by_path = {member.path: member for member in members}
+        self._by_name = {member.name: member for member in members}
+
+    def members(self) -> List[MemberInfo]:
+        return list(self._by_path.values())
+
+    def by_path(self, path: str) -> Optional[MemberInfo]:
+        """
+        Returns the member at a path relative to the root, e.g. "apps/shop".
+        """
+        return self._by_path.get(path)
+
+    def by_name(self, name: str) -> Optional[MemberInfo]:
+        return self._by_name.get(name)
+
+    def __contains__(self, path: str) -> bool:
+        return path in self._by_path
+
+    def __len__(self) -> int:
+        return len(self._by_path)
+
+
+def index_path(root_path: Path) -> Path:
+    return root_path / STATE_DIR / INDEX_FILE
+
+
+def load_workspace_index(root_path: Path) -> WorkspaceIndex:
+    """
+    Returns the index of the apps and packages of a monorepo.
+
+    packages/ and apps/ are scanned in parallel. A member whose pubspec.yaml
+    has the mtime and size recorded in .mono_py/index.json is taken from the
+    index file, so only new and changed pubspecs are read; the index file is
+    written again when anything changed.
+    """
+    cached = _load_index_file(root_path)
+    with ThreadPoolExecutor() as executor:
+        scans = executor.map(
+            lambda folder: _scan_folder(root_path, folder), MEMBER_FOLDERS
+        )
+        candidates = [path for paths in scans for path in paths]
+        infos = executor.map(
+            lambda path: _member_info(root_path, path, cached), candidates
+        )
+        members = [member for member in infos if member is not None]
+
+    if {member.path: member for member in members} != cached:
+        _write_index_file(root_path, members)
+    return WorkspaceIndex(root_path, members)
+
+
+def _scan_folder(root_path: Path, folder: str) -> List[str]:
+    try:
+        with os.scandir(root_path / folder) as entries:
+            return sorted(
+                f"{folder}/{entry.name}" for entry in entries if entry.is_dir()
+            )
+    except FileNotFoundError:
+        return []
+
+
+def _member_info(
+    root_path: Path, path: str, cached: Dict[str, MemberInfo]
+) -> Optional[MemberInfo]:
+    """
+    Returns the member at path, from the index file if its pubspec did not
+    change, or None if the folder has no pubspec.
+    """
+    member_path = root_path / path
+    try:
+        stat = (member_path / "pubspec.yaml").stat()
+    except FileNotFoundError:
+        return None
+    # stat before reading, so a pubspec replaced meanwhile is read again next time
+    stamp = [stat.st_mtime_ns, stat.st_size]
+    has_l10n = (member_path / "l10n.yaml").exists()
+
+    member = cached.get(path)
+    if member is not None and member.stamp == stamp:
+        return replace(member, has_l10n=has_l10n)
+
+    try:
+        pubspec = load_plain_yaml(member_path / "pubspec.yaml") or {}
+        name = pubspec["name"]
+    except Exception as e:  # ruamel.yaml raises its own error types
+        output(f"Failed to read {path}/pubspec.yaml: {e}", OutputType.ERROR)
+        return MemberInfo(member_path.name, path, has_l10n=has_l10n)
+
+    return MemberInfo(
+        name=name,
+        path=path,
+        dependencies=sorted(pubspec.get("dependencies") or {}),
+        dev_dependencies=sorted(pubspec.get("dev_dependencies") or {}),
+        resolution=pubspec.get("resolution"),
+        has_l10n=has_l10n,
+        stamp=stamp,
+    )
+
+
+def _load_index_file(root_path: Path) -> Dict[str, MemberInfo]:
+    try:
+        with index_path(root_path).open("r") as f:
+            data = json.load(f)
+        if data.get("version") != INDEX_VERSION:
+            return {}
+        return {
+            path: MemberInfo(path=path, **info)
+            for path, info in data["members"].items()
+        }
+    except (OSError, ValueError, TypeError, KeyError):
+        return {}
+
+
+def _write_index_file(root_path: Path, members: List[MemberInfo]) -> None:
+    data = {
+        "version": INDEX_VERSION,
+        "members": {member.path: _without_path(member) for member in members},
+    }
+    emit_file(index_path(root_path), json.dumps(data, indent=1, sort_keys=True))
+
+
+def _without_path(member: MemberInfo) -> Dict[str, object]:
+    info = asdict(member)
+    del info["path"]
+    return info
@@ -1,11 +1,70 @@
-import sys
+import io
+import threading
 from pathlib import Path
-from typing import List
-
-from ruamel.yaml import YAML
+from typing import TYPE_CHECKING, Any, List, Optional
 
+from src.emit_util import emit_file
 from src.output_util import OutputType, output
 
+if TYPE_CHECKING:
+    from ruamel.yaml import YAML
+
+    from src.workspace import Workspace
+
+_local = threading.local()
+
+
+def get_yaml() -> "YAML":
+    """
+    Returns the round-trip YAML instance of the current thread.
+    YAML objects are not thread safe, so each thread gets its own.
+    ruamel.yaml is only imported when the first YAML file is read or written.
+    """
+    yaml = getattr(_local, "yaml", None)
+    if yaml is None:
+        from ruamel.yaml import YAML
+
+        yaml = YAML()
+        yaml.indent(mapping=2, sequence=4, offset=2)
+        yaml.preserve_quotes = True
+        _local.yaml = yaml
+    return yaml
+
+
+def load_plain_yaml(path: Path) -> Any:
+    """
+    Loads a YAML document into plain dicts and lists, without the comments
+    and formatting; faster than load_yaml for documents that are only read.
+    """
+    yaml = getattr(_local, "safe_yaml", None)
+    if yaml is None:
+        from ruamel.yaml import YAML
+
+        yaml = YAML(typ="safe")
+        _local.safe_yaml = yaml
+    with path.open("r") as f:
+        return yaml.load(f)
+
+
+def load_yaml(path: Path) -> Any:
+    """
+    Loads a YAML document, keeping comments and formatting.
+    """
+    with path.open("r") as f:
+        return get_yaml().load(f)
+
+
+def dump_yaml(path: Path, data: Any) -> bool:
+    """
+    Writes a YAML document if its content changed.
+
+    Returns:
+        True if the file was written.
+    """
+    stream = io.StringIO()
+    get_yaml().dump(data, stream)
+    return emit_file(path, stream.getvalue())
+
 
 def create_root_pubspec_yaml(path: Path, project_name: str) -> None:
     """
@@ -15,10 +74,6 @@ def create_root_pubspec_yaml(path: Path, project_name: str) -> None:
         path: Path where the pubspec.yaml should be created.
         project_name: The name of the root project.
     """
-
-    yaml = YAML()
-    yaml.indent(mapping=2, sequence=4, offset=2)
-    yaml.preserve_quotes = True
     pubspec_data = {
         "name": project_name,
         "publish_to": "none",
@@ -27,8 +82,7 @@ def create_root_pubspec_yaml(path: Path, project_name: str) -> None:
     }
 
     pubspec_path = path / "pubspec.yaml"
-    with pubspec_path.open("w") as f:
-        yaml.dump(pubspec_data, f)
+    dump_yaml(pubspec_path, pubspec_data)
 
     output(f"Created root pubspec.yaml at {pubspec_path}", OutputType.SUCCESS)
 
@@ -41,10 +95,6 @@ def create_root_melos_yaml(path: Path, project_name: str, packages: List[str]) -
         path: Path where the melos.yaml should be created.
         project_name: The name of the root project.
     """
-    yaml = YAML()
-    yaml.indent(mapping=2, sequence=4, offset=2)
-    yaml.preserve_quotes = True
-
     melos_data = {
         "name": project_name,
         "packages": ["packages/**", "apps/**"],
@@ -66,99 +116,24 @@ def create_root_melos_yaml(path: Path, project_name: str, packages: List[str]) -
     }
 
     melos_path = path / "melos.yaml"
-    with melos_path.open("w") as f:
-        yaml.dump(melos_data, f)
+    dump_yaml(melos_path, melos_data)
 
     output("Created melos.yaml at root", OutputType.SUCCESS)
 
 
-def add_resolution_workspace_to_packages(
-    package_or_app_path: Path, package_name: str
-) -> None:
-    """
-    Adds 'resolution: workspace' to the pubspec.yaml of each package in the packages directory.
-
-    Args:
-        packages_dir: Path to the 'packages' directory.
-    """
-    yaml = YAML()
-    yaml.indent(mapping=2, sequence=4, offset=2)
-    yaml.preserve_quotes = True
-
-    if not package_or_app_path.exists():
-        output(
-            f"Skipping {package_name}, pubspec.yaml not found (on workspace resolution)",
-            OutputType.ERROR,
-        )
-        sys.exit()
-
-    try:
-        with package_or_app_path.open("r") as f:
-            data = yaml.load(f)
-
-        data["resolution"] = "workspace"
-
-        with package_or_app_path.open("w") as f:
-            yaml.dump(data, f)
-
-        output(
-            f"Added 'resolution: workspace' to {package_or_app_path}",
-            OutputType.SUCCESS,
-        )
-
-    except Exception as e:
-        output(f"Failed to update {package_or_app_path}: {e}", OutputType.ERROR)
-        sys.exit()
-
-
-def add_to_workspace(monorepo_path: Path, apps: List[str], packages: List[str]):
-    """
-    Adds the provided apps and packages to the workspace section of the root pubspec.yaml.
-
-    Args:
-        monorepo_path: Path to the root
-        apps: List of app names to be added to the workspace.
-        packages: List of package names to be added to the workspace.
-    """
-    yaml = YAML()
-    yaml.indent(mapping=2, sequence=4, offset=2)
-    yaml.preserve_quotes = True
-    pubspec_path = monorepo_path / "pubspec.yaml"
-
-    with pubspec_path.open("r") as f:
-        pubspec_data = yaml.load(f)
-    if "workspace" not in pubspec_data:
-        pubspec_data["workspace"] = []
-    workspace_entries = pubspec_data["workspace"]
-    for package in packages:
-        package_path = f"packages/{package}"
-        if package_path not in workspace_entries:
-            workspace_entries.append(package_path)
-    for app in apps:
-        app_path = f"apps/{app}"
-        if app_path not in workspace_entries:
-            workspace_entries.append(app_path)
-    with pubspec_path.open("w") as f:
-        yaml.dump(
-            pubspec_data,
-            f,
-        )
-    output(
-        f"Updated workspace in {pubspec_path} with apps and packages.",
-        OutputType.SUCCESS,
-    )
-
-
-def create_l10n_yaml(path: Path, is_res: bool, res_package: str) -> bool:
+def create_l10n_yaml(
+    path: Path, is_res: bool, res_package: str, workspace: Optional["Workspace"] = None
+) -> bool:
     """
     Creates the l10n yaml file
+    When a Workspace is given, the file is written on its next flush.
     return a bool
     """
 
     if is_res:
         arb_dir = "lib/l10n"
     else:
-        arb_dir = f"../../packages/{res_package}/l10n"
+        arb_dir = f"../../packages/{res_package}/lib/l10n"
 
     l10n_config = {
         "arb-dir": arb_dir,
@@ -169,46 +144,9 @@ def create_l10n_yaml(path: Path, is_res: bool, res_package: str) -> bool:
         "synthetic-package": False,
     }
     l10n_yaml_path = path / "l10n.yaml"
-    yaml = YAML()
-    yaml.indent(mapping=2, sequence=4, offset=2)
-    yaml.preserve_quotes = True
-
-    with open(l10n_yaml_path, "w") as f:
-        yaml.dump(l10n_config, f)
+    if workspace is not None:
+        workspace.set_document(l10n_yaml_path, l10n_config)
+    else:
+        dump_yaml(l10n_yaml_path, l10n_config)
     output(f"Created l10n.yaml configuration file for {path}", OutputType.SUCCESS)
     return True
-
-
-def enable_flutter_gen(root_path: Path, res_package: str):
-    yaml = YAML()
-    yaml.indent(mapping=2, sequence=4, offset=2)
-    yaml.preserve_quotes = True
-
-    pubspec_path = root_path / "pacakges" / res_package
-
-    if not pubspec_path.exists():
-        output(f"pubspec didn't exits for {res_package}", OutputType.ERROR)
-
-    with pubspec_path.open("r") as f:
-        pubspec_data = yaml.load(f)
-
-    if "flutter" not in pubspec_data:
-        output(f"didn't find flutter in pubpspec for {res_package}", OutputType.ERROR)
-        return
-
-    if not isinstance(pubspec_data, dict):
-        return
-    if "generate" not in pubspec_data or not pubspec_data["generate"]:
-        pubspec_data["generate"] = True
-        output(f"Set generate: true for {res_package}", OutputType.SUCCESS)
-    else:
-        output(f"generate: true already set for {res_package}", OutputType.SUCCESS)
-    with pubspec_path.open("w") as f:
-        yaml.dump(
-            pubspec_data,
-            f,
-        )
-    output(
-        f"Updated workspace in {pubspec_path} with apps and packages.",
-        OutputType.SUCCESS,
-    )
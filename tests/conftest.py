@@ -0,0 +1,124 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+FAKE_TOOLCHAIN = REPO_ROOT / "benchmarks" / "fake_toolchain"
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+sys.path.insert(0, str(REPO_ROOT))
+# set before src.constants is imported, so no test touches the user cache
+CACHE_DIR = Path(tempfile.mkdtemp(prefix="mono_py_test_cache_"))
+os.environ["MONO_PY_CACHE_DIR"] = str(CACHE_DIR)
+
+SHOP = {
+    "project_name": "shop",
+    "apps": ["customer"],
+    "packages": ["payments"],
+    "locales": ["en", "ne"],
+}
+
+
+class Scaffolder:
+    """
+    Runs main.py on the fake toolchain in a temporary directory.
+    """
+
+    def __init__(self, work_dir: Path, env: Dict[str, str]):
+        self.work_dir = work_dir
+        self.env = env
+        self.tool_log = Path(env["FAKE_TOOLCHAIN_LOG"])
+
+    def write_manifest(self, name: str, manifest: dict) -> Path:
+        path = self.work_dir / name
+        path.write_text(json.dumps(manifest))
+        return path
+
+    def run(
+        self,
+        args: List[str],
+        check: bool = True,
+        env: Optional[Dict[str, str]] = None,
+        cwd: Optional[Path] = None,
+    ) -> subprocess.CompletedProcess:
+        result = subprocess.run(
+            [sys.executable, str(REPO_ROOT / "main.py"), "--no-progress", *args],
+            cwd=cwd or self.work_dir,
+            env={**self.env, **(env or {})},
+            capture_output=True,
+            text=True,
+        )
+        if check and result.returncode != 0:
+            pytest.fail(
+                f"main.py {' '.join(args)} exited with {result.returncode}:\n"
+                f"{result.stdout[-4000:]}{result.stderr[-4000:]}"
+            )
+        return result
+
+    def create(self, manifest: dict, *args: str) -> Path:
+        path = self.write_manifest(f"{manifest['project_name']}.json", manifest)
+        self.run([*args, "--manifest", str(path)])
+        return self.work_dir / manifest["project_name"]
+
+    def tool_commands(self) -> List[str]:
+        """
+        The fake toolchain commands run so far, one command line each.
+        """
+        if not self.tool_log.exists():
+            return []
+        return self.tool_log.read_text().splitlines()
+
+
+@pytest.fixture(scope="session")
+def cache_dir() -> Iterator[Path]:
+    # shared by the whole session, so the template cache is built once
+    yield CACHE_DIR
+    shutil.rmtree(CACHE_DIR, ignore_errors=True)
+
+
+@pytest.fixture
+def fake_toolchain(tmp_path, monkeypatch, cache_dir) -> Path:
+    """
+    Puts the fake toolchain first in PATH for code run in the test process.
+
+    Returns:
+        The file the fake tools log their command lines to.
+    """
+    tool_log = tmp_path / "toolchain.log"
+    monkeypatch.setenv(
+        "PATH", f"{FAKE_TOOLCHAIN}{os.pathsep}{os.environ.get('PATH', '')}"
+    )
+    monkeypatch.setenv("FAKE_TOOLCHAIN_LATENCY", "0")
+    monkeypatch.setenv("FAKE_TOOLCHAIN_LOG", str(tool_log))
+    monkeypatch.delenv("FAKE_TOOLCHAIN_FAIL", raising=False)
+    monkeypatch.delenv("MONO_PY_TIMEOUT_SCALE", raising=False)
+    return tool_log
+
+
+@pytest.fixture
+def scaffolder(tmp_path, cache_dir) -> Scaffolder:
+    env = dict(os.environ)
+    env["PATH"] = f"{FAKE_TOOLCHAIN}{os.pathsep}{env.get('PATH', '')}"
+    env["MONO_PY_CACHE_DIR"] = str(cache_dir)
+    env["FAKE_TOOLCHAIN_LATENCY"] = "0"
+    env["FAKE_TOOLCHAIN_LOG"] = str(tmp_path / "toolchain.log")
+    env.pop("FAKE_TOOLCHAIN_FAIL", None)
+    env.pop("MONO_PY_TIMEOUT_SCALE", None)
+    work_dir = tmp_path / "work"
+    work_dir.mkdir()
+    return Scaffolder(work_dir, env)
+
+
+@pytest.fixture
+def shop(scaffolder) -> Path:
+    """
+    A monorepo scaffolded from the SHOP manifest.
+    """
+    return scaffolder.create(SHOP)
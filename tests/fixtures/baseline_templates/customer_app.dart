@@ -0,0 +1,28 @@
+import 'package:flutter/material.dart';
+import 'package:flutter_riverpod/flutter_riverpod.dart';
+// import 'package:Shop/config/route/router.dart';
+import 'package:shop/core/providers/locale_provider.dart';
+import 'package:shop_resources/shop_resources.dart';
+
+class Customer extends StatelessWidget  {
+  const Customer({super.key});
+
+  @override
+  Widget build(BuildContext context) {
+    //final selectedString = ref.watch(languageProvider);
+
+    const localization = ShopLocalization();
+
+    return ShopTheme(
+        themeMode: ThemeMode.dark,
+        builder: (config) {
+          return MaterialApp.router(
+              localizationsDelegates: localization.delegates, supportedLocales: localization.supportedLocales,
+              locale: const Locale('ne'),
+//              routerConfig: AppRouter.router,
+              debugShowCheckedModeBanner: false,
+              theme: config.dark,
+              darkTheme: config.dark);
+        });
+  }
+}
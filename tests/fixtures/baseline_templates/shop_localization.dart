@@ -0,0 +1,21 @@
+import 'package:flutter/widgets.dart';
+import '../l10n/app_localizations.dart';
+import 'package:flutter_localizations/flutter_localizations.dart';
+class ShopLocalization {
+  const ShopLocalization();
+
+  List<Locale> get supportedLocales => AppLocalizations.supportedLocales;
+
+  List<LocalizationsDelegate<Object>> get delegates {
+    return [
+      AppLocalizations.delegate,
+      GlobalMaterialLocalizations.delegate,
+      GlobalWidgetsLocalizations.delegate,
+      GlobalCupertinoLocalizations.delegate,
+    ];
+  }
+}
+
+extension ShopExtension on BuildContext {
+  AppLocalizations get loc => AppLocalizations.of(this);
+}
@@ -0,0 +1,2 @@
+export './src/shop_localization.dart';
+export './src/shop_theme.dart';
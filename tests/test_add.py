@@ -0,0 +1,52 @@
+from ruamel.yaml import YAML
+
+from conftest import SHOP
+
+yaml = YAML(typ="safe")
+
+MORE = {**SHOP, "apps": ["customer", "admin"], "packages": ["payments", "orders"]}
+
+
+def test_add_prints_the_plan_and_creates_only_new_members(shop, scaffolder):
+    existing = shop / "apps/customer/lib/app/customer_app.dart"
+    existing.write_text("// edited\n")
+    manifest = scaffolder.write_manifest("more.json", MORE)
+
+    result = scaffolder.run(["--add", str(shop), "--manifest", str(manifest)])
+
+    assert "    + create app apps/admin\n" in result.stdout
+    assert "    + create package packages/orders\n" in result.stdout
+    assert "    ~ add apps/admin to the root pubspec workspace\n" in result.stdout
+    assert "    = apps/customer already exists\n" in result.stdout
+    assert "    = packages/payments already exists\n" in result.stdout
+    assert "create app apps/customer" not in result.stdout
+
+    assert existing.read_text() == "// edited\n"
+    assert yaml.load(shop / "pubspec.yaml")["workspace"] == [
+        "packages/shop_resources",
+        "packages/shop_components",
+        "packages/payments",
+        "apps/customer",
+        "packages/orders",
+        "apps/admin",
+    ]
+    for member in ("apps/admin", "packages/orders"):
+        assert yaml.load(shop / member / "pubspec.yaml")["resolution"] == "workspace"
+
+
+def test_add_with_nothing_new(shop, scaffolder):
+    manifest = scaffolder.write_manifest("same.json", SHOP)
+    result = scaffolder.run(["--add", str(shop), "--manifest", str(manifest)])
+    assert "Nothing to add, the monorepo is up to date." in result.stdout
+
+
+def test_add_rejects_a_manifest_of_another_project(shop, scaffolder):
+    manifest = scaffolder.write_manifest(
+        "other.json", {**MORE, "project_name": "bank"}
+    )
+    result = scaffolder.run(
+        ["--add", str(shop), "--manifest", str(manifest)], check=False
+    )
+    assert result.returncode == 1
+    assert "Manifest is for project 'bank'" in result.stdout
+    assert not (shop / "apps/admin").exists()
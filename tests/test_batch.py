@@ -0,0 +1,83 @@
+import re
+
+from src.batch import (WorkspaceResult, batch_settings, build_batch,
+                       print_batch_report)
+from src.models import Manifest, UserInput
+
+ANSI = re.compile(r"\x1b\[[0-9;]*m")
+
+
+def manifest(name, **options):
+    return Manifest(UserInput(name, ["app"], []), options)
+
+
+def plain(text):
+    return ANSI.sub("", text)
+
+
+def test_batch_settings_merge_manifest_options(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    settings = batch_settings(
+        {"offline": False, "jobs": 4, "templates": None},
+        [
+            manifest("a"),
+            manifest("b", offline=True, **{"share-platform-files": True}),
+            manifest("c", templates="templates", golden="golden.tar"),
+        ],
+    )
+    assert settings == [
+        {"offline": False, "jobs": 4, "templates": None},
+        {"offline": True, "jobs": 4, "templates": None, "share_platform_files": True},
+        {
+            "offline": False,
+            "jobs": 4,
+            # resolved here, as the workers change directory
+            "templates": str(tmp_path / "templates"),
+            "golden": str(tmp_path / "golden.tar"),
+        },
+    ]
+
+
+def test_batch_settings_reject_options_of_the_whole_run(capsys):
+    assert batch_settings({}, [manifest("a"), manifest("b", resume=True)]) is None
+    assert "b: options resume cannot be set per workspace." in capsys.readouterr().out
+
+
+def test_duplicate_project_names_are_rejected(tmp_path, capsys):
+    manifests = [manifest("a"), manifest("b"), manifest("a")]
+    assert not build_batch(manifests, {}, tmp_path / "out", tmp_path / "logs")
+    assert "Duplicate project names: a" in capsys.readouterr().out
+    assert not (tmp_path / "out").exists()
+
+
+def test_existing_workspaces_are_rejected(tmp_path, capsys):
+    (tmp_path / "out" / "b").mkdir(parents=True)
+    manifests = [manifest("a"), manifest("b")]
+    assert not build_batch(manifests, {}, tmp_path / "out", tmp_path / "logs")
+    assert f"Already exist in {tmp_path / 'out'}: b" in capsys.readouterr().out
+    assert not (tmp_path / "out" / "a").exists()
+
+
+def test_print_batch_report(capsys):
+    results = [
+        WorkspaceResult("a", True, 2.0, "a.log", {"create": 1.0, "pub get": 3.0}),
+        WorkspaceResult("b", True, 2.0, "b.log", {"create": 2.0, "pub get": 0.5}),
+        # failed workspaces count, but their stages do not
+        WorkspaceResult("c", False, 1.0, "c.log", {"create": 9.0}),
+    ]
+    print_batch_report(results, 30.0)
+
+    lines = plain(capsys.readouterr().out).splitlines()
+    assert "Created 2 of 3 workspaces in 30.0s: 4.0 workspaces/min" in lines[0]
+    assert [line.split() for line in lines[2:]] == [
+        ["stage", "total", "s", "avg", "s", "max", "s"],
+        ["pub", "get", "3.500", "1.750", "3.000"],
+        ["create", "3.000", "1.500", "2.000"],
+    ]
+
+
+def test_print_batch_report_without_workspaces(capsys):
+    print_batch_report([], 0.0)
+    lines = plain(capsys.readouterr().out).splitlines()
+    assert len(lines) == 1
+    assert "Created 0 of 0 workspaces in 0.0s: 0.0 workspaces/min" in lines[0]
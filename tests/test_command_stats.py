@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+from src import command_stats
+from src.command_stats import percentile, print_command_stats
+
+
+@pytest.fixture
+def stats_file(tmp_path, monkeypatch):
+    path = tmp_path / "command_stats.jsonl"
+    monkeypatch.setattr(command_stats, "COMMAND_STATS_FILE", path)
+    return path
+
+
+def test_percentile_is_the_nearest_rank():
+    values = [float(n) for n in range(100, 0, -1)]
+    assert percentile(values, 0.5) == 50
+    assert percentile(values, 0.95) == 95
+    assert percentile(values, 0.99) == 99
+    assert percentile([7.0], 0.99) == 7
+
+
+def test_print_command_stats(stats_file, capsys):
+    outcomes = ["ok"] * 97 + ["failed"] * 2 + ["timeout"]
+    stats_file.write_text(
+        "".join(
+            json.dumps({"command": "flutter pub get", "seconds": n, "outcome": o})
+            + "\n"
+            for n, o in zip(range(1, 101), outcomes)
+        )
+        + "not json\n"
+    )
+
+    assert print_command_stats(lambda name: 300)
+
+    header, row = capsys.readouterr().out.splitlines()[-2:]
+    assert header.endswith("p50 s    p95 s    p99 s  limit s")
+    assert row.split() == [
+        *("flutter", "pub", "get"),
+        *("100", "2", "1"),
+        *("50.00", "95.00", "99.00", "300"),
+    ]
+
+
+def test_saved_runs_are_appended(stats_file, monkeypatch):
+    monkeypatch.setattr(command_stats, "_records", [])
+    command_stats.record_command("melos bs", 1.5, "ok")
+    command_stats.save_command_stats()
+    command_stats.record_command("melos bs", 2.5, "failed")
+    command_stats.save_command_stats()
+
+    runs = command_stats.load_command_stats()["melos bs"]
+    assert [(run["seconds"], run["outcome"]) for run in runs] == [
+        (1.5, "ok"),
+        (2.5, "failed"),
+    ]
@@ -0,0 +1,127 @@
+import subprocess
+
+import pytest
+
+from src.dependency_graph import (DependencyGraph, affected_members, build_graph,
+                                  changed_members, topological_order)
+from src.workspace_index import load_workspace_index
+
+
+def write_member(root, path, dependencies=(), dev_dependencies=()):
+    lines = [f"name: {path.split('/')[1]}"]
+    for section, names in (
+        ("dependencies", dependencies),
+        ("dev_dependencies", dev_dependencies),
+    ):
+        if names:
+            lines.append(f"{section}:")
+            lines += [f"  {name}: any" for name in names]
+    (root / path).mkdir(parents=True)
+    (root / path / "pubspec.yaml").write_text("\n".join(lines) + "\n")
+
+
+@pytest.fixture
+def monorepo(tmp_path):
+    write_member(tmp_path, "packages/core", ["intl"])
+    write_member(tmp_path, "packages/ui", ["core", "flutter"])
+    write_member(tmp_path, "packages/testing", ["core"])
+    write_member(tmp_path, "packages/payments", ["core"], ["testing"])
+    write_member(tmp_path, "apps/shop", ["ui", "payments"], ["testing"])
+    return tmp_path
+
+
+def graph_of(dependencies, dev_dependencies=None):
+    dev_dependencies = dev_dependencies or {name: set() for name in dependencies}
+    dependents = {name: set() for name in dependencies}
+    for kind in (dependencies, dev_dependencies):
+        for name, names in kind.items():
+            for dependency in names:
+                dependents[dependency].add(name)
+    return DependencyGraph(dependencies, dev_dependencies, dependents)
+
+
+def test_build_graph_keeps_only_workspace_members(monorepo):
+    graph = build_graph(load_workspace_index(monorepo))
+    assert graph.dependencies == {
+        "core": set(),
+        "ui": {"core"},
+        "testing": {"core"},
+        "payments": {"core"},
+        "shop": {"ui", "payments"},
+    }
+    assert graph.dev_dependencies["shop"] == {"testing"}
+    assert graph.dependents["testing"] == {"payments", "shop"}
+    assert graph.dependents["shop"] == set()
+
+
+def test_topological_order_is_stable(monorepo):
+    order, cyclic = topological_order(build_graph(load_workspace_index(monorepo)))
+    assert order == ["core", "payments", "testing", "ui", "shop"]
+    assert cyclic == []
+
+
+def test_cycles_are_reported_and_left_out():
+    graph = graph_of({"a": {"c"}, "b": {"a"}, "c": {"b"}, "d": set(), "e": {"a"}})
+    order, cyclic = topological_order(graph)
+    assert order == ["d"]
+    assert cyclic == ["a", "b", "c", "e"]
+
+
+def test_dev_dependency_cycles_are_allowed():
+    graph = graph_of(
+        {"a": set(), "b": {"a"}}, dev_dependencies={"a": {"b"}, "b": set()}
+    )
+    assert topological_order(graph) == (["a", "b"], [])
+
+
+def test_affected_members_follow_dependents_and_dev_dependents(monorepo):
+    graph = build_graph(load_workspace_index(monorepo))
+    assert affected_members(graph, {"testing"}) == {"testing", "payments", "shop"}
+    assert affected_members(graph, {"ui"}) == {"ui", "shop"}
+    assert affected_members(graph, {"core"}) == set(graph.dependencies)
+    assert affected_members(graph, set()) == set()
+
+
+def test_changed_members(monorepo):
+    index = load_workspace_index(monorepo)
+    assert changed_members(
+        index,
+        monorepo,
+        [
+            "packages/ui/lib/ui.dart",
+            str(monorepo / "apps/shop/lib/main.dart"),
+            "README.md",
+            "/elsewhere/packages/core/lib/core.dart",
+        ],
+    ) == {"ui", "shop"}
+    assert len(changed_members(index, monorepo, ["pubspec.lock"])) == 5
+
+
+def test_graph_scope_when_nothing_is_affected(shop, scaffolder):
+    (shop / "packages/broken").mkdir()
+    (shop / "packages/broken/pubspec.yaml").write_text("name: [\n")
+
+    result = scaffolder.run(
+        ["graph", "--path", str(shop), "--changed", "README.md", "--format", "scope"]
+    )
+
+    # a scope that matches no package, since melos runs everywhere without one
+    assert result.stdout == "--scope=no-affected-members\n"
+    assert "Failed to read packages/broken/pubspec.yaml" in result.stderr
+    assert "No member is affected by the changes." in result.stderr
+
+
+def test_graph_messages_go_to_stderr(shop, scaffolder):
+    git = ["git", "-c", "user.name=test", "-c", "user.email=test@example.com"]
+    subprocess.run([*git, "init", "-q"], cwd=shop, check=True)
+    subprocess.run([*git, "add", "."], cwd=shop, check=True)
+    subprocess.run([*git, "commit", "-qm", "scaffold"], cwd=shop, check=True)
+    (shop / "packages/payments/lib/payments.dart").write_text("// changed\n")
+
+    result = scaffolder.run(
+        ["graph", "--path", str(shop), "--since", "HEAD"],
+        env={"MONO_PY_TIMEOUT_SCALE": "fast"},
+    )
+
+    assert result.stdout == "payments\n"
+    assert "Ignoring MONO_PY_TIMEOUT_SCALE='fast'" in result.stderr
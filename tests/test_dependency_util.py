@@ -0,0 +1,34 @@
+from collections import Counter
+from pathlib import Path
+
+from src import dependency_util
+from src.dependency_util import DependencyKind, flush_dependencies, register_dependency
+
+
+def test_registered_dependencies_are_added_in_one_command(tmp_path, monkeypatch):
+    calls = []
+
+    def add_packages(pub_path, specs):
+        calls.append(specs)
+        return True
+
+    monkeypatch.setattr(dependency_util, "add_packages", add_packages)
+    register_dependency(tmp_path, "intl")
+    register_dependency(tmp_path, "melos", DependencyKind.DEV)
+    register_dependency(tmp_path, "flutter_localizations", DependencyKind.SDK)
+    # the last registration of a package wins
+    register_dependency(tmp_path, "melos", DependencyKind.REGULAR)
+
+    assert flush_dependencies(tmp_path)
+    assert flush_dependencies(tmp_path)
+
+    assert calls == [['intl', 'melos', 'flutter_localizations:{"sdk":"flutter"}']]
+
+
+def test_scaffold_runs_one_pub_add_per_package(shop, scaffolder):
+    pub_adds = Counter(
+        Path(cwd).relative_to(shop).as_posix()
+        for cwd, command in (line.split("\t") for line in scaffolder.tool_commands())
+        if command.startswith("flutter pub add")
+    )
+    assert pub_adds == {".": 1, "packages/shop_resources": 1}
@@ -0,0 +1,68 @@
+import os
+import stat
+
+import pytest
+
+from src.emit_util import atomic_writer, emit_counts, emit_file
+
+
+@pytest.fixture
+def counts():
+    """
+    Returns the files written and skipped since the test started.
+    """
+    start = emit_counts()
+    return lambda: {key: emit_counts()[key] - start[key] for key in start}
+
+
+def test_emit_file_skips_unchanged_content(tmp_path, counts):
+    path = tmp_path / "lib" / "main.dart"
+    assert emit_file(path, "void main() {}\n")
+    os.utime(path, ns=(0, 0))
+
+    assert not emit_file(path, b"void main() {}\n")
+    assert path.stat().st_mtime_ns == 0
+    assert emit_file(path, "void main() { run(); }\n")
+    assert path.read_text() == "void main() { run(); }\n"
+    assert counts() == {"written": 2, "skipped": 1}
+    assert [p.name for p in path.parent.iterdir()] == ["main.dart"]
+
+
+def test_new_files_get_the_umask_mode_and_existing_files_keep_theirs(tmp_path):
+    # os.umask only reads the mask by setting it
+    umask = os.umask(0o022)
+    os.umask(umask)
+    path = tmp_path / "run.sh"
+    emit_file(path, "echo one\n")
+    assert stat.S_IMODE(path.stat().st_mode) == 0o666 & ~umask
+
+    path.chmod(0o755)
+    emit_file(path, "echo two\n")
+    assert stat.S_IMODE(path.stat().st_mode) == 0o755
+
+
+def test_atomic_writer_skips_unchanged_content(tmp_path, counts):
+    path = tmp_path / "app_en.arb"
+    with atomic_writer(path, encoding="utf-8") as f:
+        f.write("{}\n")
+    os.utime(path, ns=(0, 0))
+    with atomic_writer(path, encoding="utf-8") as f:
+        f.write("{")
+        f.write("}\n")
+
+    assert path.stat().st_mtime_ns == 0
+    assert counts() == {"written": 1, "skipped": 1}
+
+
+def test_atomic_writer_keeps_the_file_after_an_error(tmp_path, counts):
+    path = tmp_path / "app_en.arb"
+    path.write_text("{}\n")
+    with pytest.raises(RuntimeError):
+        with atomic_writer(path) as f:
+            f.write('{"partial": ')
+            raise RuntimeError("table error")
+
+    assert path.read_text() == "{}\n"
+    assert [p.name for p in tmp_path.iterdir()] == ["app_en.arb"]
+    assert counts() == {"written": 0, "skipped": 0}
+
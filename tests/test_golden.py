@@ -0,0 +1,46 @@
+from pathlib import Path
+
+from ruamel.yaml import YAML
+
+from conftest import SHOP
+
+yaml = YAML(typ="safe")
+
+# state of the scaffolder and the toolchain, not part of the monorepo
+IGNORED = {".mono_py", ".dart_tool", "pubspec.lock"}
+
+
+def monorepo_files(root: Path):
+    return {
+        path.relative_to(root): path
+        for path in root.rglob("*")
+        if path.is_file() and not IGNORED & set(path.relative_to(root).parts)
+    }
+
+
+def test_golden_round_trip_matches_a_full_scaffold(scaffolder, shop):
+    archive = scaffolder.work_dir / "golden.tar.gz"
+    scaffolder.run(["export-golden", "--output", str(archive)])
+    golden_dir = scaffolder.work_dir / "from_golden"
+    golden_dir.mkdir()
+    manifest = scaffolder.write_manifest("shop.json", SHOP)
+    commands_before = len(scaffolder.tool_commands())
+
+    scaffolder.run(
+        ["--golden", str(archive), "--manifest", str(manifest)], cwd=golden_dir
+    )
+
+    expected = monorepo_files(shop)
+    actual = monorepo_files(golden_dir / "shop")
+    assert sorted(actual) == sorted(expected)
+    for relative, path in expected.items():
+        if relative.name == "pubspec.yaml":
+            # the layout of the YAML may differ, its content may not
+            assert yaml.load(actual[relative]) == yaml.load(path), relative
+        else:
+            assert actual[relative].read_bytes() == path.read_bytes(), relative
+    # only the final pub get runs, every other step comes from the archive
+    new_commands = scaffolder.tool_commands()[commands_before:]
+    assert [command.split("\t")[1] for command in new_commands] == [
+        "flutter pub get"
+    ]
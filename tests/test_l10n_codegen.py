@@ -0,0 +1,119 @@
+import json
+
+import pytest
+
+from src.l10n_codegen import generate_files, load_l10n_config
+
+L10N_YAML = """\
+arb-dir: lib/l10n
+template-arb-file: app_en.arb
+output-localization-file: app_localizations.dart
+output-class: AppLocalizations
+nullable-getter: false
+synthetic-package: false
+"""
+
+
+def write_package(root, arb_files):
+    (root / "l10n.yaml").write_text(L10N_YAML)
+    arb_dir = root / "lib" / "l10n"
+    arb_dir.mkdir(parents=True)
+    for locale, messages in arb_files.items():
+        (arb_dir / f"app_{locale}.arb").write_text(
+            json.dumps(messages, ensure_ascii=False), encoding="utf-8"
+        )
+    return arb_dir
+
+
+def generate(root):
+    return {
+        path.name: text for path, text in generate_files(load_l10n_config(root)).items()
+    }
+
+
+@pytest.fixture
+def chinese(tmp_path):
+    greeting = {"hello": "Hello {name}", "@hello": {"placeholders": {"name": {}}}}
+    write_package(
+        tmp_path,
+        {
+            "en": greeting,
+            "zh": {"hello": "你好 {name}"},
+            "zh_Hans": {"hello": "你好 {name}!"},
+            "zh_Hans_CN": {"hello": "你好 {name}!!"},
+            "zh_TW": {"hello": "妳好 {name}"},
+        },
+    )
+    return generate(tmp_path)
+
+
+def test_supported_locales_use_every_subtag(chinese):
+    assert (
+        "  static const List<Locale> supportedLocales = <Locale>[\n"
+        "    Locale('en'),\n"
+        "    Locale('zh'),\n"
+        "    Locale.fromSubtags(languageCode: 'zh', scriptCode: 'Hans'),\n"
+        "    Locale.fromSubtags(languageCode: 'zh', countryCode: 'CN', "
+        "scriptCode: 'Hans'),\n"
+        "    Locale('zh', 'TW'),\n"
+        "  ];\n"
+    ) in chinese["app_localizations.dart"]
+
+
+def test_lookup_tries_the_most_specific_locale_first(chinese):
+    lookup = chinese["app_localizations.dart"].split(
+        "AppLocalizations lookupAppLocalizations(Locale locale) {"
+    )[1]
+    full = lookup.index("case 'zh_Hans_CN':\n      return AppLocalizationsZhHansCn();")
+    script = lookup.index("case 'Hans':\n            return AppLocalizationsZhHans();")
+    country = lookup.index("case 'TW':\n            return AppLocalizationsZhTw();")
+    language = lookup.index("case 'zh':\n      return AppLocalizationsZh();")
+    assert full < script < country < language
+    # zh_Hans_CN is only matched by its full name
+    assert lookup.count("AppLocalizationsZhHansCn()") == 1
+
+
+def test_locales_of_a_language_share_its_file(chinese):
+    assert set(chinese) == {
+        "app_localizations.dart",
+        "app_localizations_en.dart",
+        "app_localizations_zh.dart",
+    }
+    zh = chinese["app_localizations_zh.dart"]
+    assert "class AppLocalizationsZh extends AppLocalizations {" in zh
+    assert (
+        "class AppLocalizationsZhHansCn extends AppLocalizationsZh {\n"
+        "  AppLocalizationsZhHansCn([String locale = 'zh_Hans_CN'])"
+    ) in zh
+    assert "    return '你好 $name!!';" in zh
+    assert "    return '妳好 $name';" in zh
+
+
+def test_messages_with_placeholders(tmp_path):
+    write_package(
+        tmp_path,
+        {
+            "en": {
+                "total": "{count, plural, =0{None} =1{One} other{{count} items}}",
+                "@total": {"placeholders": {"count": {"type": "int"}}},
+                "hello": "Hello {name}, it's {day}",
+                "@hello": {"placeholders": {"name": {"type": "String"}, "day": {}}},
+            }
+        },
+    )
+    files = generate(tmp_path)
+    assert "  String total(int count);\n" in files["app_localizations.dart"]
+    assert "  String hello(String name, Object day);\n" in (
+        files["app_localizations.dart"]
+    )
+    en = files["app_localizations_en.dart"]
+    assert "    return 'Hello $name, it\\'s $day';" in en
+    assert (
+        "      zero: 'None',\n      one: 'One',\n      other: '$count items',\n"
+    ) in en
+
+
+def test_unsupported_locale_names_are_rejected(tmp_path):
+    write_package(tmp_path, {"en": {"hello": "Hello"}, "zh_Hans_CN_x": {}})
+    with pytest.raises(ValueError, match="unsupported locale 'zh_Hans_CN_x'"):
+        generate(tmp_path)
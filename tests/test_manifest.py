@@ -0,0 +1,90 @@
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+from conftest import REPO_ROOT, SHOP
+from main import MANIFEST_OPTIONS, build_parser, manifest_option_values
+
+
+def test_options_take_the_types_of_their_flags():
+    assert manifest_option_values(
+        {"offline": True, "jobs": 4, "templates": "templates", "no_progress": False}
+    ) == {"offline": True, "jobs": 4, "templates": "templates", "no_progress": False}
+
+
+def test_every_option_is_a_flag():
+    flags = {
+        option[2:]: action.dest
+        for action in build_parser()._actions
+        for option in action.option_strings
+        if option.startswith("--")
+    }
+    for name, (dest, _) in MANIFEST_OPTIONS.items():
+        assert flags[name] == dest
+
+
+@pytest.mark.parametrize(
+    "options, message",
+    [
+        ({"offline": "yes"}, "'offline' must be true or false, got 'yes'"),
+        ({"jobs": "4"}, "'jobs' must be a number, got '4'"),
+        ({"jobs": True}, "'jobs' must be a number, got True"),
+        ({"golden": 1}, "'golden' must be a string, got 1"),
+        ({"colour": True}, "Unknown manifest option 'colour'"),
+        # set by the manifest itself, not an option
+        ({"add": "monorepo"}, "Unknown manifest option 'add'"),
+        ({"manifest": "other.yaml"}, "Unknown manifest option 'manifest'"),
+    ],
+)
+def test_invalid_options_are_rejected(capsys, options, message):
+    assert manifest_option_values(options) is None
+    assert message in capsys.readouterr().out
+
+
+def test_wrong_option_type_stops_the_scaffold(scaffolder):
+    manifest = scaffolder.write_manifest(
+        "shop.json", {"project_name": "shop", "options": {"jobs": "2"}}
+    )
+    result = scaffolder.run(["--manifest", str(manifest)], check=False)
+    assert result.returncode == 1
+    assert "'jobs' must be a number" in result.stdout
+    assert not (scaffolder.work_dir / "shop").exists()
+
+
+def run_on_terminal(scaffolder, options):
+    """
+    Scaffolds SHOP with stdout on a pseudo terminal and returns the output.
+    """
+    manifest = scaffolder.write_manifest("shop.json", {**SHOP, "options": options})
+    controller, terminal = os.openpty()
+    process = subprocess.Popen(
+        [sys.executable, str(REPO_ROOT / "main.py"), "--manifest", str(manifest)],
+        cwd=scaffolder.work_dir,
+        env={**scaffolder.env, "TERM": "xterm", "FAKE_TOOLCHAIN_LATENCY": "0.3"},
+        stdout=terminal,
+        stderr=subprocess.DEVNULL,
+    )
+    os.close(terminal)
+    chunks = []
+    while True:
+        try:
+            chunk = os.read(controller, 1 << 16)
+        except OSError:
+            break
+        if not chunk:
+            break
+        chunks.append(chunk)
+    os.close(controller)
+    assert process.wait() == 0
+    return b"".join(chunks).decode("utf-8", errors="replace")
+
+
+@pytest.mark.skipif(os.name != "posix", reason="needs a pseudo terminal")
+def test_no_progress_from_the_manifest(scaffolder):
+    # the live view clears its previous frame with ESC [ J before redrawing
+    assert "\033[J" in run_on_terminal(scaffolder, {})
+    shutil.rmtree(scaffolder.work_dir / "shop")
+    assert "\033[J" not in run_on_terminal(scaffolder, {"no-progress": True})
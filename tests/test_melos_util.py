@@ -0,0 +1,42 @@
+import pytest
+
+from src import pub_util
+from src.melos_util import melos_command, melos_invocation
+
+
+@pytest.mark.parametrize("bootstrap", ["bs", "bootstrap"])
+def test_bootstrap_is_scoped_with_flags(bootstrap, monkeypatch):
+    monkeypatch.setattr(pub_util, "_offline", True)
+    assert melos_invocation([bootstrap], ["app", "core"]) == (
+        ["melos", bootstrap, "--offline", "--scope=app", "--scope=core"],
+        {},
+    )
+
+
+def test_exec_scopes_go_before_the_command():
+    assert melos_invocation(["exec", "--", "flutter", "test"], ["core"]) == (
+        ["melos", "exec", "--scope=core", "--", "flutter", "test"],
+        {},
+    )
+
+
+def test_scripts_are_scoped_through_the_environment():
+    assert melos_invocation(["run", "loc"], ["app", "core"]) == (
+        ["melos", "run", "loc"],
+        {"MELOS_PACKAGES": "app,core"},
+    )
+
+
+def test_unscoped_commands_run_for_every_package():
+    assert melos_invocation(["bs"]) == (["melos", "bs"], {})
+    assert melos_invocation(["loc"]) == (["melos", "loc"], {})
+
+
+def test_scope_of_bootstrap_reaches_melos(tmp_path, fake_toolchain):
+    (tmp_path / "pubspec.yaml").write_text("name: shop\n")
+    assert melos_command(tmp_path, ["bs"], packages=["app"])
+    assert melos_command(tmp_path, ["bs"], packages=[])
+    # an empty scope runs nothing
+    assert fake_toolchain.read_text().splitlines() == [
+        f"{tmp_path}\tmelos bs --scope=app"
+    ]
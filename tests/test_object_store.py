@@ -0,0 +1,65 @@
+import os
+import stat
+
+import pytest
+
+from src import object_store
+from src.object_store import place_shared_file
+
+PNG = b"\x89PNG\r\n\x1a\n\x00\xff"
+
+
+@pytest.fixture
+def store_dir(tmp_path, monkeypatch):
+    store_dir = tmp_path / "objects"
+    # the file system of the test run decides nothing
+    monkeypatch.setitem(object_store._reflink_supported, store_dir, False)
+    return store_dir
+
+
+def stored_objects(store_dir):
+    return [path for path in store_dir.rglob("*") if path.is_file()]
+
+
+def test_read_only_files_are_hardlinked(tmp_path, store_dir):
+    first, second = tmp_path / "a.txt", tmp_path / "b.txt"
+    assert place_shared_file(store_dir, first, b"shared", 0o100444) == "hardlink"
+    assert place_shared_file(store_dir, second, b"shared", 0o100444) == "hardlink"
+
+    assert os.path.samefile(first, second)
+    assert first.stat().st_nlink == 3
+    assert len(stored_objects(store_dir)) == 1
+
+
+def test_writable_binaries_are_copied(tmp_path, store_dir):
+    icons = [tmp_path / f"ic_launcher_{i}.png" for i in range(2)]
+    for icon in icons:
+        assert place_shared_file(store_dir, icon, PNG, 0o100644) == "copy"
+
+    assert not os.path.samefile(*icons)
+    for icon in icons:
+        assert icon.read_bytes() == PNG
+        assert stat.S_IMODE(icon.stat().st_mode) == 0o644
+        assert icon.stat().st_nlink == 1
+    icons[0].write_bytes(b"edited")
+    assert icons[1].read_bytes() == PNG
+
+
+def test_copies_are_not_stored_without_reflinks(tmp_path, store_dir):
+    target = tmp_path / "build.gradle"
+    assert place_shared_file(store_dir, target, b"plugins {}", 0o100644) == "copy"
+    assert target.read_bytes() == b"plugins {}"
+    assert stored_objects(store_dir) == []
+
+
+def test_reflinks_are_stored(tmp_path, store_dir, monkeypatch):
+    def fake_reflink(store_dir, source, target):
+        target.write_bytes(source.read_bytes())
+        return True
+
+    monkeypatch.setitem(object_store._reflink_supported, store_dir, True)
+    monkeypatch.setattr(object_store, "_reflink", fake_reflink)
+    target = tmp_path / "build.gradle"
+    assert place_shared_file(store_dir, target, b"plugins {}", 0o100644) == "reflink"
+    assert stat.S_IMODE(target.stat().st_mode) == 0o644
+    assert len(stored_objects(store_dir)) == 1
@@ -0,0 +1,52 @@
+import threading
+import time
+
+from src import template_cache
+from src.package_util import create_flutter_templates
+from src.process_util import CancelScope, cancel_scope
+
+
+def test_cancelling_the_parent_scope_stops_the_templates(
+    tmp_path, fake_toolchain, monkeypatch, capsys
+):
+    # a cold template cache, so every task waits on a slow `flutter create`
+    monkeypatch.setattr(template_cache, "TEMPLATE_CACHE_DIR", tmp_path / "templates")
+    monkeypatch.setenv("FAKE_TOOLCHAIN_LATENCY_CREATE", "30")
+    monorepo_path = tmp_path / "shop"
+    parent = CancelScope()
+    results = []
+
+    def create():
+        with cancel_scope(parent):
+            results.append(
+                create_flutter_templates(monorepo_path, ["a", "b"], ["c", "d"])
+            )
+
+    thread = threading.Thread(target=create)
+    start = time.perf_counter()
+    thread.start()
+    while "flutter create" not in (
+        fake_toolchain.read_text() if fake_toolchain.exists() else ""
+    ):
+        time.sleep(0.05)
+    parent.cancel()
+    thread.join(timeout=10)
+
+    assert not thread.is_alive()
+    assert time.perf_counter() - start < 10
+    assert results == [False]
+    out = capsys.readouterr().out
+    assert "Cancelled 4 apps and packages" in out
+    assert "after a failure" not in out
+    assert "Template queue time" not in out
+    assert not (monorepo_path / "apps" / "a").exists()
+
+
+def test_a_failed_template_cancels_the_others(
+    tmp_path, fake_toolchain, monkeypatch, capsys
+):
+    monkeypatch.setattr(template_cache, "TEMPLATE_CACHE_DIR", tmp_path / "templates")
+    monkeypatch.setenv("FAKE_TOOLCHAIN_FAIL", "flutter create --no-pub -t package")
+
+    assert not create_flutter_templates(tmp_path / "shop", ["a"], ["c", "d"])
+    assert "apps and packages after a failure" in capsys.readouterr().out
@@ -0,0 +1,120 @@
+import subprocess
+import threading
+import time
+
+import pytest
+
+from src import command_stats, process_util
+from src.process_util import (CancelScope, CommandCancelled, cancel_scope,
+                              command_timeout, run_command)
+
+
+@pytest.fixture
+def package(tmp_path):
+    (tmp_path / "pubspec.yaml").write_text("name: package\n")
+    return tmp_path
+
+
+@pytest.fixture
+def records(monkeypatch):
+    records = []
+    monkeypatch.setattr(command_stats, "_records", records)
+    return records
+
+
+def runs(tool_log, command):
+    return [line for line in tool_log.read_text().splitlines() if command in line]
+
+
+def test_a_command_is_killed_after_its_timeout(
+    package, fake_toolchain, monkeypatch, records
+):
+    monkeypatch.setenv("FAKE_TOOLCHAIN_LATENCY", "30")
+    start = time.perf_counter()
+    with pytest.raises(subprocess.TimeoutExpired):
+        run_command(["flutter", "create", "app"], cwd=package, timeout=0.5)
+    assert time.perf_counter() - start < 5
+    assert [record["outcome"] for record in records] == ["timeout"]
+
+
+def test_output_held_open_by_a_child_does_not_outlive_the_timeout(tmp_path):
+    start = time.perf_counter()
+    with pytest.raises(subprocess.TimeoutExpired):
+        run_command(["sh", "-c", "sleep 30 & echo started"], timeout=1)
+    assert time.perf_counter() - start < 5
+
+
+def test_cancelling_a_scope_kills_its_commands(package, fake_toolchain, monkeypatch):
+    monkeypatch.setenv("FAKE_TOOLCHAIN_LATENCY", "30")
+    parent = CancelScope()
+    scope = CancelScope(parent)
+    errors = []
+
+    def run():
+        with cancel_scope(scope):
+            try:
+                run_command(["flutter", "pub", "get"], cwd=package)
+            except CommandCancelled as e:
+                errors.append(e)
+
+    thread = threading.Thread(target=run)
+    start = time.perf_counter()
+    thread.start()
+    while not fake_toolchain.exists():
+        time.sleep(0.05)
+    parent.cancel()
+    thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    assert time.perf_counter() - start < 5
+    assert len(errors) == 1
+    # commands started after the cancel fail at once
+    with cancel_scope(scope), pytest.raises(CommandCancelled):
+        run_command(["flutter", "pub", "get"], cwd=package)
+    assert len(runs(fake_toolchain, "flutter pub get")) == 1
+
+
+def test_transient_failures_are_retried(package, fake_toolchain, monkeypatch):
+    monkeypatch.setattr(process_util, "RETRY_BACKOFF", 0.01)
+    monkeypatch.setenv("FAKE_TOOLCHAIN_FAIL", "flutter pub get")
+    monkeypatch.setenv("FAKE_TOOLCHAIN_FAIL_CODE", "69")
+    monkeypatch.setenv("FAKE_TOOLCHAIN_FAIL_TIMES", "2")
+
+    result = run_command(["flutter", "pub", "get"], cwd=package, text=True)
+
+    assert result.returncode == 0
+    assert "Got dependencies!" in result.stdout
+    assert len(runs(fake_toolchain, "flutter pub get")) == 3
+
+
+@pytest.mark.parametrize(
+    "cmd, code",
+    [
+        # the local pub cache does not get better by waiting
+        (["flutter", "pub", "get", "--offline"], "69"),
+        (["flutter", "pub", "get"], "1"),
+    ],
+)
+def test_offline_and_other_failures_are_not_retried(
+    package, fake_toolchain, monkeypatch, cmd, code
+):
+    monkeypatch.setattr(process_util, "RETRY_BACKOFF", 0.01)
+    monkeypatch.setenv("FAKE_TOOLCHAIN_FAIL", "flutter pub get")
+    monkeypatch.setenv("FAKE_TOOLCHAIN_FAIL_CODE", code)
+
+    with pytest.raises(subprocess.CalledProcessError) as error:
+        run_command(cmd, cwd=package)
+    assert error.value.returncode == int(code)
+    assert len(runs(fake_toolchain, "flutter pub get")) == 1
+
+
+@pytest.mark.parametrize(
+    "scale, timeout",
+    [(None, 300), ("2.5", 750), ("0", 300), ("-1", 300), ("nan", 300), ("x", 300)],
+)
+def test_timeout_scale(monkeypatch, scale, timeout):
+    if scale is None:
+        monkeypatch.delenv("MONO_PY_TIMEOUT_SCALE", raising=False)
+    else:
+        monkeypatch.setenv("MONO_PY_TIMEOUT_SCALE", scale)
+    assert command_timeout("flutter pub get") == timeout
@@ -0,0 +1,31 @@
+from conftest import SHOP
+
+
+def test_resume_skips_the_finished_steps(scaffolder):
+    manifest = scaffolder.write_manifest("shop.json", SHOP)
+    failed = scaffolder.run(
+        ["--manifest", str(manifest)],
+        check=False,
+        env={"FAKE_TOOLCHAIN_FAIL": "melos bs"},
+    )
+    assert failed.returncode == 1
+    assert "Run again with --resume to continue it." in failed.stdout
+    created = len([c for c in scaffolder.tool_commands() if "flutter create" in c])
+
+    resumed = scaffolder.run(["--resume", "--manifest", str(manifest)])
+
+    assert "Resuming setup in:" in resumed.stdout
+    for step in ("root_pubspec", "create_templates", "localization_files"):
+        assert f"Skipping finished step '{step}'" in resumed.stdout
+    assert "Skipping finished step 'bootstrap'" not in resumed.stdout
+    commands = scaffolder.tool_commands()
+    assert len([c for c in commands if "flutter create" in c]) == created
+    assert any(c.endswith("melos bs") for c in commands)
+    assert (scaffolder.work_dir / "shop/packages/shop_resources/l10n.yaml").is_file()
+
+
+def test_existing_folder_needs_resume(scaffolder, shop):
+    manifest = scaffolder.write_manifest("again.json", SHOP)
+    result = scaffolder.run(["--manifest", str(manifest)], check=False)
+    assert result.returncode == 1
+    assert "Folder 'shop' already exists." in result.stdout
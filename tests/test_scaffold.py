@@ -0,0 +1,112 @@
+import json
+
+import pytest
+from ruamel.yaml import YAML
+
+from conftest import FIXTURES
+
+yaml = YAML(typ="safe")
+
+
+def test_root_pubspec_lists_every_member(shop):
+    pubspec = yaml.load(shop / "pubspec.yaml")
+    assert pubspec["name"] == "shop"
+    assert pubspec["workspace"] == [
+        "packages/shop_resources",
+        "packages/shop_components",
+        "packages/payments",
+        "apps/customer",
+    ]
+    assert "melos" in pubspec["dev_dependencies"]
+
+
+def test_members_resolve_from_the_workspace(shop):
+    for member in ("apps/customer", "packages/payments", "packages/shop_resources"):
+        assert yaml.load(shop / member / "pubspec.yaml")["resolution"] == "workspace"
+
+    dependencies = yaml.load(shop / "packages/shop_resources/pubspec.yaml")[
+        "dependencies"
+    ]
+    assert {"google_fonts", "intl", "flutter_localizations"} <= set(dependencies)
+    assert dependencies["flutter_localizations"] == {"sdk": "flutter"}
+
+
+def test_melos_yaml(shop):
+    melos = yaml.load(shop / "melos.yaml")
+    assert melos["name"] == "shop"
+    assert melos["packages"] == ["packages/**", "apps/**"]
+    assert melos["scripts"]["loc"]["packageFilters"] == {"fileExists": "l10n.yaml"}
+    assert melos["scripts"]["release"]["packageFilters"]["ignore"] == [
+        "shop_resources",
+        "shop_components",
+        "payments",
+    ]
+
+
+@pytest.mark.parametrize(
+    "member, arb_dir",
+    [
+        ("packages/shop_resources", "lib/l10n"),
+        # apps read the ARB files of the resource package
+        ("apps/customer", "../../packages/shop_resources/lib/l10n"),
+    ],
+)
+def test_l10n_yaml_arb_dir(shop, member, arb_dir):
+    config = yaml.load(shop / member / "l10n.yaml")
+    assert config == {
+        "arb-dir": arb_dir,
+        "template-arb-file": "app_en.arb",
+        "output-localization-file": "app_localizations.dart",
+        "output-class": "AppLocalizations",
+        "nullable-getter": False,
+        "synthetic-package": False,
+    }
+    assert (shop / member / arb_dir / "app_en.arb").is_file()
+
+
+def test_arb_files(shop):
+    l10n = shop / "packages/shop_resources/lib/l10n"
+    assert sorted(path.name for path in l10n.glob("*.arb")) == [
+        "app_en.arb",
+        "app_ne.arb",
+    ]
+    ne = json.loads((l10n / "app_ne.arb").read_text(encoding="utf-8"))
+    assert ne["@@locale"] == "ne"
+    assert ne["greeting"] == "नमस्कार {username}"
+    assert ne["@greeting"]["placeholders"] == {
+        "username": {"type": "String", "example": "John"}
+    }
+
+
+def test_localizations_are_generated_natively(shop, scaffolder):
+    l10n = shop / "packages/shop_resources/lib/l10n"
+    main_file = (l10n / "app_localizations.dart").read_text(encoding="utf-8")
+    assert "    Locale('en'),\n    Locale('ne'),\n" in main_file
+    assert "  String greeting(String username);\n" in main_file
+
+    ne = (l10n / "app_localizations_ne.dart").read_text(encoding="utf-8")
+    assert "class AppLocalizationsNe extends AppLocalizations {" in ne
+    assert "  String greeting(String username) {\n    return 'नमस्कार $username';" in ne
+    assert "intl.NumberFormat.compact(" in ne
+
+    assert not any("gen-l10n" in line for line in scaffolder.tool_commands())
+
+
+# The templates as src/templates.py rendered them before the template
+# registry, for project "shop" and app "customer". Only the resources import
+# of the app differs: it used to capitalize the package file name.
+@pytest.mark.parametrize(
+    "path, fixture",
+    [
+        ("packages/shop_resources/lib/shop_resources.dart", "shop_resources.dart"),
+        (
+            "packages/shop_resources/lib/src/shop_localization.dart",
+            "shop_localization.dart",
+        ),
+        ("packages/shop_resources/lib/src/shop_theme.dart", "shop_theme.dart"),
+        ("apps/customer/lib/app/customer_app.dart", "customer_app.dart"),
+    ],
+)
+def test_templates_match_the_baseline(shop, path, fixture):
+    expected = (FIXTURES / "baseline_templates" / fixture).read_text()
+    assert (shop / path).read_text() == expected
@@ -0,0 +1,58 @@
+import os
+
+import pytest
+
+from conftest import FAKE_TOOLCHAIN
+from src import toolchain
+from src.toolchain import probe_toolchain
+
+
+@pytest.fixture
+def probe(tmp_path, fake_toolchain, monkeypatch):
+    """
+    Probes melos from a wrapper in a bin folder of the test, like a new run
+    of the tool would, and returns the version commands each probe ran.
+    """
+    monkeypatch.setattr(toolchain, "TOOLCHAIN_CACHE_FILE", tmp_path / "toolchain.json")
+
+    def probe_melos(bin_dir):
+        monkeypatch.setattr(toolchain, "_probed", {})
+        monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+        before = fake_toolchain.read_text() if fake_toolchain.exists() else ""
+        info = probe_toolchain(["melos"])["melos"]
+        assert info.available
+        assert info.path == str(bin_dir / "melos")
+        return fake_toolchain.read_text()[len(before):].count("melos --version")
+
+    return probe_melos
+
+
+def melos_wrapper(bin_dir):
+    bin_dir.mkdir()
+    wrapper = bin_dir / "melos"
+    wrapper.write_text(f'#!/bin/sh\nexec "{FAKE_TOOLCHAIN / "melos"}" "$@"\n')
+    wrapper.chmod(0o755)
+    return wrapper
+
+
+def test_warm_probes_start_no_process(tmp_path, probe):
+    melos_wrapper(tmp_path / "bin")
+    assert probe(tmp_path / "bin") == 1
+    assert probe(tmp_path / "bin") == 0
+
+
+def test_a_changed_binary_is_probed_again(tmp_path, probe):
+    wrapper = melos_wrapper(tmp_path / "bin")
+    assert probe(tmp_path / "bin") == 1
+    stat = wrapper.stat()
+    os.utime(wrapper, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert probe(tmp_path / "bin") == 1
+    assert probe(tmp_path / "bin") == 0
+
+
+def test_another_binary_in_path_is_probed_again(tmp_path, probe):
+    melos_wrapper(tmp_path / "bin")
+    melos_wrapper(tmp_path / "other_bin")
+    assert probe(tmp_path / "bin") == 1
+    assert probe(tmp_path / "other_bin") == 1
+    assert probe(tmp_path / "bin") == 1
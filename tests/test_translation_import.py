@@ -0,0 +1,161 @@
+import csv
+import json
+
+import pytest
+
+from src import translation_import
+from src.translation_import import import_translations
+
+TEMPLATE = {
+    "@@locale": "en",
+    "greeting": "Hello {name}",
+    "@greeting": {"placeholders": {"name": {"type": "String"}}},
+}
+
+ROWS = [
+    {
+        "key": "greeting",
+        "description": "Greets",
+        "en": "Hi {name}",
+        "ne": "नमस्ते {name}",
+    },
+    {"key": "bye", "description": "", "en": "Bye", "ne": ""},
+]
+
+
+@pytest.fixture
+def l10n_dir(tmp_path):
+    (tmp_path / "pubspec.yaml").write_text("name: shop\n")
+    l10n_dir = tmp_path / "packages/shop_resources/lib/l10n"
+    l10n_dir.mkdir(parents=True)
+    (l10n_dir / "app_en.arb").write_text(json.dumps(TEMPLATE), encoding="utf-8")
+    return l10n_dir
+
+
+def write_table(path, rows):
+    if path.suffix == ".json":
+        # the key is the name of the object, not a column
+        data = {
+            row["key"]: {column: v for column, v in row.items() if column != "key"}
+            for row in rows
+        }
+        path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    elif path.suffix == ".jsonl":
+        path.write_text(
+            "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows),
+            encoding="utf-8",
+        )
+    else:
+        delimiter = "\t" if path.suffix == ".tsv" else ","
+        with path.open("w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]), delimiter=delimiter)
+            writer.writeheader()
+            writer.writerows(rows)
+    return path
+
+
+def read_arb(l10n_dir, locale):
+    return json.loads((l10n_dir / f"app_{locale}.arb").read_text(encoding="utf-8"))
+
+
+def arb_files(l10n_dir):
+    return {path.name: path.read_bytes() for path in l10n_dir.iterdir()}
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".tsv", ".json", ".jsonl"])
+def test_round_trip(tmp_path, l10n_dir, suffix):
+    table = write_table(tmp_path / f"table{suffix}", ROWS)
+
+    assert import_translations(tmp_path, table)
+
+    assert read_arb(l10n_dir, "en") == {
+        "@@locale": "en",
+        "greeting": "Hi {name}",
+        "@greeting": {
+            "placeholders": {"name": {"type": "String"}},
+            "description": "Greets",
+        },
+        "bye": "Bye",
+    }
+    # missing messages are left out of the other locales
+    assert read_arb(l10n_dir, "ne") == {"@@locale": "ne", "greeting": "नमस्ते {name}"}
+    assert sorted(arb_files(l10n_dir)) == ["app_en.arb", "app_ne.arb"]
+
+
+def test_jsonl_rows_may_add_locales(tmp_path, l10n_dir):
+    table = write_table(
+        tmp_path / "table.jsonl",
+        [
+            {"key": "greeting", "en": "Hi {name}"},
+            {"key": "bye", "en": "Bye", "de": "Tschüss"},
+        ],
+    )
+    assert import_translations(tmp_path, table)
+    assert read_arb(l10n_dir, "de") == {"@@locale": "de", "bye": "Tschüss"}
+
+
+def test_duplicate_keys_change_nothing(tmp_path, l10n_dir, capsys):
+    before = arb_files(l10n_dir)
+    table = write_table(tmp_path / "table.csv", [*ROWS, ROWS[1]])
+
+    assert not import_translations(tmp_path, table)
+
+    out = capsys.readouterr().out
+    assert "Duplicate keys in the table: bye" in out
+    assert "No ARB file was changed." in out
+    assert arb_files(l10n_dir) == before
+
+
+def test_placeholder_mismatches_are_reported(tmp_path, l10n_dir, capsys):
+    rows = [{"key": "greeting", "en": "", "ne": "नमस्ते {user}"}]
+    table = write_table(tmp_path / "table.csv", rows)
+
+    assert import_translations(tmp_path, table)
+
+    assert "app_ne.arb: placeholders differ from the template in greeting" in (
+        capsys.readouterr().out
+    )
+    # an empty template message keeps the current one
+    assert read_arb(l10n_dir, "en")["greeting"] == "Hello {name}"
+
+
+@pytest.mark.parametrize(
+    "lines, error",
+    [
+        (
+            ['{"key": "a", "en": "A", "ne": "A"}', '["b"]'],
+            "line 2 is not a JSON object",
+        ),
+        (
+            ['{"key": "a", "en": "A", "ne": "A"}', '{"key": "b", "en": "B", "ne": 2}'],
+            "the 'ne' of 'b' is not a string",
+        ),
+    ],
+)
+def test_invalid_jsonl_changes_nothing(tmp_path, l10n_dir, capsys, lines, error):
+    before = arb_files(l10n_dir)
+    table = tmp_path / "table.jsonl"
+    table.write_text("\n".join(lines) + "\n")
+
+    assert not import_translations(tmp_path, table)
+
+    assert error in capsys.readouterr().out
+    assert arb_files(l10n_dir) == before
+
+
+def test_a_failed_writer_changes_no_file(tmp_path, l10n_dir, monkeypatch, capsys):
+    write_message = translation_import._write_message
+
+    def fail_for_ne(f, report, *args):
+        if report.locale == "ne":
+            raise TypeError("broken message")
+        write_message(f, report, *args)
+
+    monkeypatch.setattr(translation_import, "_write_message", fail_for_ne)
+    before = arb_files(l10n_dir)
+    table = write_table(tmp_path / "table.csv", ROWS)
+
+    assert not import_translations(tmp_path, table)
+
+    assert "Failed to write app_ne.arb: broken message" in capsys.readouterr().out
+    assert arb_files(l10n_dir) == before
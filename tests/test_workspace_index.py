@@ -0,0 +1,101 @@
+import json
+import os
+
+import pytest
+
+import src.workspace_index as workspace_index
+from src.workspace_index import index_path, load_workspace_index
+
+
+def write_pubspec(root, path, text):
+    pubspec = root / path / "pubspec.yaml"
+    pubspec.parent.mkdir(parents=True, exist_ok=True)
+    pubspec.write_text(text)
+    # a fixed later mtime, so a rewrite within the same clock tick is seen
+    stamp = pubspec.stat().st_mtime_ns + 1_000_000_000
+    os.utime(pubspec, ns=(stamp, stamp))
+
+
+@pytest.fixture
+def monorepo(tmp_path):
+    write_pubspec(tmp_path, "packages/core", "name: core\n")
+    write_pubspec(tmp_path, "packages/ui", "name: ui\ndependencies:\n  core: any\n")
+    write_pubspec(tmp_path, "apps/shop", "name: shop\ndependencies:\n  ui: any\n")
+    (tmp_path / "apps/shop/l10n.yaml").write_text("arb-dir: lib/l10n\n")
+    return tmp_path
+
+
+@pytest.fixture
+def reads(monkeypatch):
+    """
+    The pubspecs load_workspace_index reads, as paths relative to the root.
+    """
+    paths = []
+    load_plain_yaml = workspace_index.load_plain_yaml
+
+    def counting_load(path):
+        paths.append(f"{path.parent.parent.name}/{path.parent.name}")
+        return load_plain_yaml(path)
+
+    monkeypatch.setattr(workspace_index, "load_plain_yaml", counting_load)
+    return paths
+
+
+def test_cold_load_reads_every_pubspec(monorepo, reads):
+    index = load_workspace_index(monorepo)
+    assert sorted(reads) == ["apps/shop", "packages/core", "packages/ui"]
+    assert index.by_name("ui").dependencies == ["core"]
+    assert index.by_path("apps/shop").has_l10n
+    assert "packages/core" in index and len(index) == 3
+    assert index_path(monorepo).is_file()
+
+
+def test_warm_load_reads_only_changed_pubspecs(monorepo, reads):
+    load_workspace_index(monorepo)
+    reads.clear()
+    written = index_path(monorepo).stat().st_mtime_ns
+
+    assert len(load_workspace_index(monorepo)) == 3
+    assert reads == []
+    # nothing changed, so the index file is not written again
+    assert index_path(monorepo).stat().st_mtime_ns == written
+
+    write_pubspec(
+        monorepo, "packages/ui", "name: ui\ndependencies:\n  core: any\n  intl: any\n"
+    )
+    index = load_workspace_index(monorepo)
+    assert reads == ["packages/ui"]
+    assert index.by_name("ui").dependencies == ["core", "intl"]
+    assert index.by_name("shop").dependencies == ["ui"]
+
+
+def test_warm_load_picks_up_l10n_without_reading_the_pubspec(monorepo, reads):
+    load_workspace_index(monorepo)
+    reads.clear()
+    (monorepo / "packages/core/l10n.yaml").write_text("arb-dir: lib/l10n\n")
+    assert load_workspace_index(monorepo).by_name("core").has_l10n
+    assert reads == []
+
+
+def test_removed_members_are_dropped(monorepo, reads):
+    load_workspace_index(monorepo)
+    (monorepo / "packages/ui/pubspec.yaml").unlink()
+    (monorepo / "packages/ui").rmdir()
+    reads.clear()
+
+    index = load_workspace_index(monorepo)
+    assert reads == []
+    assert index.by_name("ui") is None and "packages/ui" not in index
+    stored = json.loads(index_path(monorepo).read_text())["members"]
+    assert sorted(stored) == ["apps/shop", "packages/core"]
+
+
+def test_index_file_of_another_version_is_ignored(monorepo, reads):
+    load_workspace_index(monorepo)
+    data = json.loads(index_path(monorepo).read_text())
+    data["version"] += 1
+    index_path(monorepo).write_text(json.dumps(data))
+    reads.clear()
+
+    load_workspace_index(monorepo)
+    assert len(reads) == 3